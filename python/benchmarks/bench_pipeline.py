@@ -0,0 +1,222 @@
+"""
+Stage-level benchmarks for the deck_builder pipeline.
+
+Each stage of score_cards is timed on its own, over recorded card sets
+(payloads shaped like core.py's stdin: {"cards": [...], "primary_color": ...,
+"colors": [...]}). Wall time is measured without tracing; peak memory comes
+from a separate tracemalloc run of the same stage.
+
+    python benchmarks/bench_pipeline.py benchmarks/fixtures/*.json --output bench.json
+
+Record a fixture with fetch_lotr_cards.py and wrap it with the deck colors
+to score, or pass --primary-color/--colors to override. Without fixtures, a
+synthetic pool (see synthetic_cards.py) is benchmarked instead.
+"""
+import argparse
+import glob
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deck_builder"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import core  # noqa: E402
+import oracle_parser  # noqa: E402
+import telemetry  # noqa: E402
+from analysis_cache import AnalysisCache  # noqa: E402
+from cards_transform import flatten_card, transform_with_plural_map  # noqa: E402
+from corpus_index import CorpusCardIndex  # noqa: E402
+from flat_card import FlatCard  # noqa: E402
+from ngrams import get_common_ngrams, count_ngrams_in_corpora  # noqa: E402
+from oracle_parser import parse_oracle  # noqa: E402
+from parse_cache import ParseCache  # noqa: E402
+from synthetic_cards import generate_cards  # noqa: E402
+from token_corpus import TokenCorpus  # noqa: E402
+from tokens import get_common_tokens  # noqa: E402
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "*.json")
+DEFAULT_REPEAT = 5
+DEFAULT_SYNTHETIC_CARDS = 1500
+
+
+def measure(fn, repeat):
+    """
+    Runs fn repeat times for wall time, then once more under tracemalloc
+    for peak memory. Returns the timings and fn's last result.
+    """
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "wall_min_s": min(timings),
+        "wall_median_s": statistics.median(timings),
+        "peak_memory_kib": peak / 1024
+    }, result
+
+
+@contextmanager
+def cold_caches():
+    """
+    Runs the enclosed work against empty, memory-only analysis and parse
+    caches, so cold timings neither hit nor wipe the on-disk ones that
+    DECK_BUILDER_CACHE_DIR and DECK_BUILDER_PARSE_CACHE_DB point at.
+    """
+    with mock.patch.object(core, "ANALYSIS_CACHE", AnalysisCache(parser_version=oracle_parser.PARSER_VERSION)), \
+            mock.patch.object(oracle_parser, "PARSE_CACHE", ParseCache()):
+        yield
+
+
+def bench_payload(payload, repeat):
+    cards = payload["cards"]
+    primary_color = payload["primary_color"]
+    colors = payload["colors"]
+    stages = {}
+
+    def run(name, fn):
+        stages[name], result = measure(fn, repeat)
+        return result
+
+    def parse_cold():
+        with cold_caches():
+            return parse_oracle(cards)
+
+    parsed = run("parse_oracle", parse_cold)
+
+    def flatten():
+        return {
+            card["name"]: flatten_card(card["name"], card, parsed[card["name"]])
+            for card in cards if parsed.get(card["name"])
+        }
+
+    # transform_with_plural_map flattens and then normalizes; the
+    # normalization's own share is the difference
+    run("flatten", flatten)
+    all_cards, plural_map = run("transform", lambda: transform_with_plural_map(cards, parsed))
+
+    corpus = run("intern_corpus", lambda: TokenCorpus.from_cards(all_cards))
+    flat_cards = run("flat_cards", lambda: FlatCard.from_corpus(all_cards, corpus))
+    analysis = {"cards": all_cards, "plural_map": plural_map, "corpus": corpus, "flat_cards": flat_cards}
+
+    mono_cards, colorless_cards, color_cohorts = run("split_cohorts", lambda: core.split_cohorts(flat_cards))
+    dual_cards = core.dual_cohort(flat_cards, colors)
+
+    common_tokens = run("get_common_tokens", lambda: get_common_tokens(dual_cards))
+    common_ngrams = run("get_common_ngrams", lambda: get_common_ngrams(dual_cards, corpus))
+
+    # One traced run for get_common_ngrams' own stages and merge rounds
+    with telemetry.tracing(True, stream=io.StringIO()) as trace:
+        get_common_ngrams(dual_cards, corpus)
+    stages["get_common_ngrams"]["stages_s"] = {
+        name: seconds for name, seconds in trace.stages.items() if name.startswith("ngrams.")
+    }
+    stages["get_common_ngrams"]["rounds"] = trace.series["ngrams.rounds"]
+
+    run(
+        "count_ngrams_in_corpus",
+        lambda: count_ngrams_in_corpora(list(color_cohorts.values()), set(common_ngrams), corpus)
+    )
+
+    dual = run(
+        "analyze_dual",
+        lambda: core.analyze_dual(analysis, frozenset(colors), mono_cards, colorless_cards, color_cohorts)
+    )
+    num_primary = len(color_cohorts.get(primary_color, {}))
+    emergent = run(
+        "emergence",
+        lambda: dual["cohort_counts"].emergent(primary_color, len(mono_cards), dual["num_dual"], num_primary)
+    )
+
+    index = run("build_card_index", lambda: CorpusCardIndex(flat_cards, corpus, core.ORACLE_FIELDS))
+    elements = [element for scores in emergent for element in scores]
+    run("match_elements", lambda: [core.match_element(index, e, dual["relevant_rank"]) for e in elements])
+
+    def score_cold():
+        with cold_caches():
+            return core.score_cards(cards, primary_color, colors)
+
+    run("score_cards_cold", score_cold)
+    core.analyze_cards(cards)
+    run("score_cards_warm", lambda: core.score_cards(cards, primary_color, colors))
+
+    return {
+        "cards": len(cards),
+        "flattened_cards": len(all_cards),
+        "dual_cards": len(dual_cards),
+        "tokens": len(corpus.token_ids),
+        "vocabulary": len(corpus.vocabulary),
+        "common_tokens": len(common_tokens),
+        "selected_ngrams": len(common_ngrams),
+        "emergent_elements": len(elements),
+        "stages": stages
+    }
+
+
+def load_payload(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time each deck_builder stage on recorded card sets.")
+    parser.add_argument("fixtures", nargs="*", help=f"payload JSON files (default: {DEFAULT_FIXTURES})")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--primary-color", help="override the fixture's primary color")
+    parser.add_argument("--colors", nargs="+", help="override the fixture's deck colors")
+    parser.add_argument("--synthetic", type=int, default=DEFAULT_SYNTHETIC_CARDS,
+                        help="size of the synthetic pool benchmarked when no fixtures are found")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic pool")
+    parser.add_argument("--output", help="write results JSON here instead of stdout")
+    args = parser.parse_args()
+
+    paths = args.fixtures or sorted(glob.glob(DEFAULT_FIXTURES))
+
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "fixtures": {}
+    }
+
+    payloads = [(os.path.basename(path), load_payload(path)) for path in paths]
+    if not payloads:
+        print(f"No fixtures found, using {args.synthetic} synthetic cards", file=sys.stderr)
+        payloads = [(f"synthetic-{args.synthetic}", {"cards": generate_cards(args.synthetic, seed=args.seed)})]
+
+    for label, payload in payloads:
+        payload.setdefault("primary_color", "U")
+        payload.setdefault("colors", ["U", "G"])
+        if args.primary_color:
+            payload["primary_color"] = args.primary_color
+        if args.colors:
+            payload["colors"] = args.colors
+
+        print(f"Benchmarking {label} ({len(payload['cards'])} cards)", file=sys.stderr)
+        results["fixtures"][label] = bench_payload(payload, args.repeat)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Scaling benchmark over synthetic card pools.
+
+Times parse_oracle, transform, get_common_ngrams and a cold score_cards at
+growing pool sizes and reports the empirical growth exponent between
+consecutive sizes (log time ratio / log size ratio). Exponents above
+--max-exponent are flagged as super-linear.
+
+    python benchmarks/bench_scaling.py --sizes 300 1000 5000 30000 --output scaling.json
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deck_builder"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import core  # noqa: E402
+from bench_pipeline import cold_caches  # noqa: E402
+from cards_transform import transform  # noqa: E402
+from ngrams import get_common_ngrams  # noqa: E402
+from oracle_parser import parse_oracle  # noqa: E402
+from synthetic_cards import generate_cards, DEFAULT_PHRASE_DIVERSITY  # noqa: E402
+
+DEFAULT_SIZES = [300, 1000, 3000, 10000]
+DEFAULT_MAX_EXPONENT = 1.3
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def bench_size(num_cards, seed, diversity, primary_color, colors):
+    cards = generate_cards(num_cards, seed=seed, phrase_diversity=diversity)
+    timings = {}
+
+    with cold_caches():
+        timings["parse_oracle"], parsed = timed(lambda: parse_oracle(cards))
+    timings["transform"], all_cards = timed(lambda: transform(cards, parsed))
+
+    dual_cards = {
+        name: card for name, card in all_cards.items()
+        if set(card.get("color_identity", [])) <= set(colors) and card.get("color_identity", []) != []
+    }
+    timings["get_common_ngrams"], _ = timed(lambda: get_common_ngrams(dual_cards))
+
+    with cold_caches():
+        timings["score_cards_cold"], _ = timed(lambda: core.score_cards(cards, primary_color, colors))
+
+    return {"cards": num_cards, "dual_cards": len(dual_cards), "wall_s": timings}
+
+
+def growth_exponents(runs, max_exponent):
+    exponents = []
+    for smaller, larger in zip(runs, runs[1:]):
+        size_ratio = math.log(larger["cards"] / smaller["cards"])
+        stages = {}
+        for stage, seconds in larger["wall_s"].items():
+            base = smaller["wall_s"][stage]
+            exponent = math.log(seconds / base) / size_ratio if base > 0 and seconds > 0 else None
+            stages[stage] = {
+                "exponent": exponent,
+                "super_linear": exponent is not None and exponent > max_exponent
+            }
+        exponents.append({"from": smaller["cards"], "to": larger["cards"], "stages": stages})
+    return exponents
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure how the deck_builder stages scale with pool size.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--diversity", type=float, default=DEFAULT_PHRASE_DIVERSITY)
+    parser.add_argument("--primary-color", default="U")
+    parser.add_argument("--colors", nargs="+", default=["U", "G"])
+    parser.add_argument("--max-exponent", type=float, default=DEFAULT_MAX_EXPONENT)
+    parser.add_argument("--output", help="write results JSON here instead of stdout")
+    args = parser.parse_args()
+
+    runs = []
+    for size in sorted(args.sizes):
+        print(f"Benchmarking {size} synthetic cards", file=sys.stderr)
+        runs.append(bench_size(size, args.seed, args.diversity, args.primary_color, args.colors))
+
+    exponents = growth_exponents(runs, args.max_exponent)
+    results = {"runs": runs, "growth": exponents}
+
+    for step in exponents:
+        for stage, growth in step["stages"].items():
+            if growth["super_linear"]:
+                print(f"Super-linear: {stage} grows as n^{growth['exponent']:.2f} "
+                      f"from {step['from']} to {step['to']} cards", file=sys.stderr)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
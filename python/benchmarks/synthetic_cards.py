@@ -0,0 +1,222 @@
+"""
+Synthetic, Scryfall-shaped card sets for load and scaling tests.
+
+Cards are assembled from oracle-text templates covering the grammar the
+parser handles: triggers, conditions, reflexive "when you do", choice
+bullets, activated abilities, equip, "instead" replacements, quoted
+granted abilities and keyword lines.
+
+    python benchmarks/synthetic_cards.py 5000 --seed 7 --diversity 0.8 > pool.json
+
+phrase_diversity (0..1) sets how many invented creature types and token
+names join the vocabulary and how flat the template distribution is: low
+values give a repetitive, set-like pool, high values a cube-like one.
+"""
+import argparse
+import json
+import random
+import sys
+from typing import Dict, List, Optional
+
+COLORS = ["W", "U", "B", "R", "G"]
+COLOR_WORDS = {"W": "white", "U": "blue", "B": "black", "R": "red", "G": "green"}
+
+# Fractions of mono-colored, multicolored and colorless cards
+DEFAULT_COLOR_DISTRIBUTION = {"mono": 0.7, "multi": 0.2, "colorless": 0.1}
+DEFAULT_PHRASE_DIVERSITY = 0.5
+
+RARITIES = [("common", 10), ("uncommon", 5), ("rare", 2), ("mythic", 1)]
+
+TRIBES = ["Human", "Elf", "Goblin", "Orc", "Wizard", "Soldier", "Knight", "Zombie", "Spirit", "Halfling"]
+TOKENS = ["Food", "Treasure", "Clue", "Blood"]
+PERMANENTS = ["creature", "artifact", "enchantment", "land", "planeswalker", "nonland permanent"]
+CORE_KEYWORDS = ["Flying", "Vigilance", "Trample", "Lifelink", "Deathtouch", "Haste", "Reach", "Menace", "First strike"]
+SYLLABLES = ["ka", "dor", "vel", "mir", "thu", "zan", "gor", "il", "esh", "bra", "qui", "nol"]
+
+SUBJECTS = [
+    "a creature you control", "another {tribe} you control", "an opponent", "equipped creature",
+    "enchanted creature", "a nontoken {tribe} you control", "one or more {tribe}s you control",
+    "this creature", "a creature an opponent controls"
+]
+EVENTS = ["dies", "attacks", "enters", "deals combat damage to a player", "becomes tapped", "leaves the battlefield"]
+STEPS = ["your upkeep", "your end step", "combat on your turn", "each end step"]
+EFFECTS = [
+    "draw a card", "draw {n} cards", "create a {n}/{n} {color} {tribe} creature token",
+    "target creature gets +{n}/+{n} until end of turn", "put a +1/+1 counter on target creature you control",
+    "you gain {n} life", "each opponent loses {n} life", "exile target {permanent}",
+    "destroy target {permanent}", "return target creature card from your graveyard to your hand",
+    "scry {n}", "create a {token} token", "tap target creature an opponent controls",
+    "{self} deals {n} damage to any target", "mill {n} cards", "discard a card",
+    "look at the top {n} cards of your library", "sacrifice a {permanent}"
+]
+REPLACEMENTS = [
+    ("{subject} would die", "exile it instead"),
+    ("you would draw a card", "draw two cards instead"),
+    ("a {token} token would be created", "create two of those tokens instead"),
+    ("you would gain life", "you gain that much life plus {n} instead")
+]
+CONDITIONS = [
+    "you control a {tribe}", "you control {n} or more {tribe}s", "an opponent lost life this turn",
+    "you cast a spell this turn", "it's your turn"
+]
+
+
+class CardGenerator:
+    def __init__(self, rng: random.Random, num_cards: int, phrase_diversity: float):
+        self.rng = rng
+        diversity = min(max(phrase_diversity, 0.0), 1.0)
+
+        invented = int(diversity * num_cards / 10)
+        self.tribes = TRIBES + [self.invent_word() for _ in range(invented)]
+        self.tokens = TOKENS + [self.invent_word() for _ in range(invented // 4)]
+
+        # Zipf-like template weights; diversity flattens the skew
+        skew = 2.0 - 1.5 * diversity
+        self.effect_weights = [1 / (rank + 1) ** skew for rank in range(len(EFFECTS))]
+        self.tribe_weights = [1 / (rank + 1) ** skew for rank in range(len(self.tribes))]
+
+    def invent_word(self) -> str:
+        return "".join(self.rng.choice(SYLLABLES) for _ in range(self.rng.randint(2, 3))).capitalize()
+
+    def fill(self, template: str, name: str) -> str:
+        return template.format(
+            tribe=self.rng.choices(self.tribes, self.tribe_weights)[0],
+            token=self.rng.choice(self.tokens),
+            permanent=self.rng.choice(PERMANENTS),
+            color=COLOR_WORDS[self.rng.choice(COLORS)],
+            n=self.rng.randint(1, 4),
+            self=name,
+            subject=self.subject(name)
+        )
+
+    def subject(self, name: str) -> str:
+        return self.rng.choice(SUBJECTS).format(tribe=self.rng.choices(self.tribes, self.tribe_weights)[0])
+
+    def effect(self, name: str) -> str:
+        return self.fill(self.rng.choices(EFFECTS, self.effect_weights)[0], name)
+
+    def trigger(self, name: str) -> str:
+        shape = self.rng.randrange(3)
+        if shape == 0:
+            return f"Whenever {self.subject(name)} {self.rng.choice(EVENTS)}, "
+        if shape == 1:
+            return f"When {name} enters, "
+        return f"At the beginning of {self.rng.choice(STEPS)}, "
+
+    def ability(self, name: str, card: Dict) -> str:
+        rng = self.rng
+        kind = rng.choices(
+            ["triggered", "reflexive", "conditional", "replacement", "activated", "choice",
+             "equip", "granted", "static", "keyword", "spell"],
+            [20, 4, 8, 5, 10, 5, 3, 4, 8, 8, 25]
+        )[0]
+
+        if kind == "triggered":
+            return f"{self.trigger(name)}{self.effect(name)}."
+        if kind == "reflexive":
+            return f"{self.trigger(name)}you may {self.effect(name)}. When you do, {self.effect(name)}."
+        if kind == "conditional":
+            condition = self.fill(rng.choice(CONDITIONS), name)
+            return rng.choice([
+                f"As long as {condition}, {name} gets +1/+1.",
+                f"{self.effect(name).capitalize()} if {condition}."
+            ])
+        if kind == "replacement":
+            event, replacement = rng.choice(REPLACEMENTS)
+            return f"If {self.fill(event, name)}, {self.fill(replacement, name)}."
+        if kind == "activated":
+            cost = rng.choice(["{T}", "{%d}, {T}" % rng.randint(1, 4), "{%d}{%s}" % (rng.randint(1, 3), rng.choice(COLORS)),
+                               f"{{{rng.randint(1, 3)}}}, Sacrifice {name}"])
+            return f"{cost}: {self.effect(name).capitalize()}."
+        if kind == "choice":
+            bullets = "\n".join(f"• {self.effect(name).capitalize()}." for _ in range(rng.randint(2, 4)))
+            lead = rng.choice(["Choose one —", f"When {name} enters, choose one —"])
+            return f"{lead}\n{bullets}"
+        if kind == "equip":
+            card["type_line"] = "Artifact — Equipment"
+            card["keywords"].append("Equip")
+            return f"Equipped creature gets +{rng.randint(1, 3)}/+{rng.randint(0, 2)}.\nEquip {{{rng.randint(1, 4)}}}"
+        if kind == "granted":
+            return rng.choice([
+                f"Enchanted creature has \"{self.trigger('this creature')}{self.effect('this creature')}.\"",
+                f"{rng.choice(self.tribes)}s you control have \"{{T}}: {self.effect('this creature').capitalize()}.\""
+            ])
+        if kind == "static":
+            return f"Other {rng.choices(self.tribes, self.tribe_weights)[0]}s you control get +1/+1."
+        if kind == "keyword":
+            keywords = rng.sample(CORE_KEYWORDS, rng.randint(1, 2))
+            card["keywords"].extend(keywords)
+            return ", ".join([keywords[0]] + [k.lower() for k in keywords[1:]])
+        return f"{self.effect(name).capitalize()}."
+
+    def card(self, idx: int, color_identity: List[str]) -> Dict:
+        rng = self.rng
+        name = f"{self.invent_word()} {rng.choice(['of', 'the'])} {self.invent_word()} {idx}"
+        card = {
+            "name": name,
+            "rarity": rng.choices([r for r, _ in RARITIES], [w for _, w in RARITIES])[0],
+            "color_identity": color_identity,
+            "type_line": rng.choice([
+                f"Creature — {rng.choice(self.tribes)} {rng.choice(self.tribes)}",
+                f"Legendary Creature — {rng.choice(self.tribes)}",
+                "Instant", "Sorcery", "Enchantment", "Enchantment — Aura", "Artifact"
+            ]),
+            "oracle_text": "",
+            "keywords": []
+        }
+
+        lines = [self.ability(name, card) for _ in range(rng.choices([1, 2, 3, 4], [4, 5, 3, 1])[0])]
+        card["oracle_text"] = "\n".join(lines)
+        card["keywords"] = sorted(set(card["keywords"]))
+        return card
+
+
+def pick_color_identity(rng: random.Random, color_distribution: Dict[str, float]) -> List[str]:
+    kind = rng.choices(list(color_distribution), list(color_distribution.values()))[0]
+    if kind == "colorless":
+        return []
+    if kind == "mono":
+        return [rng.choice(COLORS)]
+    return sorted(rng.sample(COLORS, rng.choices([2, 3], [5, 1])[0]), key=COLORS.index)
+
+
+def generate_cards(
+    num_cards: int,
+    seed: int = 0,
+    color_distribution: Optional[Dict[str, float]] = None,
+    phrase_diversity: float = DEFAULT_PHRASE_DIVERSITY
+) -> List[Dict]:
+    """
+    Generates num_cards Scryfall-shaped card dicts, deterministically per seed.
+    """
+    rng = random.Random(seed)
+    color_distribution = color_distribution or DEFAULT_COLOR_DISTRIBUTION
+    generator = CardGenerator(rng, num_cards, phrase_diversity)
+
+    return [generator.card(idx, pick_color_identity(rng, color_distribution)) for idx in range(num_cards)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic card pool payload for core.py.")
+    parser.add_argument("num_cards", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--diversity", type=float, default=DEFAULT_PHRASE_DIVERSITY)
+    parser.add_argument("--mono", type=float, default=DEFAULT_COLOR_DISTRIBUTION["mono"])
+    parser.add_argument("--multi", type=float, default=DEFAULT_COLOR_DISTRIBUTION["multi"])
+    parser.add_argument("--colorless", type=float, default=DEFAULT_COLOR_DISTRIBUTION["colorless"])
+    parser.add_argument("--primary-color", default="U")
+    parser.add_argument("--colors", nargs="+", default=["U", "G"])
+    args = parser.parse_args()
+
+    cards = generate_cards(
+        args.num_cards,
+        seed=args.seed,
+        color_distribution={"mono": args.mono, "multi": args.multi, "colorless": args.colorless},
+        phrase_diversity=args.diversity
+    )
+
+    json.dump({"cards": cards, "primary_color": args.primary_color, "colors": args.colors}, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
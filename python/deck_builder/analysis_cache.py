@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+# Bump whenever the flattened card layout or the normalization changes, so
+# stale entries on disk are ignored instead of reused. Parser changes are
+# caught by the parser version stored alongside.
+CACHE_FORMAT_VERSION = 2
+
+DEFAULT_MAX_ENTRIES = 8
+
+
+def canonical_json(value) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def payload_hash(cards: List[Dict]) -> str:
+    """
+    Content hash of a raw card list. Key order inside each card doesn't
+    matter, card order does (it decides the order of the flattened corpus).
+    """
+    return hashlib.sha256(canonical_json(cards).encode("utf-8")).hexdigest()
+
+
+class PayloadHasher:
+    """
+    payload_hash() of a card list fed one card at a time, for callers that
+    never hold the whole list (see core.analyze_card_stream).
+    """
+
+    def __init__(self):
+        self._sha = hashlib.sha256(b"[")
+        self.num_cards = 0
+
+    def update(self, card: Dict):
+        if self.num_cards:
+            self._sha.update(b",")
+        self._sha.update(canonical_json(card).encode("utf-8"))
+        self.num_cards += 1
+
+    def hexdigest(self) -> str:
+        sha = self._sha.copy()
+        sha.update(b"]")
+        return sha.hexdigest()
+
+
+class AnalysisCache:
+    """
+    LRU cache of analyzed corpora: {"cards": flattened cards, "plural_map": ...}
+    keyed by payload_hash(). Entries are shared between callers and must be
+    treated as read-only.
+
+    If cache_dir is given, entries are also written there as versioned JSON
+    files and looked up on a memory miss, so separate processes share work.
+    Files written by another parser_version (see oracle_parser) are ignored.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        cache_dir: Optional[str] = None,
+        parser_version: str = ""
+    ):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.parser_version = parser_version
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Dict]:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        analysis = self._load(key)
+        if analysis is not None:
+            self._remember(key, analysis)
+        return analysis
+
+    def put(self, key: str, analysis: Dict):
+        self._remember(key, analysis)
+        self._store(key, analysis)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: str):
+        return key in self._entries
+
+    def _remember(self, key: str, analysis: Dict):
+        self._entries[key] = analysis
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load(self, key: str) -> Optional[Dict]:
+        if not self.cache_dir:
+            return None
+
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if (
+            stored.get("version") != CACHE_FORMAT_VERSION
+            or stored.get("parser_version") != self.parser_version
+            or stored.get("key") != key
+        ):
+            return None
+
+        return {"cards": stored["cards"], "plural_map": stored["plural_map"]}
+
+    def _store(self, key: str, analysis: Dict):
+        if not self.cache_dir:
+            return
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+
+        # Write then rename, so concurrent readers never see a partial file
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": CACHE_FORMAT_VERSION,
+                "parser_version": self.parser_version,
+                "key": key,
+                "cards": analysis["cards"],
+                "plural_map": analysis["plural_map"]
+            }, f)
+        os.replace(tmp_path, path)
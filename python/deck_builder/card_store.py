@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Tuple
+
+COLOR_ORDER = "WUBRG"
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS cards (
+        id INTEGER PRIMARY KEY,
+        set_code TEXT NOT NULL,
+        name TEXT NOT NULL,
+        color_identity TEXT NOT NULL,
+        oracle_hash TEXT NOT NULL,
+        card TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS cards_set_code ON cards (set_code, name)",
+    "CREATE INDEX IF NOT EXISTS cards_color_identity ON cards (color_identity)",
+    "CREATE INDEX IF NOT EXISTS cards_oracle_hash ON cards (oracle_hash)"
+]
+
+
+def color_key(color_identity: Iterable[str]) -> str:
+    """
+    Color identity as one WUBRG-ordered string; "" for colorless.
+    """
+    colors = set(color_identity)
+    return "".join(color for color in COLOR_ORDER if color in colors)
+
+
+def oracle_hash(oracle_text: str) -> str:
+    return hashlib.sha256(oracle_text.encode("utf-8")).hexdigest()
+
+
+class CardStore:
+    """
+    Local SQLite store of payload-shaped cards (see fetch_cards.project_card),
+    indexed by set code, color identity and oracle text hash.
+
+    Filled by ingest_bulk.py from a Scryfall bulk-data file; read by core.py
+    to score a set by its code instead of receiving its cards on stdin.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db = sqlite3.connect(path, timeout=30)
+        for statement in SCHEMA:
+            self.db.execute(statement)
+        self.db.commit()
+
+    def replace_cards(self, entries: Iterable[Tuple[str, Dict]], set_codes: Optional[Iterable[str]] = None) -> int:
+        """
+        Replaces the stored cards with (set code, card) entries, in one
+        transaction, so readers see either the old or the new cards. With
+        set_codes, only those sets are replaced. Returns the number stored.
+        """
+        count = 0
+        with self.db:
+            if set_codes is None:
+                self.db.execute("DELETE FROM cards")
+            else:
+                self.db.executemany("DELETE FROM cards WHERE set_code = ?", [(code.lower(),) for code in set_codes])
+
+            for set_code, card in entries:
+                self.db.execute(
+                    "INSERT INTO cards (set_code, name, color_identity, oracle_hash, card) VALUES (?, ?, ?, ?, ?)",
+                    (
+                        set_code.lower(),
+                        card.get("name") or "",
+                        color_key(card.get("color_identity", [])),
+                        oracle_hash(card.get("oracle_text", "")),
+                        json.dumps(card, ensure_ascii=False, separators=(",", ":"))
+                    )
+                )
+                count += 1
+        return count
+
+    def set_cards(self, set_code: str) -> List[Dict]:
+        """
+        A set's cards, ordered by name like a Scryfall search.
+        """
+        rows = self.db.execute(
+            "SELECT card FROM cards WHERE set_code = ? ORDER BY name, id", (set_code.lower(),)
+        )
+        return [json.loads(card) for card, in rows]
+
+    def set_codes(self) -> List[str]:
+        return [code for code, in self.db.execute("SELECT DISTINCT set_code FROM cards ORDER BY set_code")]
+
+    def close(self):
+        self.db.close()
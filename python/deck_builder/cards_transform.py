@@ -1,5 +1,6 @@
 import re
-from typing import List, Dict, Tuple
+from functools import lru_cache
+from typing import Iterable, List, Dict, Tuple
 
 # General value placeholders
 BUFF = "<BUFF>"
@@ -10,8 +11,13 @@ NUM = "<NUM>"
 RE_BUFF = re.compile(r'([+-]\d+)/([+-]\d+)')
 RE_STAT = re.compile(r'\b\d+/\d+\b')
 RE_NUM = re.compile(r'\b\d+|(x|a|one|two|three|four|five|six|seven|nine|fourteen)\b')
+RE_CLEAN = re.compile(r"[^\w\s~/+-]")
 
+# Distinct raw tokens across many sets stay in the low tens of thousands
+NORMALIZE_CACHE_SIZE = 65536
 
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
 def normalize_token(token: str) -> str:
     token = RE_BUFF.sub(BUFF, token)
     token = RE_STAT.sub(STAT, token)
@@ -19,7 +25,11 @@ def normalize_token(token: str) -> str:
     return token
 
 
-def build_plural_map(all_tokens: List[str]) -> Dict[str, str]:
+def tokenize_text(text: str) -> List[str]:
+    return RE_CLEAN.sub("", text.lower()).split()
+
+
+def build_plural_map(all_tokens: Iterable[str]) -> Dict[str, str]:
     plural_map = {}
     tokens_set = set(all_tokens)
 
@@ -33,27 +43,33 @@ def build_plural_map(all_tokens: List[str]) -> Dict[str, str]:
 
 
 def normalize_texts(texts: List[str]) -> List[List[str]]:
-    all_tokens = []
-    for text in texts:
-        text_lower = text.lower()
-        text_clean = re.sub(r"[^\w\s~/+-]", "", text_lower)
-        all_tokens.extend(text_clean.split())
-
-    all_tokens = [normalize_token(tok) for tok in all_tokens]
-    plural_map = build_plural_map(all_tokens)
-
-    normalized_texts = []
-    for text in texts:
-        text_lower = text.lower()
-        text_clean = re.sub(r"[^\w\s~/+-]", "", text_lower)
-        raw_tokens = text_clean.split()
-        tokens = [normalize_token(tok) for tok in raw_tokens]
-        normalized = [plural_map.get(tok, tok) for tok in tokens]
-        normalized_texts.append(normalized)
-
+    normalized_texts, _ = normalize_texts_with_plural_map(texts)
     return normalized_texts
 
 
+def normalize_texts_with_plural_map(texts: List[str]) -> Tuple[List[List[str]], Dict[str, str]]:
+    """
+    Tokenizes each text once and normalizes each distinct raw token once,
+    so the regex work scales with the vocabulary rather than the corpus.
+    """
+    raw_texts = [tokenize_text(text) for text in texts]
+
+    normalized_vocab = {}
+    for raw_tokens in raw_texts:
+        for raw in raw_tokens:
+            if raw not in normalized_vocab:
+                normalized_vocab[raw] = normalize_token(raw)
+
+    plural_map = build_plural_map(normalized_vocab.values())
+
+    # Raw token straight to its final, singularized form
+    final_vocab = {raw: plural_map.get(token, token) for raw, token in normalized_vocab.items()}
+
+    normalized_texts = [[final_vocab[raw] for raw in raw_tokens] for raw_tokens in raw_texts]
+
+    return normalized_texts, plural_map
+
+
 def extract_leaf_effects(effects) -> List[str]:
     """
     Recursively extract all 'text' fields from nested effect structures.
@@ -126,6 +142,14 @@ def flatten_card(card_name: str, metadata: Dict, parsed_oracle: List[Dict]) -> D
 
 
 def transform(cards: List[Dict], cards_parsed_oracle: Dict[str, List[Dict]]) -> Dict[str, Dict]:
+    flattened, _ = transform_with_plural_map(cards, cards_parsed_oracle)
+    return flattened
+
+
+def transform_with_plural_map(
+    cards: List[Dict],
+    cards_parsed_oracle: Dict[str, List[Dict]]
+) -> Tuple[Dict[str, Dict], Dict[str, str]]:
     flattened = {}
 
     for card in cards:
@@ -134,10 +158,15 @@ def transform(cards: List[Dict], cards_parsed_oracle: Dict[str, List[Dict]]) ->
         if parsed_oracle:
             flattened[name] = flatten_card(name, card, parsed_oracle)
 
-    return normalize_flattened(flattened)
+    return normalize_flattened_with_plural_map(flattened)
 
 
 def normalize_flattened(flattened: Dict[str, Dict]) -> Dict[str, Dict]:
+    normalized, _ = normalize_flattened_with_plural_map(flattened)
+    return normalized
+
+
+def normalize_flattened_with_plural_map(flattened: Dict[str, Dict]) -> Tuple[Dict[str, Dict], Dict[str, str]]:
     all_texts = []
     field_locations: List[Tuple[str, str, int]] = []
 
@@ -147,9 +176,9 @@ def normalize_flattened(flattened: Dict[str, Dict]) -> Dict[str, Dict]:
                 all_texts.append(raw_text)
                 field_locations.append((card_name, field, idx))
 
-    normalized = normalize_texts(all_texts)
+    normalized, plural_map = normalize_texts_with_plural_map(all_texts)
 
     for (card_name, field, idx), tokens in zip(field_locations, normalized):
         flattened[card_name][field][idx] = tokens
 
-    return flattened
\ No newline at end of file
+    return flattened, plural_map
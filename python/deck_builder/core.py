@@ -1,23 +1,115 @@
+import argparse
+import io
+import itertools
 import json
+import os
 import sys
-from typing import List, Dict, Counter
-from collections import Counter, defaultdict
-from cards_transform import transform
-from oracle_parser import parse_oracle
-from ngrams import get_common_ngrams, count_ngrams_in_corpus, ngram_to_tokens, count_ngram_in_tokens, ngram_to_string
+from typing import List, Dict, Counter, Iterable, Optional, Tuple
+from collections import Counter, OrderedDict, defaultdict
+from analysis_cache import AnalysisCache, PayloadHasher, payload_hash, DEFAULT_MAX_ENTRIES
+from card_store import CardStore
+from cards_transform import transform_with_plural_map, flatten_card, normalize_flattened_with_plural_map
+from corpus_file import load_analysis, read_parser_version, write_corpus
+from corpus_index import CardIndex, CorpusCardIndex
+from emergence import CohortCounts, DEFAULT_ALPHA, DEFAULT_THRESHOLD
+from flat_card import CorpusCards, FlatCard, COLOR_BITS, color_mask, mask_colors
+from json_stream import StreamingPayload
+from oracle_parser import PARSER_VERSION, parse_oracle, parse_card_oracle
+from profiling import profiling
+from ngrams import get_common_ngrams, select_common_ngrams, count_ngrams_in_corpora, ngram_to_tokens, ngram_to_string
+from token_corpus import TokenCorpus
 from tokens import get_common_tokens
+import telemetry
 
 VALID_COLORS = {"W", "U", "B", "R", "G"}
 ORACLE_FIELDS = ["triggers", "effects", "conditions"]
+# Processes for parsing large card pools; 0 means one per CPU
+PARSE_WORKERS = int(os.environ.get("DECK_BUILDER_PARSE_WORKERS", 0))
 
+# Local store (see ingest_bulk.py) that "set" payloads are loaded from
+CARD_STORE_PATH = os.environ.get("DECK_BUILDER_CARD_STORE")
+_card_store = None
 
-def emergence_score(freq_a, freq_b, total_a, total_b):
-    p_a = freq_a / total_a if total_a else 0
-    p_b = freq_b / total_b if total_b else 0
+# Directory of memory-mapped corpus files (see corpus_file), one per set,
+# and how many sets a process keeps mapped
+CORPUS_DIR = os.environ.get("DECK_BUILDER_CORPUS_DIR")
+MAPPED_SETS_MAX = int(os.environ.get("DECK_BUILDER_MAPPED_SETS", 8))
+_mapped_sets = OrderedDict()
 
-    delta = p_b - p_a
-    alpha = .2
-    return max(0, (1 - alpha) * delta + alpha * p_b)
+ANALYSIS_CACHE = AnalysisCache(
+    max_entries=int(os.environ.get("DECK_BUILDER_CACHE_SIZE", DEFAULT_MAX_ENTRIES)),
+    cache_dir=os.environ.get("DECK_BUILDER_CACHE_DIR"),
+    parser_version=PARSER_VERSION
+)
+
+
+def analyze_cards(data: List[Dict]) -> Dict:
+    """
+    Parses and normalizes a card list, reusing a cached analysis when the
+    same payload was seen before. Every deck of a set shares this work.
+
+    Returns:
+        {"cards": flattened cards by name, "plural_map": plural -> singular}.
+        The result may be shared with other requests; don't mutate it
+        beyond attaching derived indexes (see get_card_index and
+        get_token_corpus). Once scored, its cards are a read-only view
+        (see get_flat_cards).
+    """
+    trace = telemetry.current()
+    trace.count("corpus.input_cards", len(data))
+    with trace.span("analysis.lookup"):
+        key = payload_hash(data)
+        analysis = ANALYSIS_CACHE.get(key)
+    trace.count("analysis.cache_hit", analysis is not None)
+
+    if analysis is None:
+        with trace.span("analysis.parse_oracle"):
+            cards_parsed_oracle = parse_oracle(data, PARSE_WORKERS)
+        with trace.span("analysis.transform"):
+            all_cards, plural_map = transform_with_plural_map(data, cards_parsed_oracle)
+        analysis = {"cards": all_cards, "plural_map": plural_map}
+        ANALYSIS_CACHE.put(key, analysis)
+    return analysis
+
+
+def analyze_card_stream(cards: Iterable[Dict], hasher: Optional[PayloadHasher] = None) -> Dict:
+    """
+    analyze_cards for cards that arrive one at a time (see json_stream):
+    each card is parsed and flattened as soon as it is read, so the raw
+    list is never held and parsing overlaps the transfer. Normalization
+    needs the whole vocabulary and runs once the stream ends.
+
+    Produces the same analysis, under the same cache key, as
+    analyze_cards on the equivalent list. The cache can only be consulted
+    at the end; a hit still replaces the fresh analysis so its derived
+    indexes are reused. A given hasher is left holding the cards' key.
+    """
+    trace = telemetry.current()
+    if hasher is None:
+        hasher = PayloadHasher()
+
+    # Like transform: the last card of a name wins, at that name's first
+    # position, and cards without parsed oracle text are left out
+    flattened_by_name = {}
+    with trace.span("analysis.ingest"):
+        for card in cards:
+            hasher.update(card)
+            name = card["name"]
+            parsed_oracle = parse_card_oracle(card)
+            flattened_by_name[name] = flatten_card(name, card, parsed_oracle) if parsed_oracle else None
+    trace.count("corpus.input_cards", hasher.num_cards)
+
+    key = hasher.hexdigest()
+    analysis = ANALYSIS_CACHE.get(key)
+    trace.count("analysis.cache_hit", analysis is not None)
+
+    if analysis is None:
+        with trace.span("analysis.transform"):
+            flattened = {name: flat for name, flat in flattened_by_name.items() if flat is not None}
+            all_cards, plural_map = normalize_flattened_with_plural_map(flattened)
+        analysis = {"cards": all_cards, "plural_map": plural_map}
+        ANALYSIS_CACHE.put(key, analysis)
+    return analysis
 
 
 def score_cards(
@@ -37,8 +129,97 @@ def score_cards(
     Returns:
         List of dicts with name and score, sorted by score descending.
     """
+    deck = {"primary_color": primary_color, "colors": colors}
+    return score_decks(data, {"deck": deck})["deck"]
+
+
+def score_decks(
+    data: List[Dict],
+    decks: Dict[str, Dict]
+) -> Dict[str, dict[str, dict[str, List[str]]]]:
+    """
+    Scores many decks of the same card list at once.
+
+    Parsing, normalization and the indexes are shared by every deck; ngram
+    mining and the mono-corpus counts are shared by decks with the same
+    colors, so scoring every primary of a color pair costs about as much as
+    scoring one.
+
+    Args:
+        data: List of card dicts (raw from Scryfall).
+        decks: Deck specs by caller-chosen key, e.g.
+            {"ug": {"primary_color": "U", "colors": ["U", "G"]}}
+
+    Returns:
+        The score_cards result for each deck, under the same keys.
+    """
+
+    # Input validation, before the expensive part
+    validate_decks(decks)
+    return score_analyzed_decks(analyze_cards(data), decks)
+
+
+def score_analyzed_decks(
+    analysis: Dict,
+    decks: Dict[str, Dict]
+) -> Dict[str, dict[str, dict[str, List[str]]]]:
+    """
+    score_decks over an analysis from analyze_cards or analyze_card_stream,
+    for decks already validated (see validate_decks).
+    """
+    all_cards = get_flat_cards(analysis)
+    mono_cards, colorless_cards, color_cohorts = split_cohorts(all_cards)
+
+    trace = telemetry.current()
+    trace.count("corpus.cards", len(all_cards))
+    trace.count("corpus.mono_cards", len(mono_cards))
+    trace.count("corpus.colorless_cards", len(colorless_cards))
+    trace.count("decks", len(decks))
+
+    dual_stages = {}
+    results = {}
+
+    for key, deck in decks.items():
+        colors_key = frozenset(deck["colors"])
+        if colors_key not in dual_stages:
+            dual_stages[colors_key] = analyze_dual(analysis, colors_key, mono_cards, colorless_cards, color_cohorts)
+
+        results[key] = score_deck(analysis, dual_stages[colors_key], deck["primary_color"], len(mono_cards))
+
+    return results
+
+
+def split_cohorts(
+    all_cards: Dict[str, FlatCard]
+) -> Tuple[Dict[str, FlatCard], Dict[str, FlatCard], Dict[str, Dict[str, FlatCard]]]:
+    """
+    The mono and colorless cards, and the mono cards split by their one
+    color (the primary cohorts).
+    """
+    mono_cards = {name: card for name, card in all_cards.items() if card.is_mono()}
+    colorless_cards = {name: card for name, card in all_cards.items() if card.is_colorless()}
+
+    color_cohorts = defaultdict(dict)
+    for name, card in mono_cards.items():
+        color_cohorts[mask_colors(card.colors)[0]][name] = card
+
+    return mono_cards, colorless_cards, color_cohorts
+
+
+def dual_cohort(all_cards: Dict[str, FlatCard], colors: Iterable[str]) -> Dict[str, FlatCard]:
+    """
+    The colored cards within colors.
+    """
+    mask = color_mask(colors)
+    return {name: card for name, card in all_cards.items() if card.within(mask)}
 
-    # Input validation
+
+def validate_decks(decks: Dict[str, Dict]):
+    for deck in decks.values():
+        validate_deck(deck["primary_color"], deck["colors"])
+
+
+def validate_deck(primary_color: str, colors: List[str]):
     if primary_color not in VALID_COLORS:
         raise ValueError(f"Invalid primary color '{primary_color}'. Must be one of {VALID_COLORS}")
 
@@ -46,106 +227,127 @@ def score_cards(
         if color not in VALID_COLORS:
             raise ValueError(f"Invalid support color '{colors}'. Must be one of {VALID_COLORS}")
 
-    cards_parsed_oracle = parse_oracle(data)
-    all_cards = transform(data, cards_parsed_oracle)
 
-    mono_cards = {
-        name: card for name, card in all_cards.items()
-        if len(card.get("color_identity", [])) == 1
-    }
-    num = len(mono_cards)
+def analyze_dual(
+    analysis: Dict,
+    colors: frozenset,
+    mono_cards: Dict[str, FlatCard],
+    colorless_cards: Dict[str, FlatCard],
+    color_cohorts: Dict[str, Dict[str, FlatCard]]
+) -> Dict:
+    """
+    Everything about a deck that depends only on its colors: the dual
+    cohort, its common tokens and ngrams, and their counts in each mono
+    color cohort (the primary counts are one cohort, the mono counts the sum).
+    An analysis with an "ngram_miner" (see incremental.IncrementalAnalysis)
+    supplies the cohort's mined ngrams instead of mining them here.
+    """
+    dual_cards = dual_cohort(get_flat_cards(analysis), colors)
+
+    trace = telemetry.current()
+
+    with trace.span("tokens"):
+        dual_tokens_freqs = get_common_tokens(dual_cards)
+        dual_tokens_freqs_by_color = {
+            color: Counter({
+                token: sum(1 for card in cards.values() if card.has_type_token(token))
+                for token in dual_tokens_freqs
+            })
+            for color, cards in color_cohorts.items()
+        }
+
+    with trace.span("corpus.intern"):
+        corpus = get_token_corpus(analysis)
+    with trace.span("ngrams"):
+        miner = analysis.get("ngram_miner")
+        if miner is None:
+            dual_ngrams_freqs = get_common_ngrams(dual_cards, corpus)
+        else:
+            dual_ngrams_freqs = select_common_ngrams(miner.mine_ngrams(colors), corpus)
+    with trace.span("ngrams.count_in_cohorts"):
+        cohort_colors = list(color_cohorts)
+        ngram_counts = count_ngrams_in_corpora(
+            [color_cohorts[color] for color in cohort_colors], set(dual_ngrams_freqs.keys()), corpus
+        )
+        dual_ngrams_freqs_by_color = dict(zip(cohort_colors, ngram_counts))
+
+    trace.append("dual_stages", {
+        "colors": sorted(colors),
+        "dual_cards": len(dual_cards),
+        "common_tokens": len(dual_tokens_freqs),
+        "selected_ngrams": len(dual_ngrams_freqs)
+    })
+
+    # Tokens then ngrams, each with its counts in the dual and mono cohorts
+    with trace.span("emergence.counts"):
+        cohort_counts = CohortCounts(
+            [*dual_tokens_freqs, *dual_ngrams_freqs],
+            {**dual_tokens_freqs, **dual_ngrams_freqs},
+            {
+                color: {**dual_tokens_freqs_by_color.get(color, {}), **dual_ngrams_freqs_by_color.get(color, {})}
+                for color in color_cohorts
+            }
+        )
 
-    colorless_cards = {
-        name: card for name, card in all_cards.items()
-        if card.get("color_identity", []) == []
-    }
+    relevant_cards = {**dual_cards, **colorless_cards}
 
-    primary_cards = {
-        name: card for name, card in all_cards.items()
-        if card.get("color_identity", []) == [primary_color]
+    return {
+        "num_dual": len(dual_cards),
+        "cohort_counts": cohort_counts,
+        "relevant_rank": {name: rank for rank, name in enumerate(relevant_cards)}
     }
-    num_primary = len(primary_cards)
 
-    dual_cards = {
-        name: card for name, card in all_cards.items()
-        if set(card.get("color_identity", [])) <= set(colors)
-           and card.get("color_identity", []) != []
-    }
-    num_dual = len(dual_cards)
-
-    # === Token boost calculation ===
-    dual_tokens_freqs = get_common_tokens(dual_cards)
-    dual_tokens_freqs_primary = Counter()
-    dual_tokens_freqs_all = Counter()
-
-    for token in dual_tokens_freqs:
-        for card in primary_cards.values():
-            if token == 'equip':
-                if token in [k.lower() for k in card.get("keywords", [])]:
-                    dual_tokens_freqs_primary[token] += 1
-                    continue
-            types = [t.lower() for t in card.get("types", [])]
-            if token in types:
-                dual_tokens_freqs_primary[token] += 1
-
-        for card in mono_cards.values():
-            if token == 'equip':
-                if token in [k.lower() for k in card.get("keywords", [])]:
-                    dual_tokens_freqs_all[token] += 1
-                    continue
-            types = [t.lower() for t in card.get("types", [])]
-            if token in types:
-                dual_tokens_freqs_all[token] += 1
-
-    dual_emergent = {}
-    primary_emergent = {}
-
-    for token in dual_tokens_freqs:
-        dual = emergence_score(dual_tokens_freqs_all[token], dual_tokens_freqs[token], num, num_dual)
-        primary = emergence_score(dual_tokens_freqs[token], dual_tokens_freqs_primary[token], num_dual, num_primary)
-
-        if dual > .07:
-            dual_emergent[token] = dual
-        if primary > .07:
-            primary_emergent[token] = primary
-
-    # === Phrase boost calculation ===
-    dual_ngrams_freqs = get_common_ngrams(dual_cards)
-    dual_ngrams_freqs_primary = count_ngrams_in_corpus(primary_cards, set(dual_ngrams_freqs.keys()))
-    dual_ngrams_freqs_all = count_ngrams_in_corpus(mono_cards, set(dual_ngrams_freqs.keys()))
-
-    for ngram in dual_ngrams_freqs:
-        dual = emergence_score(dual_ngrams_freqs_all[ngram], dual_ngrams_freqs[ngram], num, num_dual)
-        primary = emergence_score(dual_ngrams_freqs[ngram], dual_ngrams_freqs_primary[ngram], num_dual, num_primary)
-
-        if dual > .07:
-            dual_emergent[ngram] = dual
-        if primary > .07:
-            primary_emergent[ngram] = primary
 
-    relevant_cards = {**dual_cards, **colorless_cards}
+def score_deck(
+    analysis: Dict,
+    dual: Dict,
+    primary_color: str,
+    num: int,
+    threshold: float = DEFAULT_THRESHOLD,
+    alpha: float = DEFAULT_ALPHA
+) -> dict[str, dict[str, List[str]]]:
+    """
+    Matches the elements emerging for a deck (scored against threshold,
+    with alpha weighting the cohort's own rate; see emergence) to cards.
+    """
+    num_dual = dual["num_dual"]
+    primary_mask = COLOR_BITS[primary_color]
+    num_primary = sum(1 for card in get_flat_cards(analysis).values() if card.colors == primary_mask)
+
+    # === Token and phrase boost calculation ===
+    trace = telemetry.current()
+    with trace.span("emergence"):
+        dual_emergent, primary_emergent = dual["cohort_counts"].emergent(
+            primary_color, num, num_dual, num_primary, threshold, alpha
+        )
+
+    relevant_rank = dual["relevant_rank"]
+    with trace.span("match.index"):
+        index = get_card_index(analysis)
 
     dual_element_to_cards = defaultdict(list)
     primary_element_to_cards = defaultdict(list)
 
     # === Match elements to cards
-    for element, _ in dual_emergent.items():
-        for name, card in relevant_cards.items():
-            if isinstance(element, str):
-                if card_has_token(card, element):
-                    dual_element_to_cards[element].append(name)
-            else:
-                if card_has_phrase(card, element):
-                    dual_element_to_cards[ngram_to_string(element)].append(name)
-
-    for element, _ in primary_emergent.items():
-        for name, card in relevant_cards.items():
-            if isinstance(element, str):
-                if card_has_token(card, element):
-                    primary_element_to_cards[element].append(name)
-            else:
-                if card_has_phrase(card, element):
-                    primary_element_to_cards[ngram_to_string(element)].append(name)
+    with trace.span("match"):
+        for element, _ in dual_emergent.items():
+            names = match_element(index, element, relevant_rank)
+            if names:
+                dual_element_to_cards[element_key(element)] = names
+
+        for element, _ in primary_emergent.items():
+            names = match_element(index, element, relevant_rank)
+            if names:
+                primary_element_to_cards[element_key(element)] = names
+
+    trace.append("decks", {
+        "primary_color": primary_color,
+        "primary_cards": num_primary,
+        "dual_emergent": len(dual_emergent),
+        "primary_emergent": len(primary_emergent),
+        "dual_matched": len(dual_element_to_cards),
+        "primary_matched": len(primary_element_to_cards)
+    })
 
     return {
         "dual_emergent": dict(dual_element_to_cards),
@@ -153,25 +355,69 @@ def score_cards(
     }
 
 
-def card_has_token(card, token):
-    if token == 'equip':
-        return token in [k.lower() for k in card.get("keywords", [])]
-    if token in [t.lower() for t in card.get("types", [])]:
-        return True
-    for field in ORACLE_FIELDS:
-        for token_list in card.get(field, []):
-            if token in token_list:
-                return True
-    return False
+def get_card_index(analysis: Dict) -> CardIndex:
+    """
+    Inverted index for an analyzed corpus, built on first use and kept
+    alongside the cached analysis so every deck of the set shares it. It
+    queries the token corpus' postings in place, so a mapped one is never
+    decoded or copied.
+    """
+    index = analysis.get("index")
+    if index is None:
+        index = CorpusCardIndex(get_flat_cards(analysis), get_token_corpus(analysis), ORACLE_FIELDS)
+        analysis["index"] = index
+    return index
 
 
-def card_has_phrase(card, phrase_ngram):
-    phrase_tokens = ngram_to_tokens(phrase_ngram)
-    for field in ORACLE_FIELDS:
-        for token_list in card.get(field, []):
-            if count_ngram_in_tokens(token_list, phrase_tokens) > 0:
-                return True
-    return False
+def get_flat_cards(analysis: Dict) -> Dict[str, FlatCard]:
+    """
+    FlatCard records of an analyzed corpus, over its token corpus; built on
+    first use and kept alongside the cached analysis. The analysis' dict
+    cards are then swapped for a CorpusCards view of them, so it stops
+    holding every card's token lists twice.
+    """
+    flat_cards = analysis.get("flat_cards")
+    if flat_cards is None:
+        corpus = get_token_corpus(analysis)
+        flat_cards = FlatCard.from_corpus(analysis["cards"], corpus)
+        analysis["flat_cards"] = flat_cards
+        analysis["cards"] = CorpusCards(flat_cards, corpus)
+    return flat_cards
+
+
+def get_token_corpus(analysis: Dict) -> TokenCorpus:
+    """
+    Integer-interned form of an analyzed corpus, built on first use and kept
+    alongside the cached analysis. An analysis with a "vocabulary" keeps
+    the token ids it lists.
+    """
+    corpus = analysis.get("corpus")
+    if corpus is None:
+        corpus = TokenCorpus.from_cards(analysis["cards"], vocabulary=analysis.get("vocabulary", ()))
+        analysis["corpus"] = corpus
+    return corpus
+
+
+def element_key(element) -> str:
+    return element if isinstance(element, str) else ngram_to_string(element)
+
+
+def match_element(index: CardIndex, element, rank: Dict[str, int]) -> List[str]:
+    """
+    Names of the ranked cards containing a token or phrase element, in rank
+    order. A token is found among a card's types or oracle texts ("equip"
+    among its keywords instead); a phrase within one oracle text, its "*"
+    slots matching any token.
+    """
+    if isinstance(element, str):
+        if element == 'equip':
+            matches = index.cards_with_keyword(element)
+        else:
+            matches = index.cards_with_type(element) | index.cards_with_text_token(element)
+    else:
+        matches = index.cards_with_phrase(ngram_to_tokens(element))
+
+    return sorted((name for name in matches if name in rank), key=rank.__getitem__)
 
 
 def load_cards(path):
@@ -179,14 +425,257 @@ def load_cards(path):
         return json.load(f)
 
 
-if __name__ == "__main__":
-    input_data = json.load(sys.stdin)
+def get_card_store() -> CardStore:
+    global _card_store
+    if _card_store is None:
+        if not CARD_STORE_PATH:
+            raise ValueError("No card store configured; pass --store or set DECK_BUILDER_CARD_STORE")
+        _card_store = CardStore(CARD_STORE_PATH)
+    return _card_store
+
+
+def load_set_cards(set_code: str) -> List[Dict]:
+    cards = get_card_store().set_cards(set_code)
+    if not cards:
+        raise ValueError(f"No cards stored for set '{set_code}'")
+    return cards
+
+
+def analyze_set(set_code: str) -> Dict:
+    """
+    Analysis of a set from the card store. With a corpus directory, the set
+    is mapped from its corpus file instead, so workers share one copy of it
+    in the page cache and none of them parses it again. The file is
+    (re)written when missing, older than the store or made by another
+    parser version, and remapped when it was replaced since.
+    """
+    if not CORPUS_DIR:
+        return analyze_cards(load_set_cards(set_code))
+
+    set_code = set_code.lower()
+    path = os.path.join(CORPUS_DIR, f"{set_code}.corpus")
+    if not corpus_file_current(path):
+        analyzed = analyze_cards(load_set_cards(set_code))
+        os.makedirs(CORPUS_DIR, exist_ok=True)
+        write_corpus(path, get_flat_cards(analyzed), get_token_corpus(analyzed), analyzed["plural_map"], PARSER_VERSION)
+
+    stat = os.stat(path)
+    file_id = (stat.st_ino, stat.st_mtime_ns)
+    mapped = _mapped_sets.get(set_code)
+    if mapped is None or mapped[0] != file_id:
+        mapped = (file_id, load_analysis(path))
+        _mapped_sets[set_code] = mapped
+    _mapped_sets.move_to_end(set_code)
+    while len(_mapped_sets) > MAPPED_SETS_MAX:
+        _mapped_sets.popitem(last=False)
+    return mapped[1]
+
+
+def corpus_file_current(path: str) -> bool:
+    if read_parser_version(path) != PARSER_VERSION:
+        return False
+    if CARD_STORE_PATH and os.path.exists(CARD_STORE_PATH):
+        return os.path.getmtime(CARD_STORE_PATH) <= os.path.getmtime(path)
+    return True
+
+
+def payload_cards(payload: Dict) -> List[Dict]:
+    """
+    The payload's "cards", or those of its "set" from the card store.
+    """
+    if "cards" in payload:
+        return payload["cards"]
+    if "set" in payload:
+        return load_set_cards(payload["set"])
+    raise ValueError("Payload needs either 'cards' or a 'set' code")
+
+
+def payload_decks(payload: Dict) -> Dict[str, Dict]:
+    """
+    The payload's "decks", or its single deck under the key "deck".
+    """
+    if "decks" in payload:
+        return payload["decks"]
+    return {"deck": {"primary_color": payload["primary_color"], "colors": payload["colors"]}}
+
+
+def has_decks(payload: Dict) -> bool:
+    return "decks" in payload or ("primary_color" in payload and "colors" in payload)
+
+
+def score_payload(payload: Dict, analysis: Dict = None):
+    """
+    Scores one input payload: a single deck ("primary_color" and "colors")
+    or a batch ("decks", keyed like score_decks) over the same "cards".
+    A "set" code in place of "cards" loads them from the card store, or
+    its corpus file (see analyze_set).
+    With an analysis already made of the cards (e.g. by
+    analyze_card_stream), "cards" isn't needed.
+    A true "trace" (or DECK_BUILDER_TRACE=1) makes the caller emit a
+    telemetry trace for it on stderr; a true "profile" (or the
+    DECK_BUILDER_PROFILE* variables) makes it capture a cProfile dump.
+    """
+    decks = payload_decks(payload)
+
+    # Input validation, before the expensive part
+    validate_decks(decks)
+    if analysis is None:
+        if "cards" not in payload and "set" in payload:
+            analysis = analyze_set(payload["set"])
+        else:
+            analysis = analyze_cards(payload_cards(payload))
 
-    cards = input_data["cards"]
-    deck_primary_color = input_data["primary_color"]
-    deck_colors = input_data["colors"]
+    results = score_analyzed_decks(analysis, decks)
+    return results if "decks" in payload else results["deck"]
 
-    result = score_cards(cards, deck_primary_color, deck_colors)
+
+def handle_request(request: Dict) -> Dict:
+    """
+    Scores a single worker request and wraps the outcome with its id.
+    Errors are reported in the response rather than raised, so one bad
+    request doesn't take the worker down.
+    """
+    request_id = request.get("id")
+    try:
+        with telemetry.tracing(telemetry.trace_requested(request), request_id), profiling(request):
+            result = score_payload(request)
+    except Exception as e:
+        return {"id": request_id, "error": f"{type(e).__name__}: {e}"}
+    return {"id": request_id, "result": result}
+
+
+def serve(in_stream, out_stream):
+    """
+    Worker loop: reads newline-delimited JSON requests from in_stream and
+    writes one response line per request to out_stream, until EOF.
+
+    Each request looks like the one-shot payload plus an "id":
+        {"id": "...", "cards": [...], "primary_color": "U", "colors": ["U", "G"]}
+    or, for a batch, "decks" in place of the single deck (see score_payload),
+    and is answered with either {"id": "...", "result": {...}} or
+    {"id": "...", "error": "..."}.
+    """
+    for line in in_stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            response = {"id": None, "error": f"Invalid request: {e}"}
+        else:
+            if isinstance(request, dict):
+                response = handle_request(request)
+            else:
+                response = {"id": None, "error": "Invalid request: expected a JSON object"}
+
+        out_stream.write(json.dumps(response) + "\n")
+        out_stream.flush()
+
+
+def serve_unix_socket(path: str):
+    """
+    Same line protocol as serve(), over a Unix domain socket. Connections
+    are handled one at a time and share the worker's warm state.
+    """
+    import socketserver
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            reader = io.TextIOWrapper(self.rfile, encoding="utf-8")
+            writer = io.TextIOWrapper(self.wfile, encoding="utf-8", write_through=True)
+            serve(reader, writer)
+
+    if os.path.exists(path):
+        os.unlink(path)
+
+    with socketserver.UnixStreamServer(path, Handler) as server:
+        server.serve_forever()
+
+
+def run_once():
+    run_payload(json.load(sys.stdin))
+
+
+def run_payload(input_data: Dict):
+    with telemetry.tracing(telemetry.trace_requested(input_data)), profiling(input_data):
+        result = score_payload(input_data)
 
     print(json.dumps(result))
     sys.stdout.flush()
+
+
+def run_streaming(in_stream=None):
+    """
+    One-shot mode that analyzes "cards" while the payload is still being
+    read (see analyze_card_stream), instead of decoding all of it first.
+
+    That needs the deck, and any "trace" or "profile" flag, before the
+    cards: the deck is validated before any card is parsed, and the flags
+    decide how the analysis runs. A payload that has them after its cards
+    is read whole first and scored like a one-shot one. Either way the
+    result is the one-shot result, "cards" taking precedence over "set".
+    A profile is named by the other fields and the cards' key, like a
+    one-shot one by its payload.
+    """
+    payload = StreamingPayload(in_stream or sys.stdin.buffer)
+    cards = payload.cards()
+    # Fields ahead of the cards are in by the time the first card is
+    first_card = next(cards, None)
+
+    if first_card is None or not has_decks(payload.fields):
+        buffered = [] if first_card is None else [first_card, *cards]
+        input_data = dict(payload.fields)
+        if payload.has_cards:
+            input_data["cards"] = buffered
+        run_payload(input_data)
+        return
+
+    # Input validation, before the expensive part
+    validate_decks(payload_decks(payload.fields))
+    hasher = PayloadHasher()
+
+    # The profile is named once the cards are in, by their key
+    def workload():
+        return {**payload.fields, "cards": hasher.hexdigest()}
+
+    flags = dict(payload.fields)
+    with telemetry.tracing(telemetry.trace_requested(flags)), profiling(flags, workload):
+        analysis = analyze_card_stream(itertools.chain([first_card], cards), hasher)
+        result = score_payload(payload.fields, analysis)
+
+    late_flags = [key for key in ("trace", "profile") if key not in flags and payload.fields.get(key)]
+    if late_flags:
+        print(f"Ignored {' and '.join(late_flags)} flags sent after the cards", file=sys.stderr)
+
+    print(json.dumps(result))
+    sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score cards for a deck.")
+    parser.add_argument("--worker", action="store_true",
+                        help="stay alive and answer newline-delimited JSON requests on stdin")
+    parser.add_argument("--socket", metavar="PATH",
+                        help="with --worker, listen on a Unix socket instead of stdin")
+    parser.add_argument("--stream", action="store_true",
+                        help="analyze cards while the one-shot payload is still arriving on stdin")
+    parser.add_argument("--store", metavar="PATH",
+                        help="card store (see ingest_bulk.py) to load payloads with a \"set\" code from")
+    parser.add_argument("--corpus-dir", metavar="PATH",
+                        help="directory of mapped corpus files to serve \"set\" payloads from (see corpus_file)")
+    args = parser.parse_args()
+
+    if args.store:
+        CARD_STORE_PATH = args.store
+    if args.corpus_dir:
+        CORPUS_DIR = args.corpus_dir
+
+    if args.worker and args.socket:
+        serve_unix_socket(args.socket)
+    elif args.worker:
+        serve(sys.stdin, sys.stdout)
+    elif args.stream:
+        run_streaming()
+    else:
+        run_once()
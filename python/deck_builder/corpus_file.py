@@ -0,0 +1,186 @@
+import json
+import mmap
+import os
+import struct
+from array import array
+from typing import Dict, Optional
+
+from flat_card import CorpusCards, FlatCard, mask_colors
+from token_corpus import TokenCorpus
+
+MAGIC = b"DBCORPUS"
+FORMAT_VERSION = 3
+
+# Header: magic, format version, parser version (see oracle_parser), then
+# each section's (offset, length in bytes), in this order
+SECTIONS = [
+    "vocab_offsets",   # int32, one more than the vocabulary: string table slices
+    "vocab_blob",      # UTF-8 of every token, back to back
+    "token_ids",       # int32
+    "text_offsets",    # int32, TokenCorpus layout
+    "field_offsets",   # int32
+    "card_offsets",    # int32
+    "posting_offsets", # int32, one more than the vocabulary: postings slices
+    "postings",        # int32 token_ids positions of each token, ascending
+    "colors",          # uint8 color identity bitmask per card (see flat_card)
+    "metadata"         # UTF-8 JSON: fields, names, rarities, types, keywords, plural map
+]
+HEADER = struct.Struct("<8sI16s" + "QQ" * len(SECTIONS))
+ALIGNMENT = 8
+
+if array("i").itemsize != 4:
+    raise ImportError("corpus files need a 4-byte C int")
+
+
+def write_corpus(
+    path: str,
+    flat_cards: Dict[str, FlatCard],
+    corpus: TokenCorpus,
+    plural_map: Dict[str, str],
+    parser_version: str = ""
+):
+    """
+    Writes an analyzed card list, as its FlatCards and their TokenCorpus
+    with its postings, as one corpus file, marked with the version of the parser that
+    produced it. The file is written next to path and renamed into place,
+    so readers that map it never see a partial file.
+    """
+    cards = [flat_cards[name] for name in corpus.names]
+    corpus.build_postings()
+    vocab_blobs = [token.encode("utf-8") for token in corpus.vocabulary]
+    vocab_offsets = array("i", [0])
+    for blob in vocab_blobs:
+        vocab_offsets.append(vocab_offsets[-1] + len(blob))
+
+    metadata = {
+        "fields": corpus.fields,
+        "names": corpus.names,
+        "rarities": [card.rarity for card in cards],
+        "types": [list(card.types) for card in cards],
+        "keywords": [list(card.keywords) for card in cards],
+        "plural_map": plural_map
+    }
+
+    payloads = [
+        vocab_offsets.tobytes(),
+        b"".join(vocab_blobs),
+        corpus.token_ids.tobytes(),
+        corpus.text_offsets.tobytes(),
+        corpus.field_offsets.tobytes(),
+        corpus.card_offsets.tobytes(),
+        corpus.posting_offsets.tobytes(),
+        corpus.postings.tobytes(),
+        bytes(card.colors for card in cards),
+        json.dumps(metadata, ensure_ascii=False).encode("utf-8")
+    ]
+
+    layout = []
+    offset = HEADER.size
+    for payload in payloads:
+        offset += -offset % ALIGNMENT
+        layout.extend([offset, len(payload)])
+        offset += len(payload)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, parser_version.encode("ascii"), *layout))
+        for payload, section_offset in zip(payloads, layout[::2]):
+            f.write(b"\0" * (section_offset - f.tell()))
+            f.write(payload)
+    os.replace(tmp_path, path)
+
+
+class MappedCorpus(TokenCorpus):
+    """
+    Read-only TokenCorpus over a memory-mapped corpus file.
+
+    The token, offset and posting arrays are memoryviews straight into the
+    mapping, so opening costs no parse and no copy, and every process
+    mapping the same file shares one page-cache copy of it. Only the vocabulary and the
+    per-card metadata are decoded into Python objects.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.path = path
+
+        magic, version, parser_version, *layout = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} corpus file")
+        self.parser_version = parser_version.rstrip(b"\0").decode("ascii")
+
+        view = memoryview(self._mmap)
+        sections = {
+            name: view[offset:offset + length]
+            for name, offset, length in zip(SECTIONS, layout[::2], layout[1::2])
+        }
+
+        metadata = json.loads(bytes(sections["metadata"]).decode("utf-8"))
+        super().__init__(metadata["fields"])
+
+        vocab_offsets = sections["vocab_offsets"].cast("i")
+        vocab_blob = sections["vocab_blob"]
+        for token_id in range(len(vocab_offsets) - 1):
+            self.intern(bytes(vocab_blob[vocab_offsets[token_id]:vocab_offsets[token_id + 1]]).decode("utf-8"))
+
+        self.token_ids = sections["token_ids"].cast("i")
+        self.text_offsets = sections["text_offsets"].cast("i")
+        self.field_offsets = sections["field_offsets"].cast("i")
+        self.card_offsets = sections["card_offsets"].cast("i")
+        self.posting_offsets = sections["posting_offsets"].cast("i")
+        self.postings = sections["postings"].cast("i")
+        self.colors = sections["colors"]
+        self.names = metadata["names"]
+        self.card_ids = {name: card_id for card_id, name in enumerate(self.names)}
+        self.metadata = metadata
+
+    def add_card(self, name: str, card: Dict):
+        raise TypeError("a mapped corpus is read-only")
+
+    def card_metadata(self, name: str) -> Dict:
+        """
+        A card's non-text fields, as in its flattened form.
+        """
+        card_id = self.card_ids[name]
+        return {
+            "name": name,
+            "rarity": self.metadata["rarities"][card_id],
+            "types": self.metadata["types"][card_id],
+            "keywords": self.metadata["keywords"][card_id],
+            "color_identity": mask_colors(self.colors[card_id])
+        }
+
+
+def read_parser_version(path: str) -> Optional[str]:
+    """
+    The parser version a corpus file was written with, from its header
+    alone; None if path isn't a corpus file of this format.
+    """
+    try:
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+    except OSError:
+        return None
+    if len(header) < HEADER.size:
+        return None
+
+    magic, version, parser_version, *_ = HEADER.unpack(header)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        return None
+    return parser_version.rstrip(b"\0").decode("ascii")
+
+
+def load_analysis(path: str) -> Dict:
+    """
+    An analysis (see core.analyze_cards) backed by a corpus file, with its
+    token corpus and FlatCards already attached.
+    """
+    corpus = MappedCorpus(path)
+    flat_cards = {name: FlatCard(name, corpus.card_metadata(name), corpus) for name in corpus.names}
+    return {
+        "cards": CorpusCards(flat_cards, corpus),
+        "plural_map": corpus.metadata["plural_map"],
+        "corpus": corpus,
+        "flat_cards": flat_cards
+    }
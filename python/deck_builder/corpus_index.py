@@ -0,0 +1,131 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+
+from flat_card import FlatCard
+from positional_index import PositionalIndex, Position, WILDCARD
+from token_corpus import TokenCorpus
+
+ORACLE_FIELDS = ["triggers", "effects", "conditions"]
+
+
+class CardIndex:
+    """
+    Inverted index over a flattened, normalized corpus.
+
+    Types and keywords map (lowercased) to the cards carrying them. Oracle
+    texts go into a PositionalIndex, so phrases (including '*' wildcard
+    slots) are answered by joining position lists instead of scanning every
+    card's token lists.
+    """
+
+    def __init__(self, cards: Dict[str, Dict], fields: List[str] = ORACLE_FIELDS):
+        self._index_labels((name, card.get("types", []), card.get("keywords", [])) for name, card in cards.items())
+
+        self.texts = PositionalIndex()
+        self.text_owners: List[str] = []
+        for name, card in cards.items():
+            for tokens in (token_list for field in fields for token_list in card.get(field, [])):
+                self.texts.add_text(tokens)
+                self.text_owners.append(name)
+
+        self.token_postings = {
+            token: {self.text_owners[text_id] for text_id, _ in positions}
+            for token, positions in self.texts.positions.items()
+        }
+
+    def _index_labels(self, labels: Iterable[Tuple[str, Iterable[str], Iterable[str]]]):
+        self.type_postings: Dict[str, Set[str]] = defaultdict(set)
+        self.keyword_postings: Dict[str, Set[str]] = defaultdict(set)
+        for name, types, keywords in labels:
+            for card_type in types:
+                self.type_postings[card_type.lower()].add(name)
+            for keyword in keywords:
+                self.keyword_postings[keyword.lower()].add(name)
+
+    def cards_with_type(self, card_type: str) -> Set[str]:
+        return self.type_postings.get(card_type, set())
+
+    def cards_with_keyword(self, keyword: str) -> Set[str]:
+        return self.keyword_postings.get(keyword, set())
+
+    def cards_with_text_token(self, token: str) -> Set[str]:
+        return self.token_postings.get(token, set())
+
+    def phrase_positions(self, tokens: List[str]) -> Set[Position]:
+        """
+        Start positions of every occurrence of the token sequence.
+        """
+        return self.texts.match_positions(tokens)
+
+    def cards_with_phrase(self, tokens: List[str]) -> Set[str]:
+        return {self.text_owners[text_id] for text_id, _ in self.phrase_positions(tokens)}
+
+
+class CorpusCardIndex(CardIndex):
+    """
+    CardIndex over the token ids of a TokenCorpus, for its FlatCards.
+
+    Text lookups go straight to the corpus' postings (see
+    TokenCorpus.build_postings), which a mapped corpus reads from its file
+    (see corpus_file), so nothing per token is built or copied. A phrase is
+    anchored on the positions of its rarest token and checked against the
+    token ids around them. Lookups take tokens like CardIndex's and encode
+    them through the corpus vocabulary. Only the texts of the given cards
+    in the given fields are searched.
+    """
+
+    def __init__(self, cards: Dict[str, FlatCard], corpus: TokenCorpus, fields: List[str] = ORACLE_FIELDS):
+        self.corpus = corpus
+        self._index_labels((name, card.types, card.keywords) for name, card in cards.items())
+
+        corpus.build_postings()
+        self.searched = bytearray(len(corpus.text_offsets) - 1)
+        for name in cards:
+            for field in fields:
+                for text_id in corpus.field_text_ids(name, field):
+                    self.searched[text_id] = 1
+
+    def cards_with_text_token(self, token: str) -> Set[str]:
+        token_id = self.corpus.vocab.get(token)
+        if token_id is None:
+            return set()
+        text_ids = {self.corpus.position_text_id(position) for position in self.corpus.token_positions(token_id)}
+        return self._owners(text_id for text_id in text_ids if self.searched[text_id])
+
+    def phrase_positions(self, tokens: List[str]) -> Set[Position]:
+        encoded = self.corpus.encode(tokens)
+        if not encoded:
+            return set()
+
+        corpus = self.corpus
+        text_offsets = corpus.text_offsets
+        m = len(encoded)
+        fixed = [(offset, token_id) for offset, token_id in enumerate(encoded) if token_id != WILDCARD]
+        if not fixed:
+            return {
+                (text_id, pos)
+                for text_id, searched in enumerate(self.searched) if searched
+                for pos in range(text_offsets[text_id + 1] - text_offsets[text_id] - m + 1)
+            }
+
+        anchor_offset, anchor_id = min(fixed, key=lambda entry: len(corpus.token_positions(entry[1])))
+        token_ids = corpus.token_ids
+        starts = set()
+        for position in corpus.token_positions(anchor_id):
+            text_id = corpus.position_text_id(position)
+            start = position - anchor_offset
+            text_start = text_offsets[text_id]
+            if (
+                self.searched[text_id]
+                and text_start <= start
+                and start + m <= text_offsets[text_id + 1]
+                and all(token_ids[start + offset] == token_id for offset, token_id in fixed)
+            ):
+                starts.add((text_id, start - text_start))
+        return starts
+
+    def cards_with_phrase(self, tokens: List[str]) -> Set[str]:
+        return self._owners({text_id for text_id, _ in self.phrase_positions(tokens)})
+
+    def _owners(self, text_ids: Iterable[int]) -> Set[str]:
+        return {self.corpus.names[self.corpus.text_card_id(text_id)] for text_id in text_ids}
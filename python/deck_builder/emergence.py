@@ -0,0 +1,107 @@
+from typing import Dict, Mapping, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    # Optional: without NumPy the same scores are computed column by column
+    np = None
+
+DEFAULT_THRESHOLD = .07
+DEFAULT_ALPHA = .2
+
+
+def emergence_score(freq_a, freq_b, total_a, total_b, alpha=DEFAULT_ALPHA):
+    p_a = freq_a / total_a if total_a else 0
+    p_b = freq_b / total_b if total_b else 0
+
+    delta = p_b - p_a
+    return max(0, (1 - alpha) * delta + alpha * p_b)
+
+
+def emergence_scores(freqs_a, freqs_b, totals_a, totals_b, alpha=DEFAULT_ALPHA):
+    """
+    emergence_score over whole rows of counts at once: row i of freqs_a and
+    freqs_b holds the counts of every element in a pair of cohorts of
+    totals_a[i] and totals_b[i] cards.
+    """
+    if np is None:
+        return [
+            [emergence_score(freq_a, freq_b, total_a, total_b, alpha) for freq_a, freq_b in zip(row_a, row_b)]
+            for row_a, row_b, total_a, total_b in zip(freqs_a, freqs_b, totals_a, totals_b)
+        ]
+
+    p_a = _rates(np.asarray(freqs_a), totals_a)
+    p_b = _rates(np.asarray(freqs_b), totals_b)
+    return np.maximum(0, (1 - alpha) * (p_b - p_a) + alpha * p_b)
+
+
+def _rates(freqs, totals):
+    totals = np.asarray(totals, dtype=np.float64)[:, None]
+    return np.divide(freqs, totals, out=np.zeros(freqs.shape), where=totals != 0)
+
+
+class CohortCounts:
+    """
+    Elements x cohorts count matrix of a color pair: for every mined token
+    and ngram, its count among the pair's dual cards, among all mono cards,
+    and in each mono color cohort. Each deck of the pair scores every
+    element from it at once (see emergent), whatever the number of elements.
+
+    A NumPy array (elements x cohorts) when NumPy is installed, otherwise a
+    list per cohort column.
+    """
+
+    def __init__(self, elements: Sequence, dual_counts: Mapping, cohort_counts: Dict[str, Mapping]):
+        self.elements = list(elements)
+        cohort_columns = [[counts.get(element, 0) for element in self.elements] for counts in cohort_counts.values()]
+        mono_column = [sum(counts) for counts in zip(*cohort_columns)] or [0] * len(self.elements)
+        columns = [[dual_counts[element] for element in self.elements], mono_column, *cohort_columns]
+
+        self.cohorts = {cohort: i for i, cohort in enumerate(["dual", "mono", *cohort_counts])}
+        if np is None:
+            self.counts = columns
+        else:
+            self.counts = np.array(columns, dtype=np.int64).reshape(len(columns), len(self.elements)).T
+
+    def column(self, cohort: str):
+        """
+        Counts of every element in a cohort: "dual", "mono" or a mono color.
+        Zeros for a color without mono cards.
+        """
+        i = self.cohorts.get(cohort)
+        if np is None:
+            return self.counts[i] if i is not None else [0] * len(self.elements)
+        return self.counts[:, i] if i is not None else np.zeros(len(self.elements), dtype=np.int64)
+
+    def emergent(
+        self,
+        primary_color: str,
+        num_mono: int,
+        num_dual: int,
+        num_primary: int,
+        threshold: float = DEFAULT_THRESHOLD,
+        alpha: float = DEFAULT_ALPHA
+    ) -> Tuple[Dict, Dict]:
+        """
+        Elements emerging in the dual cohort against the mono cards, and in
+        the primary cohort against the dual one, with their scores above
+        threshold, in element order. Both are scored in one operation.
+        """
+        dual = self.column("dual")
+        scores = emergence_scores(
+            [self.column("mono"), dual],
+            [dual, self.column(primary_color)],
+            [num_mono, num_dual],
+            [num_dual, num_primary],
+            alpha
+        )
+
+        if np is None:
+            return tuple(
+                {element: score for element, score in zip(self.elements, row) if score > threshold}
+                for row in scores
+            )
+        return tuple(
+            {self.elements[i]: float(row[i]) for i in np.flatnonzero(row > threshold)}
+            for row in scores
+        )
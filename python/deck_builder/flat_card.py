@@ -0,0 +1,106 @@
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List
+
+from token_corpus import TokenCorpus
+
+COLORS = ["W", "U", "B", "R", "G"]
+COLOR_BITS = {color: 1 << bit for bit, color in enumerate(COLORS)}
+
+
+def color_mask(colors: Iterable[str]) -> int:
+    mask = 0
+    for color in colors:
+        mask |= COLOR_BITS[color]
+    return mask
+
+
+def mask_colors(mask: int) -> List[str]:
+    return [color for color in COLORS if mask & COLOR_BITS[color]]
+
+
+class FlatCard:
+    """
+    Compact record of a flattened card, for the scoring loops.
+
+    Types and keywords are kept lowercased in frozensets and the color
+    identity as a bitmask (see COLOR_BITS), so membership and cohort tests
+    are O(1). Oracle texts aren't copied: they are the card's slices of a
+    shared TokenCorpus.
+    """
+
+    __slots__ = ("name", "rarity", "types", "keywords", "type_tokens", "keyword_tokens", "colors", "corpus")
+
+    def __init__(self, name: str, card: Dict, corpus: TokenCorpus):
+        self.name = name
+        self.rarity = card.get("rarity", "")
+        self.types = tuple(card.get("types", []))
+        self.keywords = tuple(card.get("keywords", []))
+        self.type_tokens = frozenset(card_type.lower() for card_type in self.types)
+        self.keyword_tokens = frozenset(keyword.lower() for keyword in self.keywords)
+        self.colors = color_mask(card.get("color_identity", []))
+        self.corpus = corpus
+
+    @classmethod
+    def from_corpus(cls, cards: Dict[str, Dict], corpus: TokenCorpus) -> Dict[str, "FlatCard"]:
+        """
+        FlatCards of the given cards, which must all be in corpus.
+        """
+        return {name: cls(name, card, corpus) for name, card in cards.items()}
+
+    def is_colorless(self) -> bool:
+        return self.colors == 0
+
+    def is_mono(self) -> bool:
+        return self.colors != 0 and self.colors & (self.colors - 1) == 0
+
+    def within(self, mask: int) -> bool:
+        """
+        Colored, with every color in mask.
+        """
+        return self.colors != 0 and self.colors & ~mask == 0
+
+    def texts(self, field: str) -> List[memoryview]:
+        view = memoryview(self.corpus.token_ids)
+        offsets = self.corpus.text_offsets
+        return [view[offsets[text_id]:offsets[text_id + 1]] for text_id in self.corpus.field_text_ids(self.name, field)]
+
+    def has_type_token(self, token: str) -> bool:
+        """
+        The Equip keyword or a card type, lowercased.
+        """
+        if token == 'equip' and token in self.keyword_tokens:
+            return True
+        return token in self.type_tokens
+
+
+class CorpusCards(Mapping):
+    """
+    The flattened cards of a token corpus by name, rebuilt from its
+    FlatCards, for readers that want the dict form. Each access decodes the
+    card's texts into new token lists; scoring reads the corpus instead, so
+    an analysis holding this in place of its dict cards keeps no per-card
+    token lists.
+    """
+
+    def __init__(self, flat_cards: Dict[str, FlatCard], corpus: TokenCorpus):
+        self.flat_cards = flat_cards
+        self.corpus = corpus
+
+    def __getitem__(self, name: str) -> Dict:
+        card = self.flat_cards[name]
+        flattened = {
+            "name": name,
+            "rarity": card.rarity,
+            "types": list(card.types),
+            "keywords": list(card.keywords)
+        }
+        for field in self.corpus.fields:
+            flattened[field] = [self.corpus.decode(text) for text in card.texts(field)]
+        flattened["color_identity"] = mask_colors(card.colors)
+        return flattened
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.flat_cards)
+
+    def __len__(self) -> int:
+        return len(self.flat_cards)
@@ -0,0 +1,337 @@
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from cards_transform import flatten_card, normalize_token, tokenize_text
+from ngrams import Ngram, count_bigrams, mine_ngrams
+from oracle_parser import parse_card_oracle
+from positional_index import PositionalIndex
+from suffix_index import SuffixArrayIndex
+from token_corpus import TEXT_FIELDS, TokenCorpus
+import telemetry
+
+Text = Tuple[int, ...]
+
+
+class UntrackedPattern(Exception):
+    """
+    Raised by TrackedCounts for a phrase or pattern it has no count for.
+    """
+
+
+class RecordingCounts:
+    """
+    Wraps a phrase or pattern index and remembers every count it answers,
+    so a later replay can be served from TrackedCounts.
+    """
+
+    def __init__(self, index, counts: Dict[Tuple, int]):
+        self.index = index
+        self.counts = counts
+
+    def count(self, tokens) -> int:
+        count = self.index.count(tokens)
+        self.counts[tuple(tokens)] = count
+        return count
+
+
+class TrackedCounts:
+    """
+    Phrase and pattern counts recorded by an earlier mining run and kept
+    current by delta. Asking for anything else raises UntrackedPattern.
+    """
+
+    def __init__(self, counts: Dict[Tuple, int]):
+        self.counts = counts
+
+    def count(self, tokens) -> int:
+        count = self.counts.get(tuple(tokens))
+        if count is None:
+            raise UntrackedPattern(tokens)
+        return count
+
+
+class CohortNgrams:
+    """
+    Mining state of one dual cohort: its size, bigram counts, and the count
+    of every phrase and pattern the last full mining run looked up.
+
+    Card changes are applied as deltas over just the texts that left or
+    joined the cohort. Mining then replays the rounds against the tracked
+    counts, which gives what a full run would as long as the same phrases
+    and patterns are asked about; when a threshold lets a new one in, the
+    cohort is mined in full again.
+    """
+
+    def __init__(self, num_cards: int):
+        self.num_cards = num_cards
+        self.num_texts = 0
+        self.bigram_freqs = Counter()
+        self.counts: Optional[Dict[Tuple, int]] = None
+        self.mined: Optional[Dict[Ngram, int]] = None
+
+    def apply(self, removed: List[Text], added: List[Text], num_cards_delta: int):
+        if not removed and not added and not num_cards_delta:
+            return
+
+        self.num_cards += num_cards_delta
+        self.mined = None
+        if self.counts is None:
+            return
+
+        self.num_texts += len(added) - len(removed)
+        self.bigram_freqs.update(count_bigrams(added))
+        self.bigram_freqs.subtract(count_bigrams(removed))
+        for bigram in [bigram for bigram, freq in self.bigram_freqs.items() if freq <= 0]:
+            del self.bigram_freqs[bigram]
+
+        removed_index = PositionalIndex(removed)
+        added_index = PositionalIndex(added)
+        for pattern in self.counts:
+            self.counts[pattern] += added_index.count(pattern) - removed_index.count(pattern)
+
+    def ngrams(self, get_texts: Callable[[], List[Text]], vocabulary: List[str]) -> Dict[Ngram, int]:
+        """
+        Mined ngrams of the cohort. get_texts returns its current texts and
+        is only called if it has to be mined in full.
+        """
+        if self.mined is not None:
+            return self.mined
+
+        trace = telemetry.current()
+        if self.counts is not None:
+            tracked = TrackedCounts(self.counts)
+            try:
+                self.mined = mine_ngrams(self.bigram_freqs, self.num_cards, self.num_texts, tracked, tracked, vocabulary)
+            except UntrackedPattern:
+                pass
+            else:
+                trace.append("incremental.mines", {"cards": self.num_cards, "full": False})
+                return self.mined
+
+        texts = get_texts()
+        counts = {}
+        with trace.span("ngrams.bigrams"):
+            self.bigram_freqs = count_bigrams(texts)
+        with trace.span("ngrams.index"):
+            phrase_index = RecordingCounts(SuffixArrayIndex(texts), counts)
+            pattern_index = RecordingCounts(PositionalIndex(texts), counts)
+        self.num_texts = len(texts)
+        self.mined = mine_ngrams(self.bigram_freqs, self.num_cards, self.num_texts, phrase_index, pattern_index, vocabulary)
+        self.counts = counts
+        trace.append("incremental.mines", {"cards": self.num_cards, "full": True})
+        return self.mined
+
+
+class IncrementalAnalysis:
+    """
+    An analyzed card list that is kept up to date as cards are added,
+    removed or changed, e.g. while a set's spoilers come in a few a day.
+
+    Only the touched cards are parsed and flattened again. Token counts and
+    the plural map follow by delta, and cards are re-normalized only when
+    the plural form of one of their tokens changed. Each dual cohort that
+    has been scored keeps its bigram and ngram counts (see CohortNgrams),
+    which are updated from the texts that left or joined it.
+
+    analysis() has the shape of core.analyze_cards' result and scores with
+    core.score_analyzed_decks to the same frequencies as a full analysis of
+    cards(). It reflects the cards as of the last update.
+    """
+
+    def __init__(self, cards: Iterable[Dict] = ()):
+        self.raw: Dict[str, Dict] = {}
+        self.flattened: Dict[str, Dict] = {}
+        self.normalized: Dict[str, Dict] = {}
+        self.texts: Dict[str, List[Text]] = {}
+        self.token_counts = Counter()
+        self.plural_map: Dict[str, str] = {}
+        self.interner = TokenCorpus()
+        self.cohorts: Dict[frozenset, CohortNgrams] = {}
+        self._analysis = None
+
+        self.update(added=cards)
+
+    def cards(self) -> List[Dict]:
+        """
+        The raw card list this analysis stands for.
+        """
+        return list(self.raw.values())
+
+    def update(self, added: Iterable[Dict] = (), removed: Iterable[str] = (), changed: Iterable[Dict] = ()):
+        """
+        Applies card changes. added cards go to the end of the list (a name
+        already present replaces that card in place, as a repeated name
+        does in a full analysis), changed cards replace the card of their
+        name, and removed names drop their card. A removed or changed name
+        that isn't there raises KeyError before anything is applied.
+        """
+        added, removed, changed = list(added), list(removed), list(changed)
+        for name in [*removed, *(card["name"] for card in changed)]:
+            if name not in self.raw:
+                raise KeyError(name)
+
+        trace = telemetry.current()
+        previous: Dict[str, Optional[Dict]] = {}
+
+        with trace.span("incremental.parse"):
+            for name in removed:
+                previous.setdefault(name, self.flattened.get(name))
+                del self.raw[name]
+                self.flattened.pop(name, None)
+
+            for card in changed:
+                name = card["name"]
+                previous.setdefault(name, self.flattened.get(name))
+                self._set_card(name, card)
+
+            for card in added:
+                name = card["name"]
+                previous.setdefault(name, self.flattened.get(name))
+                self._set_card(name, card)
+
+        trace.count("incremental.touched_cards", len(previous))
+        if not previous:
+            return
+
+        with trace.span("incremental.normalize"):
+            touched_tokens = set()
+            for name, card in previous.items():
+                if card is not None:
+                    tokens = card_tokens(card)
+                    self.token_counts.subtract(tokens)
+                    touched_tokens.update(tokens)
+                if name in self.flattened:
+                    tokens = card_tokens(self.flattened[name])
+                    self.token_counts.update(tokens)
+                    touched_tokens.update(tokens)
+            changed_plurals = self._update_plural_map(touched_tokens)
+
+            renormalize = set(previous)
+            if changed_plurals:
+                renormalize.update(
+                    name for name, card in self.flattened.items()
+                    if not changed_plurals.isdisjoint(card_tokens(card))
+                )
+        trace.count("incremental.vocabulary", len(self.token_counts))
+        trace.count("incremental.renormalized_cards", len(renormalize))
+
+        with trace.span("incremental.cohorts"):
+            self._renormalize(renormalize)
+        self._analysis = None
+
+    def analysis(self) -> Dict:
+        """
+        The current analysis, for core.score_analyzed_decks. Its derived
+        indexes are built on first use, as for a cached analysis.
+        """
+        if self._analysis is None:
+            self._analysis = {
+                "cards": {name: self.normalized[name] for name in self.raw if name in self.normalized},
+                "plural_map": dict(self.plural_map),
+                "vocabulary": self.interner.vocabulary,
+                "ngram_miner": self
+            }
+        return self._analysis
+
+    def mine_ngrams(self, colors: frozenset) -> Dict[Ngram, int]:
+        """
+        Mined ngrams (in interned token ids) of the dual cohort of colors,
+        from its tracked counts where possible.
+        """
+        cohort = self.cohorts.get(colors)
+        if cohort is None:
+            cohort = CohortNgrams(sum(1 for card in self.normalized.values() if in_cohort(card, colors)))
+            self.cohorts[colors] = cohort
+
+        return cohort.ngrams(lambda: self._cohort_texts(colors), self.interner.vocabulary)
+
+    def _cohort_texts(self, colors: frozenset) -> List[Text]:
+        names = [name for name in self.raw if name in self.normalized and in_cohort(self.normalized[name], colors)]
+        return [text for name in names for text in self.texts[name]]
+
+    def _set_card(self, name: str, card: Dict):
+        self.raw[name] = card
+        parsed_oracle = parse_card_oracle(card)
+        if parsed_oracle:
+            self.flattened[name] = tokenize_flattened(flatten_card(name, card, parsed_oracle))
+        else:
+            self.flattened.pop(name, None)
+
+    def _update_plural_map(self, touched_tokens: set) -> set:
+        """
+        Brings the plural map in line with the token counts. Only a token
+        whose count changed can have entered or left the vocabulary, so only
+        it and its plural are looked at. Returns the plurals whose mapping
+        changed.
+        """
+        vocabulary = self.token_counts
+        for token in touched_tokens:
+            if vocabulary[token] <= 0:
+                del vocabulary[token]
+
+        changed = set()
+        for token in touched_tokens:
+            for plural in (token, token + "s"):
+                singular = plural[:-1]
+                mapped = singular if plural.endswith("s") and plural in vocabulary and singular in vocabulary else None
+                if self.plural_map.get(plural) != mapped:
+                    changed.add(plural)
+                    if mapped is None:
+                        del self.plural_map[plural]
+                    else:
+                        self.plural_map[plural] = mapped
+        return changed
+
+    def _renormalize(self, names: Iterable[str]):
+        deltas = []
+        for name in names:
+            old_card, old_texts = self.normalized.pop(name, None), self.texts.pop(name, [])
+
+            new_card, new_texts = None, []
+            if name in self.flattened:
+                new_card = self._normalize(self.flattened[name])
+                new_texts = [
+                    tuple(self.interner.intern(token) for token in tokens)
+                    for field in TEXT_FIELDS for tokens in new_card[field]
+                ]
+                self.normalized[name] = new_card
+                self.texts[name] = new_texts
+
+            deltas.append((old_card, old_texts, new_card, new_texts))
+
+        for colors, cohort in self.cohorts.items():
+            removed, added, num_cards_delta = [], [], 0
+            for old_card, old_texts, new_card, new_texts in deltas:
+                if old_card is not None and in_cohort(old_card, colors):
+                    removed.extend(old_texts)
+                    num_cards_delta -= 1
+                if new_card is not None and in_cohort(new_card, colors):
+                    added.extend(new_texts)
+                    num_cards_delta += 1
+            cohort.apply(removed, added, num_cards_delta)
+
+    def _normalize(self, card: Dict) -> Dict:
+        plural_map = self.plural_map
+        normalized = dict(card)
+        for field in TEXT_FIELDS:
+            normalized[field] = [[plural_map.get(token, token) for token in tokens] for tokens in card[field]]
+        return normalized
+
+
+def tokenize_flattened(card: Dict) -> Dict:
+    """
+    A flattened card with each text tokenized and its tokens normalized,
+    short of the corpus-wide plural mapping.
+    """
+    for field in TEXT_FIELDS:
+        card[field] = [[normalize_token(token) for token in tokenize_text(text)] for text in card[field]]
+    return card
+
+
+def card_tokens(card: Dict) -> Counter:
+    return Counter(token for field in TEXT_FIELDS for tokens in card[field] for token in tokens)
+
+
+def in_cohort(card: Dict, colors: frozenset) -> bool:
+    color_identity = card.get("color_identity", [])
+    return color_identity != [] and set(color_identity) <= colors
@@ -0,0 +1,147 @@
+import codecs
+import json
+from typing import Dict, Iterator
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+# Characters that could continue a number cut off by a chunk boundary
+_NUMBER_CHARS = "0123456789.eE+-"
+
+
+class StreamingPayload:
+    """
+    Incremental reader for a JSON object payload whose bulk is one
+    top-level array, e.g. {"cards": [...], "primary_color": "U", ...}.
+
+    cards() yields the elements of that array one by one, as soon as each
+    is complete in the input, so callers can work on early elements while
+    later ones are still arriving. Only the undecoded tail of the input is
+    buffered. Every other top-level field, before or after the array, ends
+    up in fields once cards() is exhausted; those before it are there by
+    the time the first element is yielded. has_cards tells whether the
+    array was there at all.
+
+    stream is a binary stream (e.g. sys.stdin.buffer); its bytes are
+    decoded as UTF-8 incrementally.
+    """
+
+    def __init__(self, stream, array_key: str = "cards", chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.stream = stream
+        self.array_key = array_key
+        self.chunk_size = chunk_size
+        self.fields: Dict = {}
+        self.has_cards = False
+
+        self._read = getattr(stream, "read1", stream.read)
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def cards(self) -> Iterator:
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            self._expect_end()
+            return
+
+        while True:
+            key = self._value()
+            if not isinstance(key, str):
+                raise self._error("Expecting property name")
+            self._expect(":")
+
+            if key == self.array_key and self._peek() == "[":
+                self.has_cards = True
+                yield from self._array_elements()
+            else:
+                self.fields[key] = self._value()
+
+            if self._expect(",}") == "}":
+                break
+
+        self._expect_end()
+
+    def elements(self) -> Iterator:
+        """
+        cards() for input that is itself one top-level array, e.g. a
+        Scryfall bulk-data file. There are no fields.
+        """
+        if self._peek() != "[":
+            raise self._error("Expecting '['")
+        yield from self._array_elements()
+        self._expect_end()
+
+    def _array_elements(self) -> Iterator:
+        self._pos += 1
+        if self._peek() == "]":
+            self._pos += 1
+            return
+
+        while True:
+            yield self._value()
+            if self._expect(",]") == "]":
+                return
+
+    def _value(self):
+        """
+        Decodes the next complete JSON value, reading more input until it is
+        complete. A number followed by nothing (or by what could still be
+        part of it) may have been cut off by a chunk boundary, so values are
+        only accepted once the next character is in, or at EOF.
+        """
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            else:
+                if self._eof or (end < len(self._buffer) and self._buffer[end] not in _NUMBER_CHARS):
+                    self._pos = end
+                    return value
+            self._fill()
+
+    def _peek(self) -> str:
+        """
+        Skips whitespace and returns the next character ("" at EOF).
+        """
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer) or self._eof:
+                return self._buffer[self._pos:self._pos + 1]
+            self._fill()
+
+    def _expect(self, allowed: str) -> str:
+        char = self._peek()
+        if not char or char not in allowed:
+            raise self._error(f"Expecting one of {allowed!r}")
+        self._pos += 1
+        return char
+
+    def _expect_end(self):
+        if self._peek():
+            raise self._error("Extra data")
+
+    def _fill(self):
+        if self._eof:
+            return
+
+        # Drop what has been decoded already, so the buffer holds at most
+        # the value in progress plus one chunk
+        self._buffer = self._buffer[self._pos:]
+        self._pos = 0
+
+        data = self._read(self.chunk_size)
+        if not data:
+            self._eof = True
+            self._buffer += self._text_decoder.decode(b"", final=True)
+        else:
+            self._buffer += self._text_decoder.decode(data)
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self._buffer, self._pos)
@@ -1,11 +1,25 @@
 import collections
+import heapq
 from collections import defaultdict
 from typing import Set, List, Dict, Optional, Tuple
+from phrase_matcher import PhraseMatcher
+from positional_index import PositionalIndex, WILDCARD
+from suffix_index import SuffixArrayIndex
+from token_corpus import TokenCorpus
+import telemetry
 
 Bigram = Tuple[str, str]
 Ngram = Tuple[Bigram, ...]
 
 ROUGH_MIN_PROP = 0.05
+# Opt-in pruning of the merge rounds (see merge_ngrams_via_chains), both off
+# by default because both change what is mined: validate_ngrams also keeps
+# chains rarer than the rough minimum frequency, and candidates over the
+# budget are dropped unvalidated, whatever their real frequency.
+# Least frequency of the ngrams chained per round; None chains every ngram
+ROUND_MIN_SUPPORT = None
+# Most chained candidates validated per round; None for no limit
+ROUND_CANDIDATE_BUDGET = None
 
 def extract_texts(flattened: Dict) -> List[List[str]]:
     all_texts = []
@@ -23,52 +37,100 @@ def extract_bigrams(tokens: List[str]) -> List[Bigram]:
 def construct_ngrams(
     tokenized_texts: List[List[str]],
     num_cards: int,
+    vocabulary: Optional[List[str]] = None,
 ) -> Dict[Ngram, int]:
-    rough_min_freq = max(1, int(num_cards * ROUGH_MIN_PROP))
+    """
+    Mines frequent ngrams. Texts may be lists of token strings, or token ids
+    from a TokenCorpus together with its vocabulary.
+    """
+    trace = telemetry.current()
+
+    with trace.span("ngrams.bigrams"):
+        bigram_freqs = count_bigrams(tokenized_texts)
+    with trace.span("ngrams.index"):
+        phrase_index = SuffixArrayIndex(tokenized_texts)
+        pattern_index = PositionalIndex(tokenized_texts)
 
-    # Count bigrams
+    return mine_ngrams(bigram_freqs, num_cards, len(tokenized_texts), phrase_index, pattern_index, vocabulary)
+
+
+def count_bigrams(tokenized_texts: List[List[str]]) -> collections.Counter:
     bigram_freqs = collections.Counter()
     for tokens in tokenized_texts:
         for bigram in extract_bigrams(tokens):
             bigram_freqs[bigram] += 1
+    return bigram_freqs
+
+
+def mine_ngrams(
+    bigram_freqs: Dict[Bigram, int],
+    num_cards: int,
+    num_texts: int,
+    phrase_index,
+    pattern_index,
+    vocabulary: Optional[List[str]] = None,
+) -> Dict[Ngram, int]:
+    """
+    The mining rounds of construct_ngrams, given the texts' bigram counts
+    (in first-occurrence order) and anything that counts exact phrases
+    (phrase_index) and wildcard patterns (pattern_index) in them.
+    """
+    trace = telemetry.current()
+    rough_min_freq = max(1, int(num_cards * ROUGH_MIN_PROP))
 
     # Wrap bigrams as single-element ngrams if they meet min frequency
     filtered = {(bg,): freq for bg, freq in bigram_freqs.items() if freq >= rough_min_freq}
     current_ngrams = filtered
     all_ngrams = dict(filtered)
 
-    # Merge chains of ngrams
+    trace.append("ngrams.bigrams", {"distinct": len(bigram_freqs), "frequent": len(filtered)})
+
+    # Merge chains of ngrams, validating every round against one index
     while True:
-        candidates = merge_ngrams_via_chains(current_ngrams)
+        pruned = collections.Counter(support=0, budget=0)
+        with trace.span("ngrams.construct"):
+            candidates = merge_ngrams_via_chains(
+                current_ngrams, ROUND_MIN_SUPPORT, ROUND_CANDIDATE_BUDGET, pruned
+            )
         if not candidates:
+            trace.append("ngrams.rounds", {"candidates": 0, "validated": 0, "pruned": dict(pruned)})
             break
-        validated = validate_ngrams(candidates, tokenized_texts)
+        with trace.span("ngrams.validate"):
+            validated = validate_ngrams(candidates, None, phrase_index)
+        trace.append("ngrams.rounds", {
+            "candidates": len(candidates),
+            "validated": len(validated),
+            "pruned": dict(pruned)
+        })
         if not validated:
             break
         all_ngrams.update(validated)
         current_ngrams = validated
 
     # Generalize ngrams
-    all_ngrams = generalize_ngrams(all_ngrams, tokenized_texts)
+    with trace.span("ngrams.generalize"):
+        mined = len(all_ngrams)
+        all_ngrams = generalize_ngrams(all_ngrams, None, pattern_index, vocabulary, num_texts)
+    trace.append("ngrams.mined", {"ngrams": mined, "generalized": len(all_ngrams) - mined})
 
     return all_ngrams
 
 
 def validate_ngrams(
     candidates: Dict[Ngram, int],
-    tokenized_texts: List[List[str]]
+    tokenized_texts: List[List[str]],
+    phrase_index: Optional[SuffixArrayIndex] = None
 ) -> Dict[Ngram, int]:
     validated = {}
 
     p_tolerance = .8
     n_tolerance = 1
 
-    for ngram, predicted_freq in candidates.items():
-        ngram_tokens = ngram_to_tokens(ngram)
-        actual_freq = 0
+    if phrase_index is None:
+        phrase_index = SuffixArrayIndex(tokenized_texts)
 
-        for tokens in tokenized_texts:
-            actual_freq += count_ngram_in_tokens(tokens, ngram_tokens)
+    for ngram, predicted_freq in candidates.items():
+        actual_freq = phrase_index.count(ngram_to_tokens(ngram))
 
         if actual_freq >= int(predicted_freq * p_tolerance) or predicted_freq - actual_freq > n_tolerance and actual_freq > 1:
             validated[ngram] = actual_freq
@@ -103,6 +165,18 @@ def count_ngram_in_tokens(tokens: List[str], ngram_tokens: List[str]) -> int:
     return count
 
 
+def count_pattern_in_tokens(tokens: List[str], pattern_tokens: List[str]) -> int:
+    """
+    Like count_ngram_in_tokens, but WILDCARD slots in the pattern match any token.
+    """
+    count = 0
+    n = len(pattern_tokens)
+    for i in range(len(tokens) - n + 1):
+        if all(p == WILDCARD or p == t for p, t in zip(pattern_tokens, tokens[i:i + n])):
+            count += 1
+    return count
+
+
 def bigrams_to_phrase(bigrams: Ngram) -> str:
     if not bigrams:
         return ""
@@ -112,60 +186,112 @@ def bigrams_to_phrase(bigrams: Ngram) -> str:
     return " ".join(tokens)
 
 
-def merge_ngrams_via_chains(ngrams_freq: Dict[Ngram, int]) -> Dict[Ngram, int]:
-    from collections import defaultdict
-
-    prefix_map = defaultdict(list)
-    suffix_map = defaultdict(list)
+def merge_ngrams_via_chains(
+    ngrams_freq: Dict[Ngram, int],
+    min_support: Optional[int] = None,
+    max_candidates: Optional[int] = None,
+    pruned: Optional[collections.Counter] = None
+) -> Dict[Ngram, int]:
+    """
+    Chains ngrams that overlap in all but one bigram (single bigrams: that
+    share a token) into candidates one bigram longer. A candidate's
+    predicted frequency is the smaller of its two parts', which bounds its
+    real one from above.
+
+    Candidates can be pruned, each counted in pruned under its rule when
+    given. Both rules are lossy, since a pruned candidate might have
+    validated (see ROUND_MIN_SUPPORT):
+        "support":  a part's frequency is below min_support
+        "budget":   beyond the max_candidates best predicted, per call
+    """
+    if pruned is None:
+        pruned = collections.Counter()
 
     first = next(iter(ngrams_freq))
     ngram_len = len(first)
 
-    candidates = {}
-
+    # Single bigrams join on a token, longer ngrams on ngram_len - 1 bigrams
     if ngram_len == 1:
-        prefix_map_token = defaultdict(list)
-        suffix_map_token = defaultdict(list)
+        def prefix_key(ngram): return ngram[0][0]
+        def suffix_key(ngram): return ngram[0][1]
+    else:
+        def prefix_key(ngram): return ngram[:ngram_len - 1]
+        def suffix_key(ngram): return ngram[-(ngram_len - 1):]
 
-        for ngram in ngrams_freq:
-            bigram = ngram[0]
-            prefix_map_token[bigram[0]].append(ngram)
-            suffix_map_token[bigram[1]].append(ngram)
+    prefix_map = defaultdict(list)
+    suffix_map = defaultdict(list)
+    for ngram in ngrams_freq:
+        prefix_map[prefix_key(ngram)].append(ngram)
+        suffix_map[suffix_key(ngram)].append(ngram)
 
-        for token, left_ngrams in suffix_map_token.items():
-            right_ngrams = prefix_map_token.get(token, [])
-            for left in left_ngrams:
-                for right in right_ngrams:
-                    merged = left + (right[0],)
-                    candidates[merged] = min(ngrams_freq[left], ngrams_freq[right])
+    candidates = {}
 
-    else:
-        overlap_len = ngram_len - 1
+    for overlap_key, left_ngrams in suffix_map.items():
+        right_ngrams = prefix_map.get(overlap_key, [])
+        if min_support is not None:
+            supported_left = [ngram for ngram in left_ngrams if ngrams_freq[ngram] >= min_support]
+            supported_right = [ngram for ngram in right_ngrams if ngrams_freq[ngram] >= min_support]
+            pruned["support"] += len(left_ngrams) * len(right_ngrams) - len(supported_left) * len(supported_right)
+            left_ngrams, right_ngrams = supported_left, supported_right
 
-        for ngram in ngrams_freq:
-            prefix = ngram[:overlap_len]
-            suffix = ngram[-overlap_len:]
-            prefix_map[prefix].append(ngram)
-            suffix_map[suffix].append(ngram)
+        for left in left_ngrams:
+            for right in right_ngrams:
+                candidates[left + (right[-1],)] = min(ngrams_freq[left], ngrams_freq[right])
 
-        for overlap_key, left_ngrams in suffix_map.items():
-            right_ngrams = prefix_map.get(overlap_key, [])
-            for left in left_ngrams:
-                for right in right_ngrams:
-                    merged = left + (right[-1],)
-                    candidates[merged] = min(ngrams_freq[left], ngrams_freq[right])
+    if max_candidates is not None and len(candidates) > max_candidates:
+        best = heapq.nlargest(max_candidates, enumerate(candidates.values()), key=lambda entry: (entry[1], -entry[0]))
+        keep = {idx for idx, _ in best}
+        pruned["budget"] += len(candidates) - len(keep)
+        candidates = {ngram: freq for idx, (ngram, freq) in enumerate(candidates.items()) if idx in keep}
 
     return candidates
 
 
 def reduce_ngrams(ngrams: Dict[Ngram, int]) -> Set[Ngram]:
-    selections: Set[Ngram] = set()
-    remaining = dict(ngrams)
+    """
+    Picks ngrams longest first, then most frequent, then in dict order; a
+    pick drops every ngram it contains (see is_subsequence) unless that
+    ngram's frequency holds up on its own (see survives_contest).
+
+    Same selections as repeatedly taking select_next_candidate and
+    contesting the rest with contest_ngram, but containment is worked out
+    once: a bigram -> ngrams index narrows each ngram's possible
+    supergrams, and a pick only visits the ngrams it contains.
+    """
+    order = list(ngrams)
+    position = {ngram: idx for idx, ngram in enumerate(order)}
+
+    # Containing ngrams share all of an ngram's bigrams and are longer
+    postings = defaultdict(set)
+    for idx, ngram in enumerate(order):
+        for bigram in ngram:
+            postings[bigram].add(idx)
+
+    contained = defaultdict(list)
+    for idx, ngram in enumerate(order):
+        bigram_postings = sorted((postings[bigram] for bigram in set(ngram)), key=len)
+        candidates = bigram_postings[0].intersection(*bigram_postings[1:]) if ngram else range(len(order))
+        for super_idx in candidates:
+            supergram = order[super_idx]
+            if len(supergram) > len(ngram) and is_subsequence(ngram, supergram):
+                contained[super_idx].append(idx)
+
+    heap = [(-len(ngram), -freq, position[ngram]) for ngram, freq in ngrams.items()]
+    heapq.heapify(heap)
 
-    while remaining:
-        next_ngram = select_next_candidate(remaining)
-        selections.add(next_ngram)
-        remaining = contest_ngram(remaining, next_ngram)
+    selections: Set[Ngram] = set()
+    dropped = set()
+    while heap:
+        _, _, idx = heapq.heappop(heap)
+        if idx in dropped:
+            continue
+
+        supergram = order[idx]
+        selections.add(supergram)
+        supergram_freq = ngrams[supergram]
+        for sub_idx in contained[idx]:
+            if sub_idx not in dropped and not survives_contest(ngrams[order[sub_idx]], supergram_freq):
+                dropped.add(sub_idx)
 
     return selections
 
@@ -179,32 +305,48 @@ def is_subsequence(small: Ngram, big: Ngram) -> bool:
     return all(b in it for b in small)
 
 
+def survives_contest(freq: int, supergram_freq: int) -> bool:
+    """
+    Whether an ngram stays in play once a supergram containing it is picked.
+    """
+    p_tolerance = .8
+    n_tolerance = 1
+
+    return freq != supergram_freq and supergram_freq / freq > p_tolerance and freq - supergram_freq > n_tolerance
+
+
 def contest_ngram(
     ngrams: Dict[Ngram, int],
     supergram: Ngram
 ) -> Dict[Ngram, int]:
     supergram_freq = ngrams.get(supergram, 0)
-    p_tolerance = .8
-    n_tolerance = 1
 
     return {
         ngram: freq
         for ngram, freq in ngrams.items()
         if ngram != supergram and (
             not is_subsequence(ngram, supergram)
-            or (freq != supergram_freq and supergram_freq / freq > p_tolerance and freq - supergram_freq > n_tolerance)
+            or survives_contest(freq, supergram_freq)
         )
     }
 
 
 def generalize_ngrams(
     ngrams: Dict[Ngram, int],
-    tokenized_texts: List[List[str]]
+    tokenized_texts: List[List[str]],
+    pattern_index: Optional[PositionalIndex] = None,
+    vocabulary: Optional[List[str]] = None,
+    num_texts: Optional[int] = None
 ) -> Dict[Ngram, int]:
     """
     Generalize ngrams by replacing one inner token with wildcard '*'
     if it results in higher frequency and is not at the boundary.
+    With a pattern_index and num_texts, tokenized_texts isn't needed.
     """
+    if pattern_index is None:
+        pattern_index = PositionalIndex(tokenized_texts)
+    if num_texts is None:
+        num_texts = len(tokenized_texts)
 
     def ngram_to_token_list(ngram: Ngram) -> List[str]:
         tokens = [ngram[0][0]]
@@ -221,18 +363,18 @@ def generalize_ngrams(
         diffs = [i for i, (a, b) in enumerate(zip(t1, t2)) if a != b]
         return diffs[0] if len(diffs) == 1 else None
 
-    def is_plural_pair(t1: str, t2: str) -> bool:
+    def is_plural_pair(t1, t2) -> bool:
+        if vocabulary is not None:
+            t1, t2 = vocabulary[t1], vocabulary[t2]
         return t1 == t2 + 's' or t2 == t1 + 's'
 
-    def matches_generalized_pattern(tokens: List[str], pattern: List[str]) -> bool:
-        return len(tokens) == len(pattern) and all(p == '*' or p == t for p, t in zip(pattern, tokens))
-
     # Group ngrams by length
     grouped_by_len = collections.defaultdict(list)
     for ngram in ngrams:
         grouped_by_len[len(ngram)].append(ngram)
 
     generalized_candidates = {}
+    pattern_counts = {}
 
     for length, group in grouped_by_len.items():
         if length < 2:
@@ -253,19 +395,16 @@ def generalize_ngrams(
                     continue
 
                 generalized_pattern = t1[:]
-                generalized_pattern[diff_pos] = '*'
+                generalized_pattern[diff_pos] = WILDCARD
                 generalized_ngram = token_list_to_ngram(generalized_pattern)
 
                 current_freq = generalized_candidates.get(generalized_ngram, 0)
-                count = 0
-
-                for tokens in tokenized_texts:
-                    for idx in range(len(tokens) - len(generalized_pattern) + 1):
-                        window = tokens[idx:idx + len(generalized_pattern)]
-                        if matches_generalized_pattern(window, generalized_pattern):
-                            count += 1
+                count = pattern_counts.get(generalized_ngram)
+                if count is None:
+                    count = pattern_index.count(generalized_pattern)
+                    pattern_counts[generalized_ngram] = count
 
-                if count >= max(1, int(len(tokenized_texts) * ROUGH_MIN_PROP)) and count > current_freq:
+                if count >= max(1, int(num_texts * ROUGH_MIN_PROP)) and count > current_freq:
                     generalized_candidates[generalized_ngram] = count
 
     # Merge with original ngrams
@@ -279,15 +418,38 @@ def generalize_ngrams(
 
 def get_common_ngrams(
     flattened: Dict,
+    corpus: Optional[TokenCorpus] = None,
 ) -> dict[Ngram, int]:
-    tokenized_texts = extract_texts(flattened)
+    """
+    Mines the common ngrams of the given cards over their interned tokens.
+    corpus may be a prebuilt TokenCorpus containing at least these cards.
+    """
+    if corpus is None:
+        corpus = TokenCorpus.from_cards(flattened)
+
+    trace = telemetry.current()
+    tokenized_texts = corpus.texts(flattened.keys())
     num_cards = len(flattened)
+    trace.append("ngrams.corpus", {
+        "cards": num_cards,
+        "texts": len(tokenized_texts),
+        "tokens": sum(len(tokens) for tokens in tokenized_texts)
+    })
+
+    ngrams_freqs = construct_ngrams(tokenized_texts, num_cards, corpus.vocabulary)
+    return select_common_ngrams(ngrams_freqs, corpus)
 
-    ngrams_freqs = construct_ngrams(tokenized_texts, num_cards)
-    selected_ngrams = reduce_ngrams(ngrams_freqs)
+
+def select_common_ngrams(ngrams_freqs: Dict[Ngram, int], corpus: TokenCorpus) -> dict[Ngram, int]:
+    """
+    Reduces mined ngrams (in corpus token ids) to the selected ones,
+    decoded and sorted by frequency.
+    """
+    with telemetry.current().span("ngrams.reduce"):
+        selected_ngrams = reduce_ngrams(ngrams_freqs)
 
     selected_ngrams_freqs = {
-        ngram: ngrams_freqs[ngram]
+        corpus.decode_ngram(ngram): ngrams_freqs[ngram]
         for ngram in selected_ngrams
     }
 
@@ -303,14 +465,48 @@ def count_ngrams_in_corpus(
     cards: Dict[str, Dict],
     selected_ngrams: Set[Ngram]
 ) -> Dict[Ngram, int]:
-    result = defaultdict(int)
-
-    for ngram in selected_ngrams:
-        tokens = ngram_to_tokens(ngram)
+    return count_ngrams_in_corpora([cards], selected_ngrams)[0]
 
-        for card in cards.values():
-            for field in ["effects", "triggers", "conditions"]:
-                for token_list in card.get(field, []):
-                    result[ngram] += count_ngram_in_tokens(token_list, tokens)
 
-    return dict(result)
\ No newline at end of file
+def count_ngrams_in_corpora(
+    corpora: List[Dict[str, Dict]],
+    selected_ngrams: Set[Ngram],
+    corpus: Optional[TokenCorpus] = None
+) -> List[Dict[Ngram, int]]:
+    """
+    Counts every selected ngram in each corpus, over interned tokens. Exact
+    ngrams share one Aho-Corasick automaton, built once and run over each
+    corpus in a single pass; generalized ('*') ngrams are looked up in a
+    per-corpus PositionalIndex. corpus may be a prebuilt TokenCorpus
+    containing every card of every corpus.
+    """
+    if corpus is None:
+        corpus = TokenCorpus()
+        for cards in corpora:
+            for name, card in cards.items():
+                if name not in corpus.card_ids:
+                    corpus.add_card(name, card)
+
+    # Ngrams with a token the corpus never saw can't occur anywhere
+    encoded = {ngram: corpus.encode(ngram_to_tokens(ngram)) for ngram in selected_ngrams}
+    exact = {ngram: ids for ngram, ids in encoded.items() if ids is not None and WILDCARD not in ids}
+    generalized = {ngram: ids for ngram, ids in encoded.items() if ids is not None and WILDCARD in ids}
+    matcher = PhraseMatcher(exact.values())
+
+    results = []
+    for cards in corpora:
+        texts = corpus.texts(cards.keys())
+        counts = matcher.count(texts)
+
+        result = {ngram: 0 for ngram in selected_ngrams}
+        for ngram, ids in exact.items():
+            result[ngram] = counts[ids]
+
+        if generalized:
+            pattern_index = PositionalIndex(texts)
+            for ngram, ids in generalized.items():
+                result[ngram] = pattern_index.count(ids)
+
+        results.append(result)
+
+    return results
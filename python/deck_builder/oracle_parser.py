@@ -1,4 +1,9 @@
+import hashlib
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+
+from parse_cache import ParseCache, DEFAULT_MAX_ENTRIES, parse_key
 
 # --- Pattern Constants ---
 
@@ -33,24 +38,148 @@ PREFIX_PATTERNS = [
     for t, p in ALL_PREFIXES
 ]
 
+# --- Structural Scanner ---
+# One alternation over every mark pattern, in the order they take precedence
+# at a given position. Group names are mark types; prefixes get one group each.
+
+PREFIX_GROUPS = {f"prefix_{idx}": (t, p) for idx, (t, p, _) in enumerate(PREFIX_PATTERNS)}
+
+# Clause patterns only start a word: not preceded by a letter or digit
+WORD_START = r'(?<![^\W_])'
+# Equip only starts a line
+LINE_START = r'(?<![^\n])'
+
+STRUCTURAL_SCANNER = re.compile(
+    "|".join([
+        rf'(?P<assigned_text>{ASSIGNED_TEXT_PATTERN.pattern})',
+        r'(?P<delimiter>[.;\n])',
+        rf'{LINE_START}(?P<equip>{EQUIP_PATTERN.pattern})',
+        rf'(?P<mana_cost>{MANA_SYMBOL_PATTERN.pattern})',
+        rf'(?P<tap_cost>{TAP_SYMBOL_PATTERN.pattern})',
+        rf'(?P<cost_divider>{EFFECT_COST_PATTERN.pattern})',
+        WORD_START + "(?:" + "|".join(
+            [rf'(?P<{group}>{pattern.pattern})' for group, (_, _, pattern) in zip(PREFIX_GROUPS, PREFIX_PATTERNS)]
+            + [
+                rf'(?P<reflexive_subordinate_clause>{REFLEXIVE_SUBORDINATE_CLAUSE_PATTERN.pattern})',
+                rf'(?P<optional>{EFFECT_OPTIONAL_PATTERN.pattern})',
+                rf'(?P<choice>{EFFECT_CHOICE_PATTERN.pattern})',
+                rf'(?P<replacement>{EFFECT_REPLACEMENT_PATTERN.pattern})',
+            ]
+        ) + ")",
+    ]),
+    re.IGNORECASE
+)
+
 # better way? ...[subject]....that [subject]....
 # REFLEXIVE_SUBJECT_PATTERN = re.compile(r'\bthat\s(type|card|ability|player|creature)', flags=re.IGNORECASE)
 # REFLEXIVE_SUBJECT_PATTERN2 = re.compile(r'\bthis\s(way|ability|mana)', flags=re.IGNORECASE)
 # SELF_PATTERN = re.compile(r'\bthis\s(card|creature|artifact|saga|token|aura|land|enchantment|spell)')
 # this turn/phase
 
-def parse_oracle(cards):
+# Below this many cards, starting and feeding a process pool costs more
+# than the parse itself
+PARALLEL_MIN_CARDS = 2000
+PARALLEL_MIN_CHUNK = 200
+
+# Any edit to this file is a new parser version, so cached parses made by
+# an older parser are never reused
+with open(__file__, "rb") as _source:
+    PARSER_VERSION = hashlib.sha256(_source.read()).hexdigest()[:16]
+
+PARSE_CACHE = ParseCache(
+    max_entries=int(os.environ.get("DECK_BUILDER_PARSE_CACHE_SIZE", DEFAULT_MAX_ENTRIES)),
+    db_path=os.environ.get("DECK_BUILDER_PARSE_CACHE_DB")
+)
+
+_pool = None
+_pool_workers = 0
+
+
+def parse_oracle(cards, workers=None):
+    """
+    Parses every card's oracle text, by name. Each distinct text is parsed
+    once and only if PARSE_CACHE doesn't have it yet. Large batches of
+    misses are parsed in chunks on a process pool of `workers` processes
+    (default: one per CPU); the result is the same as the serial loop's,
+    including which card wins when names repeat.
+    """
+    keys = [card_parse_key(card) for card in cards]
+    parsed = PARSE_CACHE.get_many(keys)
+
+    misses = {}
+    for key, card in zip(keys, cards):
+        if key not in parsed and key not in misses:
+            misses[key] = card
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(misses) >= PARALLEL_MIN_CARDS:
+        fresh = parse_oracle_parallel(list(misses.values()), workers)
+    else:
+        fresh = [parse_oracle_text(card) for card in misses.values()]
+
+    fresh_entries = list(zip(misses, fresh))
+    PARSE_CACHE.put_many(fresh_entries)
+    parsed.update(fresh_entries)
+
     result = {}
-    for idx, card in enumerate(cards):
-        oracle_text = card.get("oracle_text", "")
-        keywords = card.get("keywords", [])
-        keyword_text, remainder = strip_keywords(oracle_text, keywords)
-        marks = mark_structural_elements(remainder)
-        effects = parse_text(remainder, marks)
-        result[card["name"]] = effects
+    for key, card in zip(keys, cards):
+        result[card["name"]] = parsed[key]
     return result
 
 
+def parse_oracle_parallel(cards, workers):
+    texts = [{"oracle_text": card.get("oracle_text", ""), "keywords": card.get("keywords", [])} for card in cards]
+
+    chunk_size = max(PARALLEL_MIN_CHUNK, -(-len(cards) // (workers * 4)))
+    chunks = [texts[start:start + chunk_size] for start in range(0, len(texts), chunk_size)]
+
+    parsed_chunks = get_parse_pool(workers).map(parse_chunk, chunks)
+    return [parsed for chunk in parsed_chunks for parsed in chunk]
+
+
+def parse_chunk(cards):
+    return [parse_oracle_text(card) for card in cards]
+
+
+def get_parse_pool(workers):
+    """
+    The process pool is kept between calls, so a long-lived worker only
+    pays for starting it once.
+    """
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = ProcessPoolExecutor(max_workers=workers)
+        _pool_workers = workers
+    return _pool
+
+
+def card_parse_key(card):
+    return parse_key(card.get("oracle_text", ""), card.get("keywords", []), PARSER_VERSION)
+
+
+def parse_card_oracle(card):
+    """
+    parse_oracle_text through PARSE_CACHE. The result may be shared with
+    other cards; don't mutate it.
+    """
+    key = card_parse_key(card)
+    parsed = PARSE_CACHE.get(key)
+    if parsed is None:
+        parsed = parse_oracle_text(card)
+        PARSE_CACHE.put(key, parsed)
+    return parsed
+
+
+def parse_oracle_text(card):
+    oracle_text = card.get("oracle_text", "")
+    keywords = card.get("keywords", [])
+    keyword_text, remainder = strip_keywords(oracle_text, keywords)
+    marks = mark_structural_elements(remainder)
+    return parse_text(remainder, marks)
+
+
 # --- Text Preprocessing ---
 
 def strip_keywords(text, keywords):
@@ -85,149 +214,26 @@ def strip_keywords(text, keywords):
 
 # --- Structural Marking ---
 
-def match_best_prefix(text, start):
-    for type, prefix, pattern in PREFIX_PATTERNS:
-        match = pattern.match(text, pos=start)
-        if match:
-            return {
-                "type": type,
-                "prefix": prefix,
-                "start": match.start(),
-                "end": match.end(),
-                "text": text[match.start():match.end()]
-            }
-    return None
-
-
 def mark_structural_elements(text):
     """
     Traverse oracle text and mark structural elements.
+
+    A single pass of STRUCTURAL_SCANNER: at each position the alternatives
+    are tried in precedence order, and the scan resumes after each match.
     """
     marks = []
-    lower = text.lower()
-    i = 0
 
-    while i < len(text):
-        ch = text[i]
-
-        assigned_text_match = ASSIGNED_TEXT_PATTERN.match(text, i)
-        if assigned_text_match:
-            marks.append({
-                "type": "assigned_text",
-                "start": assigned_text_match.start(),
-                "end": assigned_text_match.end(),
-                "text": text[assigned_text_match.start():assigned_text_match.end()]
-            })
-            i = assigned_text_match.end()
-            continue
-
-        # Mark delimiters
-        if ch in {'.', ';', '\n'}:
-            marks.append({"type": "delimiter", "start": i, "end": i + 1, "text": ch})
-            i += 1
-            continue
-
-        if i == 0 or text[i - 1] == '\n':
-            equip_match = EQUIP_PATTERN.match(text, i)
-            if equip_match:
-                marks.append({
-                    "type": "equip",
-                    "start": i,
-                    "end": equip_match.end(),
-                    "text": text[i:equip_match.end()]
-                })
-                i = equip_match.end()
-                continue
+    for match in STRUCTURAL_SCANNER.finditer(text):
+        group = match.lastgroup
+        start, end = match.span()
 
-        mana_match = MANA_SYMBOL_PATTERN.match(text, i)
-        if mana_match:
-            marks.append({
-                "type": "mana_cost",
-                "start": mana_match.start(),
-                "end": mana_match.end(),
-                "text": text[mana_match.start():mana_match.end()]
-            })
-            i = mana_match.end()
-            continue
-
-        tap_match = TAP_SYMBOL_PATTERN.match(text, i)
-        if tap_match:
-            marks.append({
-                "type": "tap_cost",
-                "start": tap_match.start(),
-                "end": tap_match.end(),
-                "text": text[tap_match.start():tap_match.end()]
-            })
-            i = tap_match.end()
-            continue
-
-        colon_match = EFFECT_COST_PATTERN.match(text, i)
-        if colon_match:
-            marks.append({
-                "type": "cost_divider",
-                "start": colon_match.start(),
-                "end": colon_match.end(),
-                "text": text[colon_match.start():colon_match.end()]
-            })
-            i = colon_match.end()
-            continue
-
-        # Only try clause pattern matches at start of a word
-        if ch.isalpha() and (i == 0 or not text[i - 1].isalnum()):
-            # match triggers and conditions
-            match = match_best_prefix(text, i)
-            if match:
-                marks.append(match)
-                i = match["end"]
-                continue
-
-            match = REFLEXIVE_SUBORDINATE_CLAUSE_PATTERN.match(lower, i)
-            if match:
-                marks.append({
-                    "type": "reflexive_subordinate_clause",
-                    "start": match.start(),
-                    "end": match.end(),
-                    "text": text[match.start():match.end()]
-                })
-                i = match.end()
-                continue
-
-            opt_match = EFFECT_OPTIONAL_PATTERN.match(lower, i)
-            if opt_match:
-                marks.append({
-                    "type": "optional",
-                    "start": opt_match.start(),
-                    "end": opt_match.end(),
-                    "text": text[opt_match.start():opt_match.end()]
-                })
-                i = opt_match.end()
-                continue
-
-            choice_match = EFFECT_CHOICE_PATTERN.match(lower, i)
-            if choice_match:
-                marks.append({
-                    "type": "choice",
-                    "start": choice_match.start(),
-                    "end": choice_match.end(),
-                    "text": text[choice_match.start():choice_match.end()]
-                })
-                i = choice_match.end()
-                continue
-
-            replacement_match = EFFECT_REPLACEMENT_PATTERN.match(lower, i)
-            if replacement_match:
-                marks.append({
-                    "type": "replacement",
-                    "start": replacement_match.start(),
-                    "end": replacement_match.end(),
-                    "text": text[replacement_match.start():replacement_match.end()]
-                })
-                i = replacement_match.end()
-                continue
-
-        i += 1
+        if group in PREFIX_GROUPS:
+            type, prefix = PREFIX_GROUPS[group]
+            marks.append({"type": type, "prefix": prefix, "start": start, "end": end, "text": text[start:end]})
+        else:
+            marks.append({"type": group, "start": start, "end": end, "text": text[start:end]})
 
-    return sorted(marks, key=lambda m: m["start"])
+    return marks
 
 
 # --- Parsing Core ---
@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+import sqlite3
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Enough for every distinct oracle text of several sets at once
+DEFAULT_MAX_ENTRIES = 20000
+
+
+def parse_key(oracle_text: str, keywords: Iterable[str], parser_version: str) -> str:
+    """
+    Content key of one parse: the parser doesn't care about keyword order.
+    """
+    payload = json.dumps([parser_version, oracle_text, sorted(keywords)], ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ParseCache:
+    """
+    LRU cache of parse_card_oracle results keyed by parse_key(). Entries
+    are shared between cards and callers and must be treated as read-only.
+
+    If db_path is given, entries are also kept in a SQLite file there and
+    looked up on a memory miss, so separate runs (and sets sharing
+    reprinted or templated text) reuse each other's parses. The parser
+    version is part of the key, so a changed parser never sees old entries.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, db_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self._entries: "OrderedDict[str, List[Dict]]" = OrderedDict()
+        self._db = None
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, List[Dict]]:
+        found = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                found[key] = self._entries[key]
+            else:
+                missing.append(key)
+
+        for key, parsed in self._load(missing):
+            self._remember(key, parsed)
+            found[key] = parsed
+        return found
+
+    def put(self, key: str, parsed: List[Dict]):
+        self.put_many([(key, parsed)])
+
+    def put_many(self, entries: Iterable[Tuple[str, List[Dict]]]):
+        entries = list(entries)
+        for key, parsed in entries:
+            self._remember(key, parsed)
+        self._store(entries)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: str):
+        return key in self._entries
+
+    def _remember(self, key: str, parsed: List[Dict]):
+        self._entries[key] = parsed
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if not self.db_path:
+            return None
+        if self._db is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.db_path, timeout=30)
+            # One small commit per streamed card stays cheap under WAL
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS parses (key TEXT PRIMARY KEY, parsed TEXT NOT NULL)")
+            self._db.commit()
+        return self._db
+
+    def _load(self, keys: List[str]) -> List[Tuple[str, List[Dict]]]:
+        if not keys or not self.db_path:
+            return []
+
+        db = self._connection()
+        loaded = []
+        # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            rows = db.execute(
+                f"SELECT key, parsed FROM parses WHERE key IN ({','.join('?' * len(batch))})", batch
+            ).fetchall()
+            loaded.extend((key, json.loads(parsed)) for key, parsed in rows)
+        return loaded
+
+    def _store(self, entries: List[Tuple[str, List[Dict]]]):
+        if not entries or not self.db_path:
+            return
+
+        db = self._connection()
+        with db:
+            db.executemany(
+                "INSERT OR REPLACE INTO parses (key, parsed) VALUES (?, ?)",
+                [(key, json.dumps(parsed, separators=(",", ":"))) for key, parsed in entries]
+            )
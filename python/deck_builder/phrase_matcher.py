@@ -0,0 +1,66 @@
+from collections import deque
+from typing import Dict, Iterable, List, Sequence
+
+
+class PhraseMatcher:
+    """
+    Aho-Corasick automaton over token sequences.
+
+    Built once from a set of (non-empty) token patterns, it counts every
+    overlapping occurrence of every pattern in a single pass over the texts,
+    the same way count_ngram_in_tokens does for one pattern at a time.
+    """
+
+    def __init__(self, patterns: Iterable[Sequence[str]]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.pattern_states: Dict[tuple, int] = {}
+
+        for pattern in patterns:
+            pattern = tuple(pattern)
+            state = 0
+            for token in pattern:
+                next_state = self.goto[state].get(token)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.goto[state][token] = next_state
+                state = next_state
+            self.pattern_states[pattern] = state
+
+        # Breadth-first order doubles as the order for propagating counts
+        self.bfs_order: List[int] = []
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            self.bfs_order.append(state)
+            for token, child in self.goto[state].items():
+                fallback = self.fail[state]
+                while fallback and token not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(token, 0)
+                queue.append(child)
+
+    def count(self, texts: Iterable[Sequence[str]]) -> Dict[tuple, int]:
+        """
+        Occurrences of each pattern across all texts, keyed by pattern tuple.
+        """
+        goto = self.goto
+        fail = self.fail
+        hits = [0] * len(goto)
+
+        for tokens in texts:
+            state = 0
+            for token in tokens:
+                while state and token not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(token, 0)
+                hits[state] += 1
+
+        # A hit at a state is also a hit for every pattern ending on its
+        # fail chain; push counts down the chain deepest-first.
+        for state in reversed(self.bfs_order):
+            hits[self.fail[state]] += hits[state]
+
+        return {pattern: hits[state] for pattern, state in self.pattern_states.items()}
@@ -0,0 +1,71 @@
+from collections import defaultdict
+from typing import Dict, List, Sequence, Set, Tuple
+
+WILDCARD = "*"
+
+Position = Tuple[int, int]  # (text id, token offset)
+
+
+class PositionalIndex:
+    """
+    Token -> positions index over a list of token lists.
+
+    Answers where a pattern occurs, where a pattern is a token sequence that
+    may contain WILDCARD slots matching any single token. Lookups join the
+    position lists of the fixed tokens, anchored on the rarest one, so cost
+    follows the number of candidate positions rather than corpus size.
+    """
+
+    def __init__(self, tokenized_texts: Sequence[Sequence[str]] = ()):
+        self.positions: Dict[str, Set[Position]] = defaultdict(set)
+        self.text_lengths: List[int] = []
+
+        for tokens in tokenized_texts:
+            self.add_text(tokens)
+
+    def add_text(self, tokens: Sequence[str]) -> int:
+        text_id = len(self.text_lengths)
+        self.text_lengths.append(len(tokens))
+        for pos, token in enumerate(tokens):
+            self.positions[token].add((text_id, pos))
+        return text_id
+
+    def match_positions(self, pattern: Sequence[str]) -> Set[Position]:
+        """
+        Start positions of every window matching the pattern.
+        """
+        m = len(pattern)
+        if m == 0:
+            return set()
+
+        fixed = [(offset, token) for offset, token in enumerate(pattern) if token != WILDCARD]
+        if not fixed:
+            return {
+                (text_id, pos)
+                for text_id, length in enumerate(self.text_lengths)
+                for pos in range(length - m + 1)
+            }
+
+        postings = [(offset, self.positions.get(token)) for offset, token in fixed]
+        if not all(positions for _, positions in postings):
+            return set()
+
+        postings.sort(key=lambda entry: len(entry[1]))
+        anchor_offset, anchor_positions = postings[0]
+
+        text_lengths = self.text_lengths
+        starts = {
+            (text_id, pos - anchor_offset)
+            for text_id, pos in anchor_positions
+            if pos >= anchor_offset and pos - anchor_offset + m <= text_lengths[text_id]
+        }
+
+        for offset, positions in postings[1:]:
+            if not starts:
+                break
+            starts = {(text_id, pos) for text_id, pos in starts if (text_id, pos + offset) in positions}
+
+        return starts
+
+    def count(self, pattern: Sequence[str]) -> int:
+        return len(self.match_positions(pattern))
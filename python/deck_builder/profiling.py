@@ -0,0 +1,62 @@
+import cProfile
+import os
+import random
+import sys
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+from analysis_cache import payload_hash
+
+PROFILE_ENV = "DECK_BUILDER_PROFILE"
+PROFILE_SAMPLE_RATE_ENV = "DECK_BUILDER_PROFILE_SAMPLE_RATE"
+PROFILE_DIR_ENV = "DECK_BUILDER_PROFILE_DIR"
+DEFAULT_PROFILE_DIR = "profiles"
+
+# Payload keys that steer the run but don't change the scored workload
+CONTROL_KEYS = {"id", "trace", "profile"}
+
+
+def profile_requested(payload: Dict) -> bool:
+    """
+    A request is profiled if it asks for it ("profile": true), if
+    DECK_BUILDER_PROFILE is set, or by chance at
+    DECK_BUILDER_PROFILE_SAMPLE_RATE (0..1).
+    """
+    if payload.get("profile") or os.environ.get(PROFILE_ENV, "") not in ("", "0"):
+        return True
+
+    sample_rate = float(os.environ.get(PROFILE_SAMPLE_RATE_ENV, 0) or 0)
+    return sample_rate > 0 and random.random() < sample_rate
+
+
+def profile_path(payload: Dict) -> str:
+    workload = [{key: value for key, value in sorted(payload.items()) if key not in CONTROL_KEYS}]
+    profile_dir = os.environ.get(PROFILE_DIR_ENV) or DEFAULT_PROFILE_DIR
+    return os.path.join(profile_dir, f"{payload_hash(workload)}.pstats")
+
+
+@contextmanager
+def profiling(payload: Dict, workload: Optional[Callable[[], Dict]] = None):
+    """
+    Runs the enclosed work under cProfile when profile_requested(payload),
+    then dumps pstats to <profile dir>/<payload hash>.pstats (readable with
+    `python -m pstats` or snakeviz). A no-op otherwise.
+
+    For work whose payload is only known once it's done (see
+    core.run_streaming), workload is called at the end for the payload to
+    name the profile by instead.
+    """
+    if not profile_requested(payload):
+        yield None
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        path = profile_path(workload() if workload is not None else payload)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        profiler.dump_stats(path)
+        print(f"Wrote profile to {path}", file=sys.stderr)
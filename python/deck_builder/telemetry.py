@@ -0,0 +1,111 @@
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Optional
+
+TRACE_ENV = "DECK_BUILDER_TRACE"
+TRACE_EVENT = "deck_builder.trace"
+
+
+class Trace:
+    """
+    Per-request timing and counter record.
+
+    Stage durations accumulate under their span name, counters keep their
+    last value, and series collect one entry per occurrence (e.g. one per
+    construct_ngrams merge round). emit() writes it as one JSON line.
+    """
+
+    def __init__(self, request_id=None):
+        self.request_id = request_id
+        self.stages = defaultdict(float)
+        self.counters = {}
+        self.series = defaultdict(list)
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def span(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] += time.perf_counter() - start
+
+    def count(self, name: str, value):
+        self.counters[name] = value
+
+    def append(self, name: str, value):
+        self.series[name].append(value)
+
+    def to_dict(self) -> dict:
+        return {
+            "event": TRACE_EVENT,
+            "id": self.request_id,
+            "total_s": time.perf_counter() - self.started,
+            "stages_s": dict(self.stages),
+            "counters": self.counters,
+            "series": dict(self.series)
+        }
+
+    def emit(self, stream=None):
+        stream = stream or sys.stderr
+        stream.write(json.dumps(self.to_dict()) + "\n")
+        stream.flush()
+
+
+class NullTrace:
+    """
+    Stand-in used when tracing is off; every call is a no-op.
+    """
+
+    def span(self, name: str):
+        return nullcontext()
+
+    def count(self, name: str, value):
+        pass
+
+    def append(self, name: str, value):
+        pass
+
+
+NULL_TRACE = NullTrace()
+
+_current_trace: ContextVar = ContextVar("deck_builder_trace", default=NULL_TRACE)
+
+
+def current():
+    """
+    The active request's trace, or NULL_TRACE outside of tracing().
+    """
+    return _current_trace.get()
+
+
+def enabled_by_env() -> bool:
+    return os.environ.get(TRACE_ENV, "") not in ("", "0")
+
+
+@contextmanager
+def tracing(enabled: bool, request_id=None, stream=None):
+    """
+    Activates a Trace for the enclosed work and emits it on exit, even if
+    the work raised. Yields NULL_TRACE when not enabled.
+    """
+    if not enabled:
+        yield NULL_TRACE
+        return
+
+    trace = Trace(request_id)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        trace.emit(stream)
+
+
+def trace_requested(payload: Optional[dict]) -> bool:
+    return bool(payload and payload.get("trace")) or enabled_by_env()
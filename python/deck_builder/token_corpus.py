@@ -0,0 +1,169 @@
+from array import array
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from positional_index import WILDCARD
+
+TEXT_FIELDS = ["conditions", "triggers", "effects"]
+
+
+class TokenCorpus:
+    """
+    Integer-interned token corpus in CSR layout.
+
+    Every token of every text lives in one flat int array. Offset arrays
+    slice it into texts, texts into (card, field) runs, and those runs into
+    cards:
+
+        token_ids[text_offsets[t]:text_offsets[t + 1]]          text t
+        field_offsets[c * len(fields) + f] .. (next entry)      texts of card c, field f
+        card_offsets[c] .. card_offsets[c + 1]                  texts of card c
+
+    Texts are handed out as memoryview slices of token_ids, so callers share
+    the one buffer instead of holding Python lists of strings. Release those
+    views before adding more cards; the array can't grow while exported.
+
+    Postings, built on demand (see build_postings), are in the same layout:
+    the positions in token_ids of token t, in order, are
+
+        postings[posting_offsets[t]:posting_offsets[t + 1]]
+    """
+
+    def __init__(self, fields: Sequence[str] = TEXT_FIELDS, vocabulary: Iterable[str] = ()):
+        self.fields = list(fields)
+        self.vocab: Dict[str, int] = {}
+        self.vocabulary: List[str] = []
+        self.token_ids = array("i")
+        self.text_offsets = array("i", [0])
+        self.field_offsets = array("i", [0])
+        self.card_offsets = array("i", [0])
+        self.names: List[str] = []
+        self.card_ids: Dict[str, int] = {}
+        self.posting_offsets: Optional[Sequence[int]] = None
+        self.postings: Optional[Sequence[int]] = None
+
+        # Interned up front, so ids match those of an earlier corpus
+        for token in vocabulary:
+            self.intern(token)
+
+    @classmethod
+    def from_cards(
+        cls,
+        cards: Dict[str, Dict],
+        fields: Sequence[str] = TEXT_FIELDS,
+        vocabulary: Iterable[str] = ()
+    ) -> "TokenCorpus":
+        corpus = cls(fields, vocabulary)
+        for name, card in cards.items():
+            corpus.add_card(name, card)
+        return corpus
+
+    def add_card(self, name: str, card: Dict):
+        self.posting_offsets = self.postings = None
+        self.card_ids[name] = len(self.names)
+        self.names.append(name)
+
+        for field in self.fields:
+            for tokens in card.get(field, []):
+                self.token_ids.extend(self.intern(token) for token in tokens)
+                self.text_offsets.append(len(self.token_ids))
+            self.field_offsets.append(len(self.text_offsets) - 1)
+
+        self.card_offsets.append(len(self.text_offsets) - 1)
+
+    def intern(self, token: str) -> int:
+        token_id = self.vocab.get(token)
+        if token_id is None:
+            token_id = len(self.vocabulary)
+            self.vocab[token] = token_id
+            self.vocabulary.append(token)
+        return token_id
+
+    def encode(self, tokens: Iterable[str]) -> Optional[Tuple]:
+        """
+        Token ids for a token sequence, keeping WILDCARD slots as they are.
+        None if any token never occurs in the corpus.
+        """
+        encoded = []
+        for token in tokens:
+            if token == WILDCARD:
+                encoded.append(WILDCARD)
+                continue
+            token_id = self.vocab.get(token)
+            if token_id is None:
+                return None
+            encoded.append(token_id)
+        return tuple(encoded)
+
+    def decode(self, token_ids: Iterable) -> List[str]:
+        return [token_id if token_id == WILDCARD else self.vocabulary[token_id] for token_id in token_ids]
+
+    def decode_ngram(self, ngram: Tuple) -> Tuple:
+        return tuple(tuple(self.decode(bigram)) for bigram in ngram)
+
+    def text(self, text_id: int) -> memoryview:
+        return memoryview(self.token_ids)[self.text_offsets[text_id]:self.text_offsets[text_id + 1]]
+
+    def card_text_ids(self, name: str) -> range:
+        card_id = self.card_ids[name]
+        return range(self.card_offsets[card_id], self.card_offsets[card_id + 1])
+
+    def field_text_ids(self, name: str, field: str) -> range:
+        slot = self.card_ids[name] * len(self.fields) + self.fields.index(field)
+        return range(self.field_offsets[slot], self.field_offsets[slot + 1])
+
+    def build_postings(self):
+        """
+        Builds the postings of every token, unless they are current: one
+        counting pass sizes each token's run, a second fills in positions.
+        """
+        if self.postings is not None:
+            return
+
+        posting_offsets = array("i", [0]) * (len(self.vocabulary) + 1)
+        for token_id in self.token_ids:
+            posting_offsets[token_id + 1] += 1
+        for token_id in range(len(self.vocabulary)):
+            posting_offsets[token_id + 1] += posting_offsets[token_id]
+
+        postings = array("i", [0]) * len(self.token_ids)
+        next_slot = posting_offsets[:-1]
+        for position, token_id in enumerate(self.token_ids):
+            postings[next_slot[token_id]] = position
+            next_slot[token_id] += 1
+
+        self.posting_offsets = posting_offsets
+        self.postings = postings
+
+    def token_positions(self, token_id: int) -> Sequence[int]:
+        """
+        Positions in token_ids of a token, ascending (see build_postings).
+        """
+        return self.postings[self.posting_offsets[token_id]:self.posting_offsets[token_id + 1]]
+
+    def position_text_id(self, position: int) -> int:
+        """
+        Id of the text a position in token_ids falls in.
+        """
+        return bisect_right(self.text_offsets, position) - 1
+
+    def text_card_id(self, text_id: int) -> int:
+        return bisect_right(self.card_offsets, text_id) - 1
+
+    def texts(self, names: Optional[Iterable[str]] = None) -> List[memoryview]:
+        """
+        Texts of the given cards (all cards by default), card by card in the
+        corpus field order.
+        """
+        view = memoryview(self.token_ids)
+        offsets = self.text_offsets
+
+        if names is None:
+            text_ids: Iterable[int] = range(len(offsets) - 1)
+        else:
+            text_ids = (text_id for name in names for text_id in self.card_text_ids(name))
+
+        return [view[offsets[text_id]:offsets[text_id + 1]] for text_id in text_ids]
+
+    def __len__(self):
+        return len(self.names)
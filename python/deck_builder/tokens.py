@@ -1,18 +1,19 @@
 import collections
 from typing import Dict, List
+from flat_card import FlatCard
 
 MIN_FREQ_PROP = 0.02
 
-def get_common_tokens(flattened_cards: Dict[str, Dict]) -> collections.Counter:
+def get_common_tokens(flattened_cards: Dict[str, FlatCard]) -> collections.Counter:
     total_cards = len(flattened_cards)
     min_freq = int(total_cards * MIN_FREQ_PROP)
 
     counts = collections.Counter()
 
     for card in flattened_cards.values():
-        counts.update(token.lower() for token in card.get('types', []))
+        counts.update(card_type.lower() for card_type in card.types)
         # not ready to take on keywords, but want to hack equipment in
-        if 'Equip' in card.get('keywords', []):
+        if 'Equip' in card.keywords:
             counts['equip'] += 1
 
     filtered_counts = collections.Counter({tok: freq for tok, freq in counts.items() if freq >= min_freq})
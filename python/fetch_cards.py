@@ -0,0 +1,250 @@
+"""
+Fetches a set's cards (or any Scryfall search) into a core.py payload.
+
+    python fetch_cards.py --set lotr u g
+    python fetch_cards.py --query "t:legend e:ltr" --output legends.json
+
+Colors filter like fetch_lotr_cards.py: none for every card, "x" for
+colorless, one color for its mono cards, several for cards with at least
+those colors. Pages after the first are fetched concurrently over
+keep-alive connections, with a minimum interval between requests, and
+each page is extracted and filtered as soon as it arrives. --base-url
+points the fetcher at a local stand-in instead of Scryfall.
+"""
+import argparse
+import http.client
+import json
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
+
+SCRYFALL_API_URL = "https://api.scryfall.com"
+USER_AGENT = "arena-set-cracker/1.0"
+
+DEFAULT_CONCURRENCY = 4
+# Scryfall asks for 50-100 ms between requests
+DEFAULT_MIN_INTERVAL_S = 0.1
+
+
+def color_identity_matches(card_colors, input_colors):
+    card_set = {c.lower() for c in card_colors}
+    input_set = set(input_colors)
+
+    if not input_colors:
+        # no filtering: match everything
+        return True
+
+    if input_colors == ["x"]:
+        # only colorless cards
+        return len(card_set) == 0
+
+    if len(input_set) == 1:
+        # mono-colored cards: exactly one color matching input
+        return len(card_set) == 1 and next(iter(card_set)) in input_set
+
+    # multi-colored: card contains at least all input colors (subset)
+    return input_set.issubset(card_set)
+
+
+def is_relevant(card):
+    return card.get("layout") != "token" and not card.get("digital", False)
+
+
+def project_card(card):
+    """
+    The fields of a Scryfall card that core.py reads.
+    """
+    return {
+        "name": card.get("name"),
+        "rarity": card.get("rarity"),
+        "color_identity": card.get("color_identity", []),
+        "type_line": card.get("type_line", ""),
+        "oracle_text": card.get("oracle_text", ""),
+        "keywords": card.get("keywords", [])
+    }
+
+
+def extract_relevant_fields(cards):
+    return [project_card(card) for card in cards if is_relevant(card)]
+
+
+def filter_by_color_identity(cards, input_colors):
+    input_colors = [c.lower() for c in input_colors]
+    return [
+        card for card in cards
+        if color_identity_matches(card.get("color_identity", []), input_colors)
+    ]
+
+
+class RateLimiter:
+    """
+    Spaces request starts at least min_interval_s apart, across threads.
+    """
+
+    def __init__(self, min_interval_s: float):
+        self.min_interval_s = min_interval_s
+        self._next_start = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.min_interval_s
+        if start > now:
+            time.sleep(start - now)
+
+
+class ScryfallClient:
+    """
+    Scryfall GET client with one keep-alive connection per thread.
+    """
+
+    def __init__(self, base_url: str = SCRYFALL_API_URL, min_interval_s: float = DEFAULT_MIN_INTERVAL_S):
+        parsed = urllib.parse.urlsplit(base_url)
+        self.scheme = parsed.scheme
+        self.netloc = parsed.netloc
+        self.base_path = parsed.path.rstrip("/")
+        self.rate_limiter = RateLimiter(min_interval_s)
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            connection = connection_class(self.netloc, timeout=30)
+            self._local.connection = connection
+            with self._connections_lock:
+                self._connections.append(connection)
+        return connection
+
+    def get_json(self, path: str, params: Optional[Dict] = None) -> Dict:
+        url = self.base_path + path
+        if params:
+            url += "?" + urllib.parse.urlencode(params)
+        return self.get_url_json(url)
+
+    def get_url_json(self, url: str) -> Dict:
+        """
+        GETs a path on the API host, or a full URL on it (e.g. a next_page).
+        """
+        parsed = urllib.parse.urlsplit(url)
+        target = parsed.path + (f"?{parsed.query}" if parsed.query else "")
+        headers = {"User-Agent": USER_AGENT, "Accept": "application/json"}
+
+        # A kept-alive connection the server has since closed fails once;
+        # retry that on a fresh one
+        for attempt in range(2):
+            self.rate_limiter.wait()
+            connection = self._connection()
+            try:
+                connection.request("GET", target, headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                connection.close()
+                if attempt:
+                    raise
+                continue
+
+            if response.status != 200:
+                raise RuntimeError(f"GET {target} failed with HTTP {response.status}: {body[:200]!r}")
+            return json.loads(body)
+
+    def close(self):
+        with self._connections_lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+
+
+def search_pages(client: ScryfallClient, query: str, concurrency: int = DEFAULT_CONCURRENCY) -> Iterator[List[Dict]]:
+    """
+    Yields each page's cards, in page order. The first page gives the total,
+    from which every later page is requested at once on `concurrency`
+    threads; each is yielded as soon as it and the ones before it are in.
+    Without a total, pages are followed one next_page at a time.
+    """
+    first = client.get_json("/cards/search", {"q": query})
+    yield first["data"]
+
+    if not first.get("has_more"):
+        return
+
+    page_size = len(first["data"])
+    total = first.get("total_cards")
+    if not total or not page_size:
+        url = first.get("next_page")
+        while url:
+            page = client.get_url_json(url)
+            yield page["data"]
+            url = page.get("next_page") if page.get("has_more") else None
+        return
+
+    num_pages = -(-total // page_size)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [
+            executor.submit(client.get_json, "/cards/search", {"q": query, "page": page})
+            for page in range(2, num_pages + 1)
+        ]
+        for future in futures:
+            yield future.result()["data"]
+
+
+def fetch_cards(
+    query: str,
+    input_colors: List[str],
+    base_url: str = SCRYFALL_API_URL,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    min_interval_s: float = DEFAULT_MIN_INTERVAL_S
+) -> List[Dict]:
+    """
+    Cards matching a Scryfall search, reduced to the payload fields and
+    filtered by color identity while later pages are still downloading.
+    """
+    client = ScryfallClient(base_url, min_interval_s)
+    cards = []
+    try:
+        for page in search_pages(client, query, concurrency):
+            cards.extend(filter_by_color_identity(extract_relevant_fields(page), input_colors))
+    finally:
+        client.close()
+    return cards
+
+
+def output_filename(prefix: str, input_colors: List[str]) -> str:
+    if not input_colors:
+        return f"{prefix}_all_cards.json"
+    color_key = "".join(sorted([c.lower() for c in input_colors]))
+    return f"{prefix}_{color_key}_cards.json"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch a set's cards from Scryfall as a core.py payload.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--set", help="set code, e.g. ltr")
+    source.add_argument("--query", help="any Scryfall search query")
+    parser.add_argument("colors", nargs="*", help="color identity filter: none, x, or W/U/B/R/G letters")
+    parser.add_argument("--output", help="output file (default: <set>_<colors>_cards.json)")
+    parser.add_argument("--base-url", default=SCRYFALL_API_URL, help="API root, e.g. a local stand-in")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--min-interval", type=float, default=DEFAULT_MIN_INTERVAL_S,
+                        help="seconds between request starts")
+    args = parser.parse_args()
+
+    query = args.query or f"e:{args.set}"
+    cards = fetch_cards(query, args.colors, args.base_url, args.concurrency, args.min_interval)
+
+    filename = args.output or output_filename(args.set or "search", args.colors)
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump({"cards": cards}, f, indent=2)
+
+    print(f"Saved {len(cards)} cards to {filename}")
+
+
+if __name__ == "__main__":
+    main()
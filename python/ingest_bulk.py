@@ -0,0 +1,71 @@
+"""
+Ingests a Scryfall bulk-data file into a local card store for core.py.
+
+    python ingest_bulk.py default-cards.json --store cards.sqlite
+    python ingest_bulk.py oracle-cards.json --store cards.sqlite --sets ltr mom
+
+The file (default_cards or oracle_cards, hundreds of MB) is parsed one
+card at a time and never held in memory. Cards get the same projection as
+fetch_cards.py and are stored by set code; with --sets, only those sets
+are read and replaced. Like a Scryfall search, each set keeps one printing
+of each card. core.py then scores a set from the store with a
+{"set": "ltr", ...} payload and --store (or DECK_BUILDER_CARD_STORE).
+"""
+import argparse
+import os
+import sys
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "deck_builder"))
+
+from card_store import CardStore  # noqa: E402
+from fetch_cards import is_relevant, project_card  # noqa: E402
+from json_stream import StreamingPayload  # noqa: E402
+
+
+def bulk_entries(stream, set_codes: Optional[Set[str]] = None) -> Iterator[Tuple[str, Dict]]:
+    """
+    (set code, projected card) for every relevant card of a bulk-data
+    stream, optionally only for the given sets. A set's other printings of
+    a card (same oracle_id, or name without one) are skipped, as in a
+    Scryfall search, so a set holds each card once.
+    """
+    seen = set()
+    for card in StreamingPayload(stream).elements():
+        set_code = card.get("set", "").lower()
+        if set_codes is not None and set_code not in set_codes:
+            continue
+        if not is_relevant(card):
+            continue
+
+        key = (set_code, card.get("oracle_id") or card.get("name"))
+        if key in seen:
+            continue
+        seen.add(key)
+        yield set_code, project_card(card)
+
+
+def ingest(path: str, store: CardStore, set_codes: Optional[Set[str]] = None) -> int:
+    with open(path, "rb") as stream:
+        return store.replace_cards(bulk_entries(stream, set_codes), set_codes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load a Scryfall bulk-data file into a local card store.")
+    parser.add_argument("bulk_file", help="default_cards or oracle_cards JSON from Scryfall's bulk data")
+    parser.add_argument("--store", required=True, help="SQLite store to (re)fill")
+    parser.add_argument("--sets", nargs="+", help="only ingest (and replace) these set codes")
+    args = parser.parse_args()
+
+    set_codes = {code.lower() for code in args.sets} if args.sets else None
+    store = CardStore(args.store)
+    try:
+        count = ingest(args.bulk_file, store, set_codes)
+    finally:
+        store.close()
+
+    print(f"Stored {count} cards in {args.store}")
+
+
+if __name__ == "__main__":
+    main()
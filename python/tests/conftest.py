@@ -0,0 +1,6 @@
+import os
+import sys
+
+# deck_builder modules import their siblings by bare name, the way core.py
+# is run as a script; make those imports resolve under the test runner too.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deck_builder"))
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+
+
+class TestAnalysisCache(unittest.TestCase):
+    def setUp(self):
+        self.analysis = {
+            "cards": {
+                "Banish from Edoras": {
+                    "name": "Banish from Edoras",
+                    "types": ["Sorcery"],
+                    "effects": [["exile", "target", "creature"]]
+                }
+            },
+            "plural_map": {"creatures": "creature"}
+        }
+
+    def test_payload_hash_ignores_key_order(self):
+        from deck_builder.analysis_cache import payload_hash
+
+        a = [{"name": "Stone of Erech", "rarity": "uncommon"}]
+        b = [{"rarity": "uncommon", "name": "Stone of Erech"}]
+        self.assertEqual(payload_hash(a), payload_hash(b))
+        self.assertNotEqual(payload_hash(a), payload_hash(a + a))
+
+    def test_evicts_least_recently_used(self):
+        from deck_builder.analysis_cache import AnalysisCache
+
+        cache = AnalysisCache(max_entries=2)
+        cache.put("a", self.analysis)
+        cache.put("b", self.analysis)
+        cache.get("a")
+        cache.put("c", self.analysis)
+
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+
+    def test_round_trips_through_disk(self):
+        from deck_builder.analysis_cache import AnalysisCache
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            AnalysisCache(cache_dir=cache_dir).put("k", self.analysis)
+            self.assertEqual(AnalysisCache(cache_dir=cache_dir).get("k"), self.analysis)
+
+    def test_ignores_other_format_versions(self):
+        from deck_builder import analysis_cache
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            analysis_cache.AnalysisCache(cache_dir=cache_dir).put("k", self.analysis)
+
+            with open(os.path.join(cache_dir, "k.json")) as f:
+                stored = f.read()
+            stored = stored.replace(
+                f'"version": {analysis_cache.CACHE_FORMAT_VERSION}',
+                f'"version": {analysis_cache.CACHE_FORMAT_VERSION + 1}'
+            )
+            with open(os.path.join(cache_dir, "k.json"), "w") as f:
+                f.write(stored)
+
+            self.assertIsNone(analysis_cache.AnalysisCache(cache_dir=cache_dir).get("k"))
+
+    def test_ignores_other_parser_versions(self):
+        from deck_builder.analysis_cache import AnalysisCache
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            AnalysisCache(cache_dir=cache_dir, parser_version="old").put("k", self.analysis)
+
+            self.assertIsNone(AnalysisCache(cache_dir=cache_dir, parser_version="new").get("k"))
+            self.assertEqual(AnalysisCache(cache_dir=cache_dir, parser_version="old").get("k"), self.analysis)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+
+def scryfall_card(name, set_code, color_identity, **extra):
+    card = {
+        "object": "card",
+        "id": f"{set_code}-{name}",
+        "name": name,
+        "set": set_code,
+        "rarity": "common",
+        "color_identity": color_identity,
+        "type_line": "Creature — Halfling",
+        "oracle_text": "When this creature enters, create a Food token.",
+        "keywords": [],
+        "layout": "normal",
+        "prices": {"usd": "0.10"}
+    }
+    card.update(extra)
+    return card
+
+
+class TestCardStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.bulk_path = os.path.join(self.tmp.name, "default-cards.json")
+        self.store_path = os.path.join(self.tmp.name, "cards.sqlite")
+
+        self.write_bulk([
+            scryfall_card("Samwise Gamgee", "ltr", ["G", "W"]),
+            scryfall_card("Food", "tltr", [], layout="token"),
+            scryfall_card("Frodo Baggins", "ltr", ["G", "W"]),
+            scryfall_card("Arena Frodo", "ltr", ["W"], digital=True),
+            scryfall_card("Elesh Norn", "mom", ["W"])
+        ])
+
+    def write_bulk(self, cards):
+        with open(self.bulk_path, "w", encoding="utf-8") as f:
+            json.dump(cards, f, indent=1)
+
+    def test_ingest_projects_and_indexes_by_set(self):
+        from card_store import CardStore
+        from ingest_bulk import ingest
+
+        store = CardStore(self.store_path)
+        self.addCleanup(store.close)
+
+        self.assertEqual(ingest(self.bulk_path, store), 3)
+        self.assertEqual(store.set_codes(), ["ltr", "mom"])
+        self.assertEqual(store.set_cards("LTR"), [
+            {
+                "name": "Frodo Baggins",
+                "rarity": "common",
+                "color_identity": ["G", "W"],
+                "type_line": "Creature — Halfling",
+                "oracle_text": "When this creature enters, create a Food token.",
+                "keywords": []
+            },
+            {
+                "name": "Samwise Gamgee",
+                "rarity": "common",
+                "color_identity": ["G", "W"],
+                "type_line": "Creature — Halfling",
+                "oracle_text": "When this creature enters, create a Food token.",
+                "keywords": []
+            }
+        ])
+        self.assertEqual(store.db.execute("SELECT color_identity FROM cards WHERE name = 'Elesh Norn'").fetchone(), ("W",))
+
+    def test_set_filter_replaces_only_those_sets(self):
+        from card_store import CardStore
+        from ingest_bulk import ingest
+
+        store = CardStore(self.store_path)
+        self.addCleanup(store.close)
+        ingest(self.bulk_path, store)
+
+        self.write_bulk([scryfall_card("Gollum", "ltr", ["B"]), scryfall_card("Jace", "mom", ["U"])])
+        self.assertEqual(ingest(self.bulk_path, store, {"ltr"}), 1)
+
+        self.assertEqual([card["name"] for card in store.set_cards("ltr")], ["Gollum"])
+        self.assertEqual([card["name"] for card in store.set_cards("mom")], ["Elesh Norn"])
+
+    def test_ingest_keeps_one_printing_per_set(self):
+        from card_store import CardStore
+        from ingest_bulk import ingest
+
+        store = CardStore(self.store_path)
+        self.addCleanup(store.close)
+
+        self.write_bulk([
+            scryfall_card("Frodo Baggins", "ltr", ["G", "W"], oracle_id="frodo"),
+            scryfall_card("Frodo Baggins", "ltr", ["G", "W"], oracle_id="frodo", id="ltr-frodo-showcase"),
+            scryfall_card("Frodo Baggins", "ltc", ["G", "W"], oracle_id="frodo"),
+            scryfall_card("Gollum", "ltr", ["B"]),
+            scryfall_card("Gollum", "ltr", ["B"], id="ltr-gollum-borderless")
+        ])
+        self.assertEqual(ingest(self.bulk_path, store), 3)
+        self.assertEqual([card["name"] for card in store.set_cards("ltr")], ["Frodo Baggins", "Gollum"])
+        self.assertEqual([card["name"] for card in store.set_cards("ltc")], ["Frodo Baggins"])
+
+    def test_core_loads_set_payloads_from_store(self):
+        from deck_builder import core
+        from card_store import CardStore
+        from ingest_bulk import ingest
+
+        store = CardStore(self.store_path)
+        ingest(self.bulk_path, store)
+        store.close()
+
+        with mock.patch.object(core, "CARD_STORE_PATH", self.store_path), mock.patch.object(core, "_card_store", None):
+            self.assertEqual(core.payload_cards({"set": "mom"})[0]["name"], "Elesh Norn")
+            with self.assertRaises(ValueError):
+                core.payload_cards({"set": "zzz"})
+            core.get_card_store().close()
+
+        with self.assertRaises(ValueError):
+            core.payload_cards({"primary_color": "U"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import re
+import unittest
+
+TEXTS = [
+    "Target creature gets +2/+2 until end of turn.",
+    "Create two 1/1 white Soldier creature tokens.",
+    "Draw X cards, then discard a card.",
+    "Creatures you control get -1/-1 and gain lifelink.",
+    "When this creature dies, create a Food token. Tokens you control have hexproof.",
+    "Put three +1/+1 counters on target creature; it's a 4/4 Spirit now.",
+    "Each opponent loses 14 life. You gain fourteen life."
+]
+
+
+def normalize_per_token(texts):
+    """
+    Reference: the original per-token normalization, tokenizing every text
+    twice and normalizing every occurrence of every token.
+    """
+    from deck_builder.cards_transform import RE_BUFF, RE_STAT, RE_NUM, BUFF, STAT, NUM, build_plural_map
+
+    def normalize_token(token):
+        token = RE_BUFF.sub(BUFF, token)
+        token = RE_STAT.sub(STAT, token)
+        return RE_NUM.sub(NUM, token)
+
+    all_tokens = []
+    for text in texts:
+        all_tokens.extend(re.sub(r"[^\w\s~/+-]", "", text.lower()).split())
+    plural_map = build_plural_map([normalize_token(token) for token in all_tokens])
+
+    normalized_texts = []
+    for text in texts:
+        tokens = [normalize_token(token) for token in re.sub(r"[^\w\s~/+-]", "", text.lower()).split()]
+        normalized_texts.append([plural_map.get(token, token) for token in tokens])
+    return normalized_texts, plural_map
+
+
+class TestNormalization(unittest.TestCase):
+    def test_matches_per_token_normalization(self):
+        from deck_builder.cards_transform import normalize_texts_with_plural_map
+
+        normalized_texts, plural_map = normalize_texts_with_plural_map(TEXTS)
+        expected_texts, expected_plural_map = normalize_per_token(TEXTS)
+
+        self.assertEqual(normalized_texts, expected_texts)
+        self.assertEqual(plural_map, expected_plural_map)
+
+        # The corpus exercises every placeholder and singularization
+        tokens = {token for text in normalized_texts for token in text}
+        self.assertTrue({"<BUFF>", "<STAT>", "<NUM>"} <= tokens)
+        self.assertEqual(plural_map["creatures"], "creature")
+        self.assertEqual(plural_map["tokens"], "token")
+        self.assertNotIn("creatures", tokens)
+
+    def test_flattened_cards_are_normalized_in_place(self):
+        from deck_builder.cards_transform import normalize_flattened_with_plural_map
+
+        flattened = {
+            f"card {idx}": {"triggers": [], "conditions": [text] if idx % 3 == 0 else [], "effects": [text]}
+            for idx, text in enumerate(TEXTS)
+        }
+        normalized, plural_map = normalize_flattened_with_plural_map(flattened)
+
+        all_texts = [
+            tokens for card in flattened.values() for field in ["triggers", "conditions", "effects"] for tokens in card[field]
+        ]
+        expected_texts, expected_plural_map = normalize_per_token([
+            field_text for idx, text in enumerate(TEXTS) for field_text in ([text, text] if idx % 3 == 0 else [text])
+        ])
+
+        self.assertIs(normalized, flattened)
+        self.assertEqual(all_texts, expected_texts)
+        self.assertEqual(plural_map, expected_plural_map)
+
+
+if __name__ == "__main__":
+    unittest.main()
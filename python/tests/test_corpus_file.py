@@ -0,0 +1,152 @@
+import mmap
+import os
+import tempfile
+import unittest
+from collections import OrderedDict
+from unittest import mock
+
+
+class TestCorpusFile(unittest.TestCase):
+    def setUp(self):
+        from deck_builder.flat_card import FlatCard
+        from deck_builder.token_corpus import TokenCorpus
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "ltr.corpus")
+
+        self.cards = {
+            "Bilbo's Ring": {
+                "name": "Bilbo's Ring",
+                "rarity": "rare",
+                "types": ["Legendary", "Artifact", "Equipment"],
+                "keywords": ["Equip"],
+                "triggers": [["equipped", "creature", "attack", "alone"]],
+                "conditions": [],
+                "effects": [["you", "draw", "<NUM>", "card"]],
+                "color_identity": []
+            },
+            "Frodo, Sauron's Bane": {
+                "name": "Frodo, Sauron's Bane",
+                "rarity": "rare",
+                "types": ["Legendary", "Creature", "Halfling"],
+                "keywords": [],
+                "triggers": [],
+                "conditions": [],
+                "effects": [["target", "player", "lose", "the", "game"], ["you", "gain", "<NUM>", "life"]],
+                "color_identity": ["W", "B"]
+            }
+        }
+        self.analysis = {"cards": self.cards, "plural_map": {"cards": "card"}}
+        self.corpus = TokenCorpus.from_cards(self.cards)
+        self.flat_cards = FlatCard.from_corpus(self.cards, self.corpus)
+
+    def write_and_load(self):
+        from deck_builder.corpus_file import load_analysis, write_corpus
+
+        write_corpus(self.path, self.flat_cards, self.corpus, self.analysis["plural_map"], "v1")
+        return load_analysis(self.path)
+
+    def test_round_trip(self):
+        analysis = self.write_and_load()
+        mapped = analysis["corpus"]
+
+        self.assertEqual(mapped.vocabulary, self.corpus.vocabulary)
+        self.assertEqual(mapped.names, self.corpus.names)
+        self.assertEqual([list(text) for text in mapped.texts()], [list(text) for text in self.corpus.texts()])
+        self.assertEqual(list(mapped.field_text_ids("Frodo, Sauron's Bane", "effects")), [2, 3])
+        self.assertEqual(mapped.encode(["draw", "<NUM>"]), self.corpus.encode(["draw", "<NUM>"]))
+        self.assertEqual(dict(analysis["cards"]), self.cards)
+        self.assertEqual(analysis["plural_map"], {"cards": "card"})
+
+    def test_texts_are_views_of_the_mapping(self):
+        mapped = self.write_and_load()["corpus"]
+
+        text = mapped.text(0)
+        self.assertIsInstance(text.obj, mmap.mmap)
+        self.assertIsInstance(mapped.token_positions(mapped.vocab["you"]).obj, mmap.mmap)
+        self.assertEqual(list(mapped.token_positions(mapped.vocab["you"])), [4, 13])
+        self.assertTrue(text.readonly)
+        with self.assertRaises(TypeError):
+            mapped.add_card("Gollum", {})
+
+    def test_flat_cards_are_attached(self):
+        analysis = self.write_and_load()
+        flat_cards, analysis_corpus = analysis["flat_cards"], analysis["corpus"]
+
+        frodo = flat_cards["Frodo, Sauron's Bane"]
+        self.assertFalse(frodo.is_mono())
+        self.assertTrue(frodo.has_type_token("halfling"))
+        self.assertEqual([analysis_corpus.decode(text) for text in frodo.texts("effects")],
+                         self.cards["Frodo, Sauron's Bane"]["effects"])
+        self.assertTrue(flat_cards["Bilbo's Ring"].is_colorless())
+
+    def test_index_reads_the_mapped_token_ids(self):
+        from deck_builder.corpus_index import CardIndex, CorpusCardIndex
+
+        analysis = self.write_and_load()
+        index = CorpusCardIndex(analysis["flat_cards"], analysis["corpus"])
+        expected = CardIndex(self.cards)
+
+        for token in ["creature", "gain", "<NUM>", "unknown"]:
+            self.assertEqual(index.cards_with_text_token(token), expected.cards_with_text_token(token))
+        for phrase in [["you", "*", "<NUM>"], ["lose", "the", "game"], ["draw", "unknown"]]:
+            self.assertEqual(index.cards_with_phrase(phrase), expected.cards_with_phrase(phrase))
+        self.assertEqual(index.cards_with_type("halfling"), {"Frodo, Sauron's Bane"})
+        self.assertEqual(index.cards_with_keyword("equip"), {"Bilbo's Ring"})
+
+    def test_rejects_other_files(self):
+        from deck_builder.corpus_file import MappedCorpus, read_parser_version
+
+        self.write_and_load()
+        self.assertEqual(read_parser_version(self.path), "v1")
+
+        with open(self.path, "wb") as f:
+            f.write(b"\0" * 256)
+        with self.assertRaises(ValueError):
+            MappedCorpus(self.path)
+        self.assertIsNone(read_parser_version(self.path))
+        self.assertIsNone(read_parser_version(os.path.join(self.tmp.name, "missing.corpus")))
+
+    def test_core_maps_sets_from_the_corpus_dir(self):
+        from deck_builder import core
+
+        with mock.patch.object(core, "CORPUS_DIR", self.tmp.name), \
+                mock.patch.object(core, "CARD_STORE_PATH", None), \
+                mock.patch.object(core, "_mapped_sets", OrderedDict()), \
+                mock.patch.object(core, "load_set_cards") as load_set_cards, \
+                mock.patch.object(core, "analyze_cards", return_value=self.analysis):
+            analysis = core.analyze_set("LTR")
+            self.assertTrue(os.path.exists(self.path))
+            self.assertEqual(analysis["corpus"].names, self.corpus.names)
+            self.assertEqual(analysis["corpus"].parser_version, core.PARSER_VERSION)
+            self.assertIs(core.analyze_set("ltr"), analysis)
+
+            # A new worker maps the file without loading or parsing the set
+            core._mapped_sets.clear()
+            self.assertIsNot(core.analyze_set("ltr"), analysis)
+            self.assertEqual(load_set_cards.call_count, 1)
+
+            # Another parser version's file is rebuilt, and remapped
+            mapped = core.analyze_set("ltr")
+            with mock.patch.object(core, "PARSER_VERSION", "0" * 16):
+                rebuilt = core.analyze_set("ltr")
+            self.assertEqual(load_set_cards.call_count, 2)
+            self.assertIsNot(rebuilt, mapped)
+            self.assertEqual(rebuilt["corpus"].parser_version, "0" * 16)
+
+    def test_core_keeps_few_sets_mapped(self):
+        from deck_builder import core
+
+        with mock.patch.object(core, "CORPUS_DIR", self.tmp.name), \
+                mock.patch.object(core, "CARD_STORE_PATH", None), \
+                mock.patch.object(core, "MAPPED_SETS_MAX", 2), \
+                mock.patch.object(core, "_mapped_sets", OrderedDict()), \
+                mock.patch.object(core, "load_set_cards"), \
+                mock.patch.object(core, "analyze_cards", return_value=self.analysis):
+            for set_code in ["ltr", "mom", "ltr", "woe"]:
+                core.analyze_set(set_code)
+            self.assertEqual(list(core._mapped_sets), ["ltr", "woe"])
+
+if __name__ == "__main__":
+    unittest.main()
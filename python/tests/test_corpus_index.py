@@ -0,0 +1,82 @@
+import unittest
+
+
+class TestCardIndex(unittest.TestCase):
+    def setUp(self):
+        self.cards = {
+            "Stone of Erech": {
+                "types": ["Legendary", "Artifact"],
+                "keywords": [],
+                "triggers": [],
+                "conditions": [["a", "creature", "an", "opponent", "control", "would", "die"]],
+                "effects": [["exile", "it"], ["draw", "<NUM>", "card"]]
+            },
+            "Bilbo's Ring": {
+                "types": ["Legendary", "Artifact", "Equipment"],
+                "keywords": ["Equip"],
+                "triggers": [["equipped", "creature", "attack", "alone"]],
+                "conditions": [],
+                "effects": [["you", "draw", "<NUM>", "card", "and", "you", "lose", "<NUM>", "life"]]
+            },
+            "Banish from Edoras": {
+                "types": ["Sorcery"],
+                "keywords": [],
+                "triggers": [],
+                "conditions": [["it", "target", "<NUM>", "tapped", "creature"]],
+                "effects": [["exile", "target", "creature"]]
+            }
+        }
+
+    def test_types_and_keywords_are_lowercased(self):
+        from deck_builder.corpus_index import CardIndex
+
+        index = CardIndex(self.cards)
+        self.assertEqual(index.cards_with_type("artifact"), {"Stone of Erech", "Bilbo's Ring"})
+        self.assertEqual(index.cards_with_keyword("equip"), {"Bilbo's Ring"})
+
+    def test_text_tokens(self):
+        from deck_builder.corpus_index import CardIndex
+
+        index = CardIndex(self.cards)
+        self.assertEqual(index.cards_with_text_token("exile"), {"Stone of Erech", "Banish from Edoras"})
+        self.assertEqual(index.cards_with_text_token("missing"), set())
+
+    def test_phrases_must_be_contiguous_within_one_text(self):
+        from deck_builder.corpus_index import CardIndex
+
+        index = CardIndex(self.cards)
+        self.assertEqual(index.cards_with_phrase(["draw", "<NUM>", "card"]), {"Stone of Erech", "Bilbo's Ring"})
+        self.assertEqual(index.cards_with_phrase(["target", "creature"]), {"Banish from Edoras"})
+        # "exile it" ends one text and "draw" starts the next
+        self.assertEqual(index.cards_with_phrase(["it", "draw"]), set())
+        self.assertEqual(index.cards_with_phrase(["exile", "creature"]), set())
+
+    def test_corpus_index_matches_card_index(self):
+        from deck_builder.corpus_index import CardIndex, CorpusCardIndex
+        from deck_builder.flat_card import FlatCard
+        from deck_builder.token_corpus import TokenCorpus
+
+        corpus = TokenCorpus.from_cards(self.cards)
+        flat_cards = FlatCard.from_corpus(self.cards, corpus)
+        tokens = ["exile", "creature", "draw", "<NUM>", "it", "missing"]
+        phrases = [
+            ["draw", "<NUM>", "card"], ["target", "creature"], ["it", "draw"], ["exile", "*"], ["*", "creature"],
+            ["you", "*", "<NUM>"], ["*", "*", "*", "*", "*", "*", "*"], ["lose", "missing"], []
+        ]
+
+        for names, fields in [(list(self.cards), ["triggers", "effects", "conditions"]),
+                              (["Stone of Erech", "Banish from Edoras"], ["effects"])]:
+            with self.subTest(names=names, fields=fields):
+                cards = {name: self.cards[name] for name in names}
+                expected = CardIndex(cards, fields)
+                index = CorpusCardIndex({name: flat_cards[name] for name in names}, corpus, fields)
+
+                for token in tokens:
+                    self.assertEqual(index.cards_with_text_token(token), expected.cards_with_text_token(token))
+                for phrase in phrases:
+                    self.assertEqual(index.cards_with_phrase(phrase), expected.cards_with_phrase(phrase))
+                self.assertEqual(index.cards_with_type("artifact"), expected.cards_with_type("artifact"))
+
+
+if __name__ == "__main__":
+    unittest.main()
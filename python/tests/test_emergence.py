@@ -0,0 +1,77 @@
+import random
+import unittest
+from unittest import mock
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class TestCohortCounts(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(7)
+        self.elements = ["food", "ring", (("draw", "<NUM>"),), (("gain", "life"), ("<NUM>", "life"))] + [
+            f"token{i}" for i in range(200)
+        ]
+        self.dual = {element: rng.randint(0, 12) for element in self.elements}
+        self.cohorts = {
+            color: {element: rng.randint(0, 12) for element in self.elements if rng.random() < .8}
+            for color in "WUG"
+        }
+
+    def expected(self, primary_color, num_mono, num_dual, num_primary, threshold=.07, alpha=.2):
+        from deck_builder.emergence import emergence_score
+
+        dual_emergent, primary_emergent = {}, {}
+        for element in self.elements:
+            mono = sum(counts.get(element, 0) for counts in self.cohorts.values())
+            primary = self.cohorts.get(primary_color, {}).get(element, 0)
+
+            dual_score = emergence_score(mono, self.dual[element], num_mono, num_dual, alpha)
+            primary_score = emergence_score(self.dual[element], primary, num_dual, num_primary, alpha)
+            if dual_score > threshold:
+                dual_emergent[element] = dual_score
+            if primary_score > threshold:
+                primary_emergent[element] = primary_score
+        return dual_emergent, primary_emergent
+
+    def assert_matches_scalar_scores(self, array_type):
+        from deck_builder.emergence import CohortCounts
+
+        counts = CohortCounts(self.elements, self.dual, self.cohorts)
+        self.assertIsInstance(counts.counts, array_type)
+        cases = [
+            ("U", (90, 40, 30), {}),
+            ("B", (90, 40, 0), {}),
+            ("W", (0, 0, 30), {}),
+            ("G", (90, 40, 30), {"threshold": .2, "alpha": .5})
+        ]
+        for primary_color, totals, params in cases:
+            with self.subTest(primary_color=primary_color, params=params):
+                dual_emergent, primary_emergent = counts.emergent(primary_color, *totals, **params)
+                expected_dual, expected_primary = self.expected(primary_color, *totals, **params)
+
+                self.assertEqual(list(dual_emergent), list(expected_dual))
+                self.assertEqual(list(primary_emergent), list(expected_primary))
+                for element, score in dual_emergent.items():
+                    self.assertAlmostEqual(score, expected_dual[element])
+
+    @unittest.skipUnless(np, "NumPy is not installed; the array path is untested")
+    def test_numpy_matches_scalar_scores(self):
+        self.assert_matches_scalar_scores(np.ndarray)
+
+    def test_matches_scalar_scores_without_numpy(self):
+        from deck_builder import emergence
+
+        with mock.patch.object(emergence, "np", None):
+            self.assert_matches_scalar_scores(list)
+
+    def test_no_elements(self):
+        from deck_builder.emergence import CohortCounts
+
+        self.assertEqual(CohortCounts([], {}, {"U": {}}).emergent("U", 10, 5, 3), ({}, {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
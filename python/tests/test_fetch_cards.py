@@ -0,0 +1,110 @@
+import json
+import threading
+import unittest
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PAGE_SIZE = 3
+
+
+def make_cards():
+    colors = [["U"], ["G"], ["U", "G"], [], ["W"]]
+    cards = [
+        {"name": f"Card {idx}", "rarity": "common", "color_identity": colors[idx % 5], "layout": "normal"}
+        for idx in range(10)
+    ]
+    cards.append({"name": "Food", "color_identity": [], "layout": "token"})
+    return cards
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        params = urllib.parse.parse_qs(url.query)
+        page = int(params.get("page", ["1"])[0])
+        cards = self.server.cards
+        start = (page - 1) * PAGE_SIZE
+
+        has_more = start + PAGE_SIZE < len(cards)
+        body = {
+            "object": "list",
+            "total_cards": len(cards) if self.server.with_total else None,
+            "has_more": has_more,
+            "data": cards[start:start + PAGE_SIZE]
+        }
+        if has_more:
+            query = urllib.parse.urlencode({"q": params["q"][0], "page": page + 1})
+            body["next_page"] = f"http://{self.server.server_address[0]}:{self.server.server_address[1]}{url.path}?{query}"
+
+        raw = json.dumps(body).encode("utf-8")
+        with self.server.lock:
+            self.server.requests.append((self.client_address, params["q"][0], page))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestFetchCards(unittest.TestCase):
+    def serve(self, with_total=True):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        server.cards = make_cards()
+        server.with_total = with_total
+        server.requests = []
+        server.lock = threading.Lock()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+    def test_fetches_every_page_in_order_over_kept_alive_connections(self):
+        from fetch_cards import fetch_cards
+
+        server, base_url = self.serve()
+        cards = fetch_cards("e:ltr", [], base_url, concurrency=2, min_interval_s=0)
+
+        self.assertEqual([card["name"] for card in cards], [f"Card {idx}" for idx in range(10)])
+        self.assertEqual(sorted(page for _, _, page in server.requests), [1, 2, 3, 4])
+        self.assertEqual({query for _, query, _ in server.requests}, {"e:ltr"})
+        # The first page's connection plus at most one per fetching thread
+        self.assertLessEqual(len({address for address, _, _ in server.requests}), 3)
+
+    def test_filters_colors_while_paging(self):
+        from fetch_cards import fetch_cards
+
+        _, base_url = self.serve()
+        cards = fetch_cards("e:ltr", ["u"], base_url, concurrency=3, min_interval_s=0)
+        self.assertEqual([card["name"] for card in cards], ["Card 0", "Card 5"])
+
+        cards = fetch_cards("e:ltr", ["x"], base_url, concurrency=3, min_interval_s=0)
+        self.assertEqual([card["name"] for card in cards], ["Card 3", "Card 8"])
+
+    def test_follows_next_page_without_a_total(self):
+        from fetch_cards import fetch_cards
+
+        server, base_url = self.serve(with_total=False)
+        cards = fetch_cards("e:ltr", ["u", "g"], base_url, min_interval_s=0)
+
+        self.assertEqual([card["name"] for card in cards], ["Card 2", "Card 7"])
+        self.assertEqual([page for _, _, page in server.requests], [1, 2, 3, 4])
+        self.assertEqual(len({address for address, _, _ in server.requests}), 1)
+
+    def test_rate_limiter_spaces_requests(self):
+        import time
+        from fetch_cards import RateLimiter
+
+        limiter = RateLimiter(0.02)
+        start = time.monotonic()
+        for _ in range(4):
+            limiter.wait()
+        self.assertGreaterEqual(time.monotonic() - start, 0.06)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+
+
+class TestFlatCard(unittest.TestCase):
+    def setUp(self):
+        from deck_builder.flat_card import FlatCard
+        from deck_builder.token_corpus import TokenCorpus
+
+        self.cards = {
+            "Bilbo's Ring": {
+                "types": ["Legendary", "Artifact", "Equipment"],
+                "keywords": ["Equip"],
+                "triggers": [["equipped", "creature", "attack", "alone"]],
+                "conditions": [],
+                "effects": [["you", "draw", "<NUM>", "card"]],
+                "color_identity": []
+            },
+            "Frodo, Sauron's Bane": {
+                "types": ["Legendary", "Creature", "Halfling"],
+                "keywords": [],
+                "triggers": [],
+                "conditions": [],
+                "effects": [["target", "player", "lose", "the", "game"]],
+                "color_identity": ["W", "B"]
+            }
+        }
+        self.corpus = TokenCorpus.from_cards(self.cards)
+        self.flat_cards = FlatCard.from_corpus(self.cards, self.corpus)
+
+    def test_types_and_keywords_are_lowercased(self):
+        ring = self.flat_cards["Bilbo's Ring"]
+
+        self.assertTrue(ring.has_type_token("artifact"))
+        self.assertTrue(ring.has_type_token("equip"))
+        self.assertFalse(ring.has_type_token("Artifact"))
+
+    def test_color_identity_mask(self):
+        from deck_builder.flat_card import color_mask, mask_colors
+
+        ring, frodo = self.flat_cards["Bilbo's Ring"], self.flat_cards["Frodo, Sauron's Bane"]
+
+        self.assertTrue(ring.is_colorless())
+        self.assertFalse(ring.within(color_mask("WUBRG")))
+        self.assertFalse(frodo.is_mono())
+        self.assertTrue(frodo.within(color_mask(["W", "B"])))
+        self.assertFalse(frodo.within(color_mask(["W", "U"])))
+        self.assertEqual(mask_colors(frodo.colors), ["W", "B"])
+
+    def test_texts_are_corpus_slices(self):
+        ring = self.flat_cards["Bilbo's Ring"]
+
+        self.assertEqual([self.corpus.decode(text) for text in ring.texts("triggers")],
+                         [["equipped", "creature", "attack", "alone"]])
+        self.assertEqual(ring.texts("conditions"), [])
+        self.assertIs(ring.texts("effects")[0].obj, self.corpus.token_ids)
+
+    def test_corpus_cards_rebuild_the_dict_cards(self):
+        from deck_builder.flat_card import CorpusCards
+
+        cards = CorpusCards(self.flat_cards, self.corpus)
+
+        self.assertEqual(list(cards), list(self.cards))
+        frodo = cards["Frodo, Sauron's Bane"]
+        self.assertEqual(frodo, {"name": "Frodo, Sauron's Bane", "rarity": "", **self.cards["Frodo, Sauron's Bane"]})
+
+    def test_common_tokens_count_every_type(self):
+        from deck_builder.flat_card import FlatCard
+        from deck_builder.token_corpus import TokenCorpus
+        from deck_builder.tokens import get_common_tokens
+
+        cards = {"Shapeshifter": {"types": ["Creature", "Shapeshifter", "Shapeshifter"], "keywords": ["Equip"]}}
+        corpus = TokenCorpus.from_cards(cards)
+        counts = get_common_tokens(FlatCard.from_corpus(cards, corpus))
+
+        self.assertEqual(counts, {"creature": 1, "shapeshifter": 2, "equip": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+
+
+def make_card(idx, color_identity, oracle_text):
+    return {
+        "name": f"Card {idx}",
+        "rarity": "common",
+        "type_line": "Creature — Human Soldier" if idx % 2 else "Instant",
+        "keywords": [],
+        "oracle_text": oracle_text,
+        "color_identity": color_identity
+    }
+
+
+TEXTS = [
+    "When this creature enters, draw a card.",
+    "Whenever another creature you control dies, create a Food token.",
+    "If a creature would die, exile it instead.",
+    "When this creature enters, create two Food tokens.",
+    "Target creature gets +2/+2 until end of turn."
+]
+COLOR_IDENTITIES = [["U"], ["G"], ["U", "G"], ["W"], []]
+
+
+class TestIncrementalAnalysis(unittest.TestCase):
+    def setUp(self):
+        self.cards = [
+            make_card(idx, COLOR_IDENTITIES[idx % 5], TEXTS[idx * 7 % 5])
+            for idx in range(60)
+        ]
+        self.decks = {
+            "ug": {"primary_color": "U", "colors": ["U", "G"]},
+            "gw": {"primary_color": "G", "colors": ["G", "W"]}
+        }
+
+    def assert_scores_match_full_analysis(self, incremental):
+        from deck_builder import core
+
+        core.ANALYSIS_CACHE.clear()
+        self.assertEqual(
+            core.score_analyzed_decks(incremental.analysis(), self.decks),
+            core.score_decks(incremental.cards(), self.decks)
+        )
+
+    def test_updates_match_full_analysis(self):
+        from deck_builder.incremental import IncrementalAnalysis
+
+        incremental = IncrementalAnalysis(self.cards[:40])
+        self.assert_scores_match_full_analysis(incremental)
+
+        changed = dict(self.cards[3], oracle_text="Flying\nWhen this creature dies, draw a card.")
+        incremental.update(added=self.cards[40:50], removed=["Card 7", "Card 12"], changed=[changed])
+        self.assert_scores_match_full_analysis(incremental)
+
+        incremental.update(added=self.cards[50:], removed=[f"Card {idx}" for idx in range(20, 30)])
+        self.assert_scores_match_full_analysis(incremental)
+
+    def test_plural_map_follows_vocabulary(self):
+        from deck_builder.incremental import IncrementalAnalysis
+
+        incremental = IncrementalAnalysis([make_card(0, ["U"], "Create two Food tokens.")])
+        self.assertEqual(incremental.analysis()["plural_map"], {})
+
+        incremental.update(added=[make_card(1, ["U"], "Create a Food token.")])
+        self.assertEqual(incremental.analysis()["plural_map"], {"tokens": "token"})
+        self.assertIn(["create", "<NUM>", "food", "token"], incremental.analysis()["cards"]["Card 0"]["effects"])
+
+        incremental.update(removed=["Card 1"])
+        self.assertEqual(incremental.analysis()["plural_map"], {})
+        self.assertIn(["create", "<NUM>", "food", "tokens"], incremental.analysis()["cards"]["Card 0"]["effects"])
+
+    def test_unknown_names_raise(self):
+        from deck_builder.incremental import IncrementalAnalysis
+
+        incremental = IncrementalAnalysis(self.cards[:5])
+        with self.assertRaises(KeyError):
+            incremental.update(removed=["Card 99"])
+        with self.assertRaises(KeyError):
+            incremental.update(changed=[make_card(99, ["U"], TEXTS[0])])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import io
+import json
+import unittest
+
+
+class TestStreamingPayload(unittest.TestCase):
+    def test_cards_and_fields_survive_any_chunking(self):
+        from deck_builder.json_stream import StreamingPayload
+
+        payload = {
+            "id": 12,
+            "cards": [{"name": "Frodo — Ring-bearer", "cmc": 1.5e-3}, {"name": "Sam", "keywords": []}, 7],
+            "primary_color": "U",
+            "colors": ["U", "G"],
+            "ratio": -3.25
+        }
+        raw = json.dumps(payload, indent=2, ensure_ascii=False).encode("utf-8")
+
+        for chunk_size in (1, 2, 3, 64, 1 << 16):
+            with self.subTest(chunk_size=chunk_size):
+                stream = StreamingPayload(io.BytesIO(raw), chunk_size=chunk_size)
+                self.assertEqual(list(stream.cards()), payload["cards"])
+                self.assertEqual(stream.fields, {k: v for k, v in payload.items() if k != "cards"})
+
+    def test_top_level_array_elements(self):
+        from deck_builder.json_stream import StreamingPayload
+
+        cards = [{"name": "Sam", "cmc": 2}, {"name": "Frodo — Ring-bearer"}, 12.5]
+        raw = json.dumps(cards, ensure_ascii=False).encode("utf-8")
+
+        for chunk_size in (1, 5, 1 << 16):
+            with self.subTest(chunk_size=chunk_size):
+                stream = StreamingPayload(io.BytesIO(raw), chunk_size=chunk_size)
+                self.assertEqual(list(stream.elements()), cards)
+
+        self.assertEqual(list(StreamingPayload(io.BytesIO(b" [ ] ")).elements()), [])
+        with self.assertRaises(json.JSONDecodeError):
+            list(StreamingPayload(io.BytesIO(b'{"cards": []}')).elements())
+
+    def test_malformed_payload_raises(self):
+        from deck_builder.json_stream import StreamingPayload
+
+        for raw in [b'{"cards": [1, 2', b'{"cards": [1 2]}', b'{"cards": []} x', b'[1]']:
+            with self.subTest(raw=raw):
+                with self.assertRaises(json.JSONDecodeError):
+                    list(StreamingPayload(io.BytesIO(raw), chunk_size=2).cards())
+
+    def test_payload_hasher_matches_payload_hash(self):
+        from deck_builder.analysis_cache import PayloadHasher, payload_hash
+
+        cards = [{"name": "B", "keywords": ["Flying"]}, {"keywords": [], "name": "A"}]
+        for prefix in (cards[:0], cards[:1], cards):
+            hasher = PayloadHasher()
+            for card in prefix:
+                hasher.update(card)
+            self.assertEqual(hasher.hexdigest(), payload_hash(prefix))
@@ -0,0 +1,129 @@
+import random
+import unittest
+from unittest import mock
+
+
+def reduce_by_contest(ngrams):
+    from deck_builder.ngrams import select_next_candidate, contest_ngram
+
+    selections = set()
+    remaining = dict(ngrams)
+    while remaining:
+        next_ngram = select_next_candidate(remaining)
+        selections.add(next_ngram)
+        remaining = contest_ngram(remaining, next_ngram)
+    return selections
+
+
+class TestReduceNgrams(unittest.TestCase):
+    def test_matches_contest_loop(self):
+        from deck_builder.ngrams import reduce_ngrams
+
+        rng = random.Random(7)
+        for trial in range(200):
+            tokens = ["draw", "a", "card", "exile", "target", "*"][:rng.randint(2, 6)]
+            ngrams = {}
+            for _ in range(rng.randint(1, 40)):
+                text = [rng.choice(tokens) for _ in range(rng.randint(2, 6))]
+                ngrams[tuple(zip(text, text[1:]))] = rng.randint(1, 12)
+
+            with self.subTest(trial=trial):
+                self.assertEqual(reduce_ngrams(ngrams), reduce_by_contest(ngrams))
+
+    def test_supergram_drops_subgrams_within_tolerance(self):
+        from deck_builder.ngrams import reduce_ngrams
+
+        draw_a_card = (("draw", "a"), ("a", "card"))
+        ngrams = {
+            draw_a_card: 10,
+            (("draw", "a"),): 12,
+            (("a", "card"),): 11,
+            (("exile", "target"),): 3
+        }
+        self.assertEqual(reduce_ngrams(ngrams), {draw_a_card, (("draw", "a"),), (("exile", "target"),)})
+
+
+class TestMergeNgramsViaChains(unittest.TestCase):
+    def setUp(self):
+        self.ngrams = {
+            (("draw", "a"),): 9,
+            (("a", "card"),): 8,
+            (("a", "creature"),): 2,
+            (("exile", "a"),): 5
+        }
+
+    def test_chains_with_predicted_frequency(self):
+        from deck_builder.ngrams import merge_ngrams_via_chains
+
+        self.assertEqual(merge_ngrams_via_chains(self.ngrams), {
+            (("draw", "a"), ("a", "card")): 8,
+            (("draw", "a"), ("a", "creature")): 2,
+            (("exile", "a"), ("a", "card")): 5,
+            (("exile", "a"), ("a", "creature")): 2
+        })
+
+    def test_support_pruning_counts_dropped_pairs(self):
+        from collections import Counter
+        from deck_builder.ngrams import merge_ngrams_via_chains
+
+        pruned = Counter()
+        candidates = merge_ngrams_via_chains(self.ngrams, 3, pruned=pruned)
+
+        self.assertEqual(candidates, {
+            (("draw", "a"), ("a", "card")): 8,
+            (("exile", "a"), ("a", "card")): 5
+        })
+        self.assertEqual(pruned, {"support": 2})
+
+    def test_budget_keeps_best_predicted(self):
+        from collections import Counter
+        from deck_builder.ngrams import merge_ngrams_via_chains
+
+        pruned = Counter()
+        candidates = merge_ngrams_via_chains(self.ngrams, max_candidates=2, pruned=pruned)
+
+        self.assertEqual(candidates, {
+            (("draw", "a"), ("a", "card")): 8,
+            (("exile", "a"), ("a", "card")): 5
+        })
+        self.assertEqual(pruned, {"budget": 2})
+
+
+def merge_by_chaining(ngrams_freq):
+    """
+    Reference: every chain of two ngrams overlapping in all but one bigram,
+    without pruning.
+    """
+    candidates = {}
+    for left in ngrams_freq:
+        for right in ngrams_freq:
+            if left[1:] == right[:-1] and (len(left) > 1 or left[0][1] == right[0][0]):
+                candidates[left + (right[-1],)] = min(ngrams_freq[left], ngrams_freq[right])
+    return candidates
+
+
+class TestMinedNgrams(unittest.TestCase):
+    def test_default_rounds_mine_every_chain(self):
+        from benchmarks.synthetic_cards import generate_cards
+        from deck_builder import core, ngrams
+        from flat_card import color_mask
+
+        analysis = core.analyze_cards(generate_cards(400, seed=3))
+        mask = color_mask(["U", "G"])
+        dual_cards = {name: card for name, card in core.get_flat_cards(analysis).items() if card.within(mask)}
+        corpus = core.get_token_corpus(analysis)
+
+        mined = ngrams.get_common_ngrams(dual_cards, corpus)
+        with mock.patch.object(ngrams, "merge_ngrams_via_chains", lambda freqs, *args: merge_by_chaining(freqs)):
+            expected = ngrams.get_common_ngrams(dual_cards, corpus)
+
+        self.assertEqual(mined, expected)
+
+        # Pruning parts below the cohort's rough minimum frequency is lossy
+        rough_min_freq = int(len(dual_cards) * ngrams.ROUGH_MIN_PROP)
+        with mock.patch.object(ngrams, "ROUND_MIN_SUPPORT", rough_min_freq):
+            self.assertNotEqual(ngrams.get_common_ngrams(dual_cards, corpus), mined)
+
+
+if __name__ == "__main__":
+    unittest.main()
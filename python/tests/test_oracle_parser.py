@@ -306,6 +306,23 @@ class TestExtractSynergyFramesReflexive(unittest.TestCase):
         result = parse_oracle(self.cards)
         self.assertEqual(result, self.expected_blocks)
 
+    def test_parallel_parse_matches_serial(self):
+        from unittest import mock
+        from deck_builder import oracle_parser
+        from deck_builder.parse_cache import ParseCache
+
+        # Repeated names keep the last card's parse, at the first position
+        cards = (self.cards * 3)[::-1]
+        with mock.patch.object(oracle_parser, "PARALLEL_MIN_CARDS", 1), \
+                mock.patch.object(oracle_parser, "PARALLEL_MIN_CHUNK", 2), \
+                mock.patch.object(oracle_parser, "PARSE_CACHE", ParseCache()):
+            result = oracle_parser.parse_oracle(cards, workers=2)
+
+        with mock.patch.object(oracle_parser, "PARSE_CACHE", ParseCache()):
+            expected = oracle_parser.parse_oracle(cards, workers=1)
+        self.assertEqual(result, expected)
+        self.assertEqual(list(result), list(expected))
+
     def test_mark_structural_elements_all_cards(self):
         from deck_builder.oracle_parser import mark_structural_elements, strip_keywords
 
@@ -318,5 +335,31 @@ class TestExtractSynergyFramesReflexive(unittest.TestCase):
                 expected_simple = [(m["type"], m["text"]) for m in expected]
                 self.assertEqual(actual_simple, expected_simple)
 
+class TestStructuralScanner(unittest.TestCase):
+    def marks(self, text):
+        from deck_builder.oracle_parser import mark_structural_elements
+        return [(m["type"], m["text"]) for m in mark_structural_elements(text)]
+
+    def test_clause_patterns_only_start_words(self):
+        self.assertEqual(self.marks("Gift if xif 3if _if"), [("condition", "if")])
+
+    def test_equip_only_starts_lines(self):
+        self.assertEqual(self.marks("Equip {2}\nYou may equip it"), [
+            ("equip", "Equip "),
+            ("mana_cost", "{2}"),
+            ("delimiter", "\n"),
+            ("optional", "You may")
+        ])
+
+    def test_longest_prefix_wins(self):
+        self.assertEqual(self.marks("At the beginning of combat, as long as it's tapped"), [
+            ("trigger", "At the beginning"),
+            ("condition", "as long as")
+        ])
+
+    def test_assigned_text_hides_inner_marks(self):
+        self.assertEqual(self.marks('Has "{T}: Draw a card."'), [("assigned_text", '"{T}: Draw a card."')])
+
+
 if __name__ == "__main__":
     unittest.main()
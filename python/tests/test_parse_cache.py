@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        self.card = {
+            "name": "Stone of Erech",
+            "oracle_text": "If a creature an opponent controls would die, exile it instead.\n{2}, {T}: Draw a card.",
+            "keywords": []
+        }
+
+    def test_key_ignores_keyword_order_and_tracks_parser_version(self):
+        from deck_builder.parse_cache import parse_key
+
+        self.assertEqual(parse_key("Flying", ["Flying", "Ward"], "v1"), parse_key("Flying", ["Ward", "Flying"], "v1"))
+        self.assertNotEqual(parse_key("Flying", [], "v1"), parse_key("Flying", [], "v2"))
+
+    def test_reprints_share_one_parse(self):
+        from deck_builder import oracle_parser
+        from deck_builder.parse_cache import ParseCache
+
+        reprint = dict(self.card, name="Stone of Erech (Showcase)")
+        with mock.patch.object(oracle_parser, "PARSE_CACHE", ParseCache()) as cache, \
+                mock.patch.object(oracle_parser, "parse_oracle_text", wraps=oracle_parser.parse_oracle_text) as parse:
+            result = oracle_parser.parse_oracle([self.card, reprint], workers=1)
+            again = oracle_parser.parse_card_oracle(self.card)
+
+        self.assertEqual(parse.call_count, 1)
+        self.assertEqual(len(cache), 1)
+        self.assertIs(result["Stone of Erech"], result["Stone of Erech (Showcase)"])
+        self.assertIs(again, result["Stone of Erech"])
+
+    def test_round_trips_through_disk(self):
+        from deck_builder.oracle_parser import parse_oracle_text
+        from deck_builder.parse_cache import ParseCache
+
+        parsed = parse_oracle_text(self.card)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            db_path = os.path.join(cache_dir, "parses.sqlite")
+            ParseCache(db_path=db_path).put_many([("a", parsed), ("b", [])])
+
+            fresh = ParseCache(db_path=db_path)
+            self.assertEqual(fresh.get_many(["a", "b", "c"]), {"a": parsed, "b": []})
+            self.assertIn("a", fresh)
+
+            # Clearing forgets the memory entries only
+            fresh.clear()
+            self.assertNotIn("a", fresh)
+            self.assertEqual(ParseCache(db_path=db_path).get_many(["a", "b"]), {"a": parsed, "b": []})
+
+    def test_evicts_least_recently_used(self):
+        from deck_builder.parse_cache import ParseCache
+
+        cache = ParseCache(max_entries=2)
+        cache.put("a", [])
+        cache.put("b", [])
+        cache.get("a")
+        cache.put("c", [])
+
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
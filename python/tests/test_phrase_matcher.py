@@ -0,0 +1,44 @@
+import unittest
+
+
+class TestPhraseMatcher(unittest.TestCase):
+    def setUp(self):
+        self.texts = [
+            ["you", "draw", "<NUM>", "card", "and", "you", "lose", "<NUM>", "life"],
+            ["draw", "<NUM>", "card", "then", "draw", "<NUM>", "card"],
+            ["<NUM>", "<NUM>", "<NUM>"],
+            []
+        ]
+        self.patterns = [
+            ("draw", "<NUM>", "card"),
+            ("<NUM>", "card"),
+            ("card",),
+            ("<NUM>", "<NUM>"),
+            ("you", "lose"),
+            ("exile", "target")
+        ]
+
+    def test_counts_match_single_pattern_scan(self):
+        from deck_builder.ngrams import count_ngram_in_tokens
+        from deck_builder.phrase_matcher import PhraseMatcher
+
+        counts = PhraseMatcher(self.patterns).count(self.texts)
+
+        for pattern in self.patterns:
+            with self.subTest(pattern=pattern):
+                expected = sum(count_ngram_in_tokens(tokens, list(pattern)) for tokens in self.texts)
+                self.assertEqual(counts[pattern], expected)
+
+    def test_count_ngrams_in_corpora_counts_each_corpus(self):
+        from deck_builder.ngrams import count_ngrams_in_corpora
+
+        corpus = {"Card": {"effects": self.texts[:2]}}
+        ngram = (("draw", "<NUM>"), ("<NUM>", "card"))
+
+        primary, everything = count_ngrams_in_corpora([{}, corpus], {ngram})
+        self.assertEqual(primary, {ngram: 0})
+        self.assertEqual(everything, {ngram: 3})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+
+class TestPositionalIndex(unittest.TestCase):
+    def setUp(self):
+        self.texts = [
+            ["you", "draw", "<NUM>", "card", "and", "you", "lose", "<NUM>", "life"],
+            ["you", "gain", "<NUM>", "life"],
+            ["target", "creature", "get", "<BUFF>", "until", "end", "of", "turn"],
+            ["you"]
+        ]
+        self.patterns = [
+            ["you", "*", "<NUM>"],
+            ["you", "*", "<NUM>", "life"],
+            ["*", "life"],
+            ["you", "*"],
+            ["*", "*"],
+            ["you", "draw", "<NUM>"],
+            ["until", "*", "turn"],
+            ["exile", "*"]
+        ]
+
+    def test_counts_match_window_scan(self):
+        from deck_builder.ngrams import count_pattern_in_tokens
+        from deck_builder.positional_index import PositionalIndex
+
+        index = PositionalIndex(self.texts)
+
+        for pattern in self.patterns:
+            with self.subTest(pattern=pattern):
+                expected = sum(count_pattern_in_tokens(tokens, pattern) for tokens in self.texts)
+                self.assertEqual(index.count(pattern), expected)
+
+    def test_wildcard_ngrams_are_counted_per_corpus(self):
+        from deck_builder.ngrams import count_ngrams_in_corpora
+
+        corpus = {"Card": {"effects": self.texts}}
+        ngram = (("you", "*"), ("*", "<NUM>"))
+
+        self.assertEqual(count_ngrams_in_corpora([corpus], {ngram}), [{ngram: 3}])
+
+
+if __name__ == "__main__":
+    unittest.main()
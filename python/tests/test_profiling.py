@@ -0,0 +1,34 @@
+import os
+import pstats
+import tempfile
+import unittest
+from unittest import mock
+
+
+class TestProfiling(unittest.TestCase):
+    def test_profile_written_under_payload_hash(self):
+        from deck_builder import profiling
+
+        payload = {"id": 7, "profile": True, "cards": [{"name": "A"}]}
+        with tempfile.TemporaryDirectory() as profile_dir:
+            with mock.patch.dict(os.environ, {profiling.PROFILE_DIR_ENV: profile_dir}):
+                with profiling.profiling(payload) as profiler:
+                    sorted(range(1000))
+                path = profiling.profile_path(payload)
+
+                # The request id and flags don't change the file name
+                self.assertEqual(path, profiling.profile_path({"cards": [{"name": "A"}]}))
+
+            self.assertIsNotNone(profiler)
+            self.assertTrue(path.startswith(profile_dir) and path.endswith(".pstats"))
+            self.assertGreater(pstats.Stats(path).total_calls, 0)
+
+    def test_unrequested_profile_is_a_no_op(self):
+        from deck_builder import profiling
+
+        with mock.patch.dict(os.environ, {profiling.PROFILE_ENV: "", profiling.PROFILE_SAMPLE_RATE_ENV: "0"}):
+            self.assertFalse(profiling.profile_requested({"cards": []}))
+            with profiling.profiling({"cards": []}) as profiler:
+                pass
+
+        self.assertIsNone(profiler)
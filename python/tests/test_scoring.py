@@ -0,0 +1,40 @@
+import unittest
+from unittest import mock
+
+
+class TestScoreDecks(unittest.TestCase):
+    def setUp(self):
+        from benchmarks.synthetic_cards import generate_cards
+
+        self.cards = generate_cards(400, seed=3)
+        self.decks = {
+            "ug": {"primary_color": "U", "colors": ["U", "G"]},
+            "gu": {"primary_color": "G", "colors": ["G", "U"]},
+            "ugw": {"primary_color": "W", "colors": ["U", "G", "W"]},
+            "b": {"primary_color": "B", "colors": ["B"]}
+        }
+
+    def test_batch_matches_single_decks(self):
+        from deck_builder import core
+
+        results = core.score_decks(self.cards, self.decks)
+
+        self.assertEqual(list(results), list(self.decks))
+        for key, deck in self.decks.items():
+            with self.subTest(deck=key):
+                self.assertEqual(results[key], core.score_cards(self.cards, deck["primary_color"], deck["colors"]))
+
+    def test_invalid_deck_fails_before_analysis(self):
+        from deck_builder import core
+
+        decks = {**self.decks, "bad": {"primary_color": "U", "colors": ["U", "P"]}}
+        with mock.patch.object(core, "analyze_cards") as analyze_cards:
+            with self.assertRaises(ValueError):
+                core.score_decks(self.cards, decks)
+            with self.assertRaises(ValueError):
+                core.score_payload({"cards": self.cards, "decks": decks})
+        analyze_cards.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+
+class TestStreamingAnalysis(unittest.TestCase):
+    def setUp(self):
+        from benchmarks.synthetic_cards import generate_cards
+        from deck_builder import core
+        from analysis_cache import AnalysisCache
+
+        self.cards = generate_cards(400, seed=3)
+        patcher = mock.patch.object(core, "ANALYSIS_CACHE", AnalysisCache())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_streaming(self, payload):
+        from deck_builder import core
+
+        out_stream = io.StringIO()
+        with contextlib.redirect_stdout(out_stream), contextlib.redirect_stderr(io.StringIO()):
+            core.run_streaming(io.BytesIO(json.dumps(payload).encode("utf-8")))
+        return json.loads(out_stream.getvalue())
+
+    def test_stream_analysis_matches_list_analysis(self):
+        from deck_builder import core
+        from analysis_cache import AnalysisCache, PayloadHasher, payload_hash
+
+        hasher = PayloadHasher()
+        streamed = core.analyze_card_stream(iter(self.cards), hasher)
+        self.assertEqual(hasher.hexdigest(), payload_hash(self.cards))
+
+        with mock.patch.object(core, "ANALYSIS_CACHE", AnalysisCache()):
+            analysis = core.analyze_cards(self.cards)
+        self.assertEqual(streamed["cards"], analysis["cards"])
+        self.assertEqual(streamed["plural_map"], analysis["plural_map"])
+
+    def test_run_streaming_matches_one_shot(self):
+        from deck_builder import core
+
+        payload = {"cards": self.cards, "decks": {"ug": {"primary_color": "U", "colors": ["U", "G"]}}}
+        self.assertEqual(self.run_streaming(payload), core.score_payload(payload))
+
+    def test_deck_first_payloads_are_streamed(self):
+        from deck_builder import core
+
+        payload = {"primary_color": "U", "colors": ["U", "G"], "cards": self.cards}
+        with mock.patch.object(core, "analyze_card_stream", wraps=core.analyze_card_stream) as analyze_card_stream:
+            self.assertEqual(self.run_streaming(payload), core.score_payload(payload))
+        analyze_card_stream.assert_called_once()
+
+    def test_cards_take_precedence_over_set(self):
+        from deck_builder import core
+
+        deck = {"primary_color": "U", "colors": ["U", "G"]}
+        expected = core.score_payload({"cards": self.cards, **deck})
+        with mock.patch.object(core, "load_set_cards") as load_set_cards:
+            self.assertEqual(self.run_streaming({**deck, "set": "ltr", "cards": self.cards}), expected)
+            self.assertEqual(self.run_streaming({"cards": self.cards, "set": "ltr", **deck}), expected)
+        load_set_cards.assert_not_called()
+
+    def test_invalid_decks_are_rejected_before_parsing(self):
+        from deck_builder import core
+
+        deck = {"primary_color": "U", "colors": ["U", "X"]}
+        for payload in [{**deck, "cards": self.cards}, {"cards": self.cards, **deck}]:
+            with self.subTest(first=next(iter(payload))):
+                with mock.patch.object(core, "parse_card_oracle") as parse_card_oracle, \
+                        mock.patch.object(core, "parse_oracle") as parse_oracle:
+                    with self.assertRaises(ValueError):
+                        self.run_streaming(payload)
+                parse_card_oracle.assert_not_called()
+                parse_oracle.assert_not_called()
+
+    def test_payload_trace_flag_is_honored(self):
+        from deck_builder import core
+
+        deck = {"primary_color": "U", "colors": ["U", "G"]}
+        for payload in [{"trace": True, **deck, "cards": self.cards}, {"cards": self.cards, **deck, "trace": True}]:
+            with self.subTest(first=next(iter(payload))):
+                err_stream = io.StringIO()
+                with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(err_stream):
+                    core.run_streaming(io.BytesIO(json.dumps(payload).encode("utf-8")))
+                trace = json.loads(err_stream.getvalue().splitlines()[-1])
+                self.assertEqual(trace["counters"]["corpus.input_cards"], len(self.cards))
+
+    def test_stream_profiles_are_named_by_their_cards(self):
+        from deck_builder import profiling
+
+        deck = {"primary_color": "U", "colors": ["U", "G"]}
+        with tempfile.TemporaryDirectory() as profile_dir:
+            with mock.patch.dict(os.environ, {profiling.PROFILE_ENV: "1", profiling.PROFILE_DIR_ENV: profile_dir}):
+                self.run_streaming({"cards": self.cards, **deck})
+                self.run_streaming({"cards": self.cards[:300], **deck})
+                self.run_streaming({"cards": self.cards, **deck})
+
+            self.assertEqual(len(os.listdir(profile_dir)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+
+
+class TestSuffixArrayIndex(unittest.TestCase):
+    def setUp(self):
+        self.texts = [
+            ["draw", "<NUM>", "card", "then", "discard", "<NUM>", "card"],
+            ["<NUM>", "<NUM>", "<NUM>", "<NUM>"],
+            ["card", "draw"],
+            ["draw", "<NUM>", "card"]
+        ]
+
+    def test_counts_match_single_pattern_scan(self):
+        from deck_builder.ngrams import count_ngram_in_tokens
+        from deck_builder.suffix_index import SuffixArrayIndex
+
+        index = SuffixArrayIndex(self.texts)
+        patterns = [
+            ["draw", "<NUM>", "card"],
+            ["<NUM>", "card"],
+            ["<NUM>", "<NUM>"],
+            ["card"],
+            ["card", "draw", "<NUM>"],
+            ["exile"]
+        ]
+
+        for pattern in patterns:
+            with self.subTest(pattern=pattern):
+                expected = sum(count_ngram_in_tokens(tokens, pattern) for tokens in self.texts)
+                self.assertEqual(index.count(pattern), expected)
+
+    def test_matches_do_not_cross_texts(self):
+        from deck_builder.suffix_index import SuffixArrayIndex
+
+        index = SuffixArrayIndex(self.texts)
+        self.assertEqual(index.count(["card", "<NUM>"]), 0)
+        self.assertEqual(index.count(["draw", "draw"]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import io
+import json
+import unittest
+
+
+class TestTelemetry(unittest.TestCase):
+    def test_tracing_emits_one_json_line(self):
+        from deck_builder import telemetry
+
+        stream = io.StringIO()
+        with telemetry.tracing(True, request_id="r1", stream=stream) as trace:
+            with telemetry.current().span("stage"):
+                pass
+            telemetry.current().count("cards", 3)
+            telemetry.current().append("rounds", {"candidates": 5})
+            telemetry.current().append("rounds", {"candidates": 2})
+
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 1)
+
+        emitted = json.loads(lines[0])
+        self.assertEqual(emitted["event"], telemetry.TRACE_EVENT)
+        self.assertEqual(emitted["id"], "r1")
+        self.assertIn("stage", emitted["stages_s"])
+        self.assertEqual(emitted["counters"], {"cards": 3})
+        self.assertEqual(emitted["series"], {"rounds": [{"candidates": 5}, {"candidates": 2}]})
+        self.assertIs(telemetry.current(), telemetry.NULL_TRACE)
+        self.assertIsNot(trace, telemetry.NULL_TRACE)
+
+    def test_disabled_tracing_is_silent(self):
+        from deck_builder import telemetry
+
+        stream = io.StringIO()
+        with telemetry.tracing(False, stream=stream) as trace:
+            with trace.span("stage"):
+                trace.count("cards", 3)
+
+        self.assertIs(trace, telemetry.NULL_TRACE)
+        self.assertEqual(stream.getvalue(), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
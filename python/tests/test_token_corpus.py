@@ -0,0 +1,53 @@
+import unittest
+
+
+class TestTokenCorpus(unittest.TestCase):
+    def setUp(self):
+        self.cards = {
+            "Stone of Erech": {
+                "conditions": [["a", "creature", "would", "die"]],
+                "triggers": [],
+                "effects": [["exile", "it"], ["draw", "a", "card"]]
+            },
+            "Banish from Edoras": {
+                "conditions": [],
+                "triggers": [],
+                "effects": [["exile", "target", "creature"]]
+            }
+        }
+
+    def test_offsets_slice_texts_fields_and_cards(self):
+        from deck_builder.token_corpus import TokenCorpus
+
+        corpus = TokenCorpus.from_cards(self.cards)
+
+        self.assertEqual(len(corpus), 2)
+        self.assertEqual(len(corpus.vocabulary), 9)
+        self.assertEqual([corpus.decode(text) for text in corpus.texts()], [
+            ["a", "creature", "would", "die"],
+            ["exile", "it"],
+            ["draw", "a", "card"],
+            ["exile", "target", "creature"]
+        ])
+        self.assertEqual(corpus.card_text_ids("Banish from Edoras"), range(3, 4))
+        self.assertEqual(corpus.field_text_ids("Stone of Erech", "effects"), range(1, 3))
+        self.assertEqual(corpus.field_text_ids("Stone of Erech", "triggers"), range(1, 1))
+
+    def test_encode_keeps_wildcards_and_rejects_unknown_tokens(self):
+        from deck_builder.token_corpus import TokenCorpus
+
+        corpus = TokenCorpus.from_cards(self.cards)
+        encoded = corpus.encode(["exile", "*", "creature"])
+
+        self.assertEqual(corpus.decode(encoded), ["exile", "*", "creature"])
+        self.assertIsNone(corpus.encode(["exile", "graveyard"]))
+
+    def test_common_ngrams_are_decoded(self):
+        from deck_builder.ngrams import get_common_ngrams
+
+        cards = {f"Card {i}": {"effects": [["draw", "a", "card"]]} for i in range(20)}
+        self.assertEqual(get_common_ngrams(cards), {(("draw", "a"), ("a", "card")): 20})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import io
+import json
+import unittest
+
+
+class TestWorker(unittest.TestCase):
+    def setUp(self):
+        from benchmarks.synthetic_cards import generate_cards
+
+        self.cards = generate_cards(400, seed=3)
+
+    def serve_lines(self, lines):
+        from deck_builder import core
+
+        out_stream = io.StringIO()
+        core.serve(io.StringIO("".join(line + "\n" for line in lines)), out_stream)
+        return [json.loads(line) for line in out_stream.getvalue().splitlines()]
+
+    def test_valid_request(self):
+        from deck_builder import core
+
+        request = {"id": "r1", "cards": self.cards, "primary_color": "U", "colors": ["U", "G"]}
+        [response] = self.serve_lines([json.dumps(request)])
+
+        self.assertEqual(response["id"], "r1")
+        self.assertEqual(response["result"], core.score_cards(self.cards, "U", ["U", "G"]))
+
+    def test_bad_lines_are_answered_and_the_worker_goes_on(self):
+        bad_color = {"id": "r2", "cards": self.cards, "primary_color": "X", "colors": ["X", "G"]}
+        valid = {"id": "r3", "cards": self.cards, "primary_color": "G", "colors": ["G"]}
+        responses = self.serve_lines(["{not json", "5", "[1]", '"x"', "", json.dumps(bad_color), json.dumps(valid)])
+
+        self.assertEqual(len(responses), 6)
+        self.assertTrue(responses[0]["error"].startswith("Invalid request:"))
+        for response in responses[1:4]:
+            self.assertEqual(response, {"id": None, "error": "Invalid request: expected a JSON object"})
+        self.assertEqual(responses[4]["id"], "r2")
+        self.assertTrue(responses[4]["error"].startswith("ValueError: Invalid primary color"))
+        self.assertEqual(responses[5]["id"], "r3")
+        self.assertIn("result", responses[5])
+
+    def test_handle_request_reports_errors(self):
+        from deck_builder import core
+
+        response = core.handle_request({"id": 7, "primary_color": "U", "colors": ["U"]})
+        self.assertEqual(response["id"], 7)
+        self.assertIn("error", response)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -18,15 +18,17 @@ class RecommendationService(
         val deck = deckService.getDeckWithColors(deckId)
         val primary = deck.primaryColor
 
+        // The deck goes ahead of the cards, so --stream can validate it and
+        // parse cards as they arrive
         val payload = objectMapper.writeValueAsString(
             mapOf(
-                "cards" to scryfall.getCardsBySetCode(setService.getSet(deck.set).code),
                 "primary_color" to primary,
-                "colors" to deck.colors
+                "colors" to deck.colors,
+                "cards" to scryfall.getCardsBySetCode(setService.getSet(deck.set).code)
             )
         )
 
-        val process = ProcessBuilder("python3", "python/deck_builder/core.py").start()
+        val process = ProcessBuilder("python3", "python/deck_builder/core.py", "--stream").start()
 
         // Ensure subprocess is killed if coroutine is cancelled
         val cancellationHandler = coroutineContext.job.invokeOnCompletion {